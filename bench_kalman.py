@@ -0,0 +1,40 @@
+import time
+import numpy as np
+from src.config.variables import KALMAN_Q, KALMAN_R, N_SENSORES
+from src.utils.auxiliares.mi_kalman import KalmanFilter, KalmanBank
+
+# Recursión completa contra ganancia estacionaria (steady_state=True), para
+# el filtro escalar y el banco de N_SENSORES canales, sobre distancias
+# simuladas (mm). La diferencia máxima se mide sobre todas las salidas.
+N_MUESTRAS = 50000
+rng = np.random.default_rng(0)
+distancias = 2000.0 + np.cumsum(rng.normal(0.0, 2.0, (N_MUESTRAS, N_SENSORES)), axis=0) \
+    + rng.normal(0.0, 20.0, (N_MUESTRAS, N_SENSORES))
+medidas = distancias[:, 0].tolist()
+filas = list(distancias)
+
+
+def escalar(steady_state):
+    kf = KalmanFilter(KALMAN_Q, KALMAN_R, 0.0, steady_state=steady_state)
+    inicio = time.perf_counter()
+    salidas = [kf.update(d) for d in medidas]
+    return time.perf_counter() - inicio, np.array(salidas), kf
+
+
+def banco(steady_state):
+    kb = KalmanBank(N_SENSORES, KALMAN_Q, KALMAN_R, 0.0, steady_state=steady_state)
+    inicio = time.perf_counter()
+    salidas = [kb.update(fila) for fila in filas]
+    return time.perf_counter() - inicio, np.array(salidas), kb
+
+
+print(f"q={KALMAN_Q} r={KALMAN_R}, {N_MUESTRAS} muestras")
+print(f"{'filtro':>8} {'completo us':>12} {'estacionario us':>16} {'aceleración':>12} {'dif. máx.':>10}")
+for nombre, medir in (('escalar', escalar), ('banco', banco)):
+    duracion_completo, salida_completo, _ = medir(False)
+    duracion_estacionario, salida_estacionario, filtro = medir(True)
+    print(f"{nombre:>8} {duracion_completo / N_MUESTRAS * 1e6:12.2f} "
+          f"{duracion_estacionario / N_MUESTRAS * 1e6:16.2f} "
+          f"{duracion_completo / duracion_estacionario:11.1f}x "
+          f"{np.max(np.abs(salida_completo - salida_estacionario)):10.2e}")
+print(f"Ganancia estacionaria: {filtro.k_estacionaria}")
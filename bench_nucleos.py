@@ -0,0 +1,116 @@
+import time
+import numpy as np
+from src.config.variables import (
+    posiciones_anchors,
+    INDICES_SENSORES_ANGULO,
+    KALMAN_Q, KALMAN_R,
+    PID_KP, PID_KI, PID_KD, PID_SETPOINT, PID_ALPHA, PID_SALIDA_MAX,
+    VELOCIDAD_DIFERENCIAL_MAXIMA
+)
+from src.utils.auxiliares import nucleos_jit, trilateracion, angulo_direccion, control_diferencial
+from src.utils.auxiliares.mi_kalman import KalmanFilter
+from src.utils.auxiliares import geometria_anchors
+from src.utils.controladores import pid_controller
+
+# Latencia por etapa del camino caliente: camino NumPy contra núcleos de
+# nucleos_jit.py (compilados con Numba si está instalado; si no, la misma
+# función en Python puro). Ambos caminos reciben las mismas entradas y se
+# comparan las salidas. En 'scipy' la diferencia final es la tolerancia de
+# corte de L-BFGS-B (su gradiente por diferencias finitas amplifica el
+# último bit del objetivo), no del núcleo.
+N_LLAMADAS = 20000
+N_SCIPY = 50
+rng = np.random.default_rng(0)
+
+anchors = posiciones_anchors[:3].astype(np.float64)
+geometria = geometria_anchors.obtener_geometria(anchors)
+sensor_1, sensor_2 = (anchors[i] for i in INDICES_SENSORES_ANGULO)
+tags = np.column_stack((
+    rng.uniform(-3000, 3000, N_LLAMADAS),
+    rng.uniform(500, 6000, N_LLAMADAS),
+    rng.uniform(100, 1500, N_LLAMADAS)
+))
+distancias = np.linalg.norm(tags[:, None, :] - anchors[None, :, :], axis=2) + rng.normal(0.0, 20.0, (N_LLAMADAS, 3))
+angulos = rng.uniform(-60.0, 60.0, N_LLAMADAS)
+velocidades = rng.uniform(0.0, 150.0, N_LLAMADAS)
+
+
+def etapa_kalman():
+    kf = KalmanFilter(KALMAN_Q, KALMAN_R, 0.0)
+    return [kf.update(d) for d in distancias[:, 0]]
+
+
+def etapa_kalman_nucleo():
+    # KalmanFilter no usa el núcleo: se llama directamente para comparar
+    x_hat, p, salidas = 0.0, 1.0, []
+    for d in distancias[:, 0]:
+        x_hat, p = nucleos_jit.kalman_paso(x_hat, p, KALMAN_Q, KALMAN_R, d)
+        salidas.append(x_hat)
+    return salidas
+
+
+def etapa_scipy():
+    return [trilateracion.resolver_scipy(d, anchors) for d in distancias[:N_SCIPY]]
+
+
+def etapa_angulo():
+    return [angulo_direccion.calcular_angulo_entre_tag_y_robot(t, sensor_1, sensor_2) for t in tags]
+
+
+def etapa_angulo_geometria():
+    return [geometria.angulo_tag(t) for t in tags]
+
+
+def etapa_pid():
+    pid = pid_controller.PIDController(kp=PID_KP, ki=PID_KI, kd=PID_KD, setpoint=PID_SETPOINT,
+                                       alpha=PID_ALPHA, salida_maxima=PID_SALIDA_MAX)
+    return [pid.update(a) for a in angulos]
+
+
+def etapa_diferencial():
+    return [
+        control_diferencial.calcular_velocidades_diferenciales(v, a, max_v=VELOCIDAD_DIFERENCIAL_MAXIMA)
+        for v, a in zip(velocidades, angulos)
+    ]
+
+
+def con_nucleo(modulo, acelerado, etapa):
+    def ejecutar():
+        original = modulo.ACELERADO
+        modulo.ACELERADO = acelerado
+        try:
+            return etapa()
+        finally:
+            modulo.ACELERADO = original
+    return ejecutar
+
+
+# (etapa, camino NumPy, camino con núcleo, llamadas por ejecución)
+etapas = [('kalman', etapa_kalman, etapa_kalman_nucleo, N_LLAMADAS)] + [
+    (nombre, con_nucleo(modulo, False, etapa), con_nucleo(modulo, True, etapa), n)
+    for nombre, modulo, etapa, n in (
+        ('scipy', trilateracion, etapa_scipy, N_SCIPY),
+        ('angulo', angulo_direccion, etapa_angulo, N_LLAMADAS),
+        ('angulo_geo', geometria_anchors, etapa_angulo_geometria, N_LLAMADAS),
+        ('pid', pid_controller, etapa_pid, N_LLAMADAS),
+        ('diferencial', control_diferencial, etapa_diferencial, N_LLAMADAS)
+    )
+]
+
+
+def medir(etapa):
+    etapa()  # Precalentar (y compilar el núcleo la primera vez)
+    inicio = time.perf_counter()
+    salidas = etapa()
+    return time.perf_counter() - inicio, np.array(salidas, dtype=np.float64)
+
+
+backend = 'numba' if nucleos_jit.NUMBA_DISPONIBLE else 'python (numba no instalado)'
+print(f"Núcleos: {backend}")
+print(f"{'etapa':>12} {'numpy us':>9} {'núcleo us':>10} {'aceleración':>12} {'dif. máx.':>10}")
+for nombre, camino_numpy, camino_nucleo, n in etapas:
+    duracion_numpy, salida_numpy = medir(camino_numpy)
+    duracion_nucleo, salida_nucleo = medir(camino_nucleo)
+    diferencia = np.max(np.abs(salida_numpy - salida_nucleo))
+    print(f"{nombre:>12} {duracion_numpy / n * 1e6:9.2f} {duracion_nucleo / n * 1e6:10.2f} "
+          f"{duracion_numpy / duracion_nucleo:11.1f}x {diferencia:10.2e}")
@@ -0,0 +1,87 @@
+import time
+import numpy as np
+from src.config.variables import posiciones_anchors, TIEMPO_ESPERA
+from src.utils.auxiliares.trilateracion import (
+    resolver_scipy, resolver_lineal, resolver_gauss_newton, resolver_esferas, reflejar_al_semiespacio
+)
+from src.utils.auxiliares.trilateracion_lote import obtener_posiciones_lote
+
+# Comparación de latencia y precisión de los métodos de trilateración
+# sobre posiciones simuladas con ruido en las distancias (mm)
+N_MUESTRAS = 500
+RUIDO_MM = 20.0
+VELOCIDAD_TAG_MM_S = 1500.0  # Para la trayectoria con arranque en caliente
+rng = np.random.default_rng(0)
+
+metodos = {
+    'scipy': resolver_scipy,
+    'lineal': resolver_lineal,
+    'gn_frio': lambda d, a: resolver_gauss_newton(d, a)[0]
+}
+# Sólo con exactamente tres anchors
+metodos_3 = dict(metodos, esferas=lambda d, a: resolver_esferas(d, a)[0])
+
+
+def medir_rangos(reales, anchors):
+    distancias = np.linalg.norm(reales[:, None, :] - anchors[None, :, :], axis=2)
+    return distancias + rng.normal(0.0, RUIDO_MM, distancias.shape)
+
+
+def imprimir_fila(nombre, duracion, estimadas, reales, extra=''):
+    errores = np.linalg.norm(estimadas - reales, axis=1)
+    print(f"{nombre:>8} {duracion * 1e6:11.1f} {np.mean(errores):17.1f} "
+          f"{np.percentile(errores, 95):15.1f} {extra}")
+
+
+for n_anchors in (4, 3):
+    anchors = posiciones_anchors[:n_anchors].astype(np.float64)
+    # Tags delante y por encima del plano de los anchors (z > 0)
+    reales = np.column_stack((
+        rng.uniform(-3000, 3000, N_MUESTRAS),
+        rng.uniform(500, 6000, N_MUESTRAS),
+        rng.uniform(100, 1500, N_MUESTRAS)
+    ))
+    distancias = medir_rangos(reales, anchors)
+
+    print(f"\n{n_anchors} anchors, {N_MUESTRAS} muestras independientes, ruido {RUIDO_MM} mm")
+    print(f"{'método':>8} {'us/llamada':>11} {'error medio (mm)':>17} {'error p95 (mm)':>15}")
+    for nombre, resolver in (metodos_3 if n_anchors == 3 else metodos).items():
+        resolver(distancias[0], anchors)  # Precalentar cachés
+        inicio = time.perf_counter()
+        estimadas = np.array([resolver(d, anchors) for d in distancias])
+        imprimir_fila(nombre, (time.perf_counter() - inicio) / N_MUESTRAS, estimadas, reales)
+
+    # Mismas muestras resueltas en un solo lote vectorial
+    for nombre, metodo in (('lote_lin', 'lineal'), ('lote_gn', 'gauss_newton')):
+        inicio = time.perf_counter()
+        estimadas, _ = obtener_posiciones_lote(distancias, anchors, metodo=metodo)
+        imprimir_fila(nombre, (time.perf_counter() - inicio) / N_MUESTRAS, estimadas, reales)
+
+    # Trayectoria continua: cada ciclo arranca desde la solución anterior
+    pasos = rng.normal(0.0, 1.0, (N_MUESTRAS, 3))
+    pasos *= VELOCIDAD_TAG_MM_S * TIEMPO_ESPERA / np.linalg.norm(pasos, axis=1)[:, None]
+    trayectoria = np.array([0.0, 3000.0, 800.0]) + np.cumsum(pasos, axis=0)
+    # Como las muestras independientes, siempre por encima del plano (z >= 100)
+    trayectoria[:, 2] = 100.0 + np.abs(trayectoria[:, 2] - 100.0)
+    distancias = medir_rangos(trayectoria, anchors)
+
+    print(f"trayectoria a {VELOCIDAD_TAG_MM_S:.0f} mm/s, ciclo de {TIEMPO_ESPERA} s:")
+    frio = np.array([resolver_gauss_newton(d, anchors)[1] for d in distancias])
+    inicio = time.perf_counter()
+    estimadas = np.array([resolver_gauss_newton(d, anchors)[0] for d in distancias])
+    imprimir_fila('gn_frio', (time.perf_counter() - inicio) / N_MUESTRAS, estimadas, trayectoria,
+                  f"iteraciones media {frio.mean():.2f}")
+
+    x0 = None
+    iteraciones = np.zeros(N_MUESTRAS, dtype=int)
+    convergidos = 0
+    estimadas = np.zeros_like(trayectoria)
+    inicio = time.perf_counter()
+    for i, d in enumerate(distancias):
+        x0, iteraciones[i], convergido = resolver_gauss_newton(d, anchors, x0=x0)
+        x0 = reflejar_al_semiespacio(x0, anchors)  # Como obtener_posicion_tag_3d con anchors coplanares
+        estimadas[i] = x0
+        convergidos += convergido
+    duracion = (time.perf_counter() - inicio) / N_MUESTRAS
+    imprimir_fila('gn_cal', duracion, estimadas, trayectoria,
+                  f"iteraciones media {iteraciones.mean():.2f}, convergidos {convergidos}/{N_MUESTRAS}")
@@ -3,7 +3,18 @@ from src.config.variables import (
     posiciones_anchors,
     DATA_PORT,
     BAUDRATE,
+    LECTURA_EN_SEGUNDO_PLANO,
+    HISTORIAL_TRAMAS,
+    FORMATO_TRAMA,
+    ESCRITOR_MOTORES_EN_SEGUNDO_PLANO,
+    REENVIO_COMANDO_MOTOR,
+    PROTOCOLO_MOTOR,
+    EDAD_MAXIMA_TRAMA,
+    REGISTRO_TELEMETRIA,
+    REPRODUCIR_TELEMETRIA,
+    VELOCIDAD_REPRODUCCION,
     TIEMPO_ESPERA,
+    USAR_INSTANTE_TRAMA,
     NUM_CICLOS,
     INDICES_SENSORES_ANGULO,
     MEDIA_MOVIL_VENTANA,
@@ -13,19 +24,25 @@ from src.config.variables import (
     VELOCIDADES_ESCALONADAS,
     DISTANCIA_MINIMA_PARADA,
     VELOCIDAD_MAXIMA,
+    INCERTIDUMBRE_VELOCIDAD_NOMINAL,
+    INCERTIDUMBRE_VELOCIDAD_MAXIMA,
     SENSIBILIDAD_GIRO_DIFERENCIAL, 
     VELOCIDAD_DIFERENCIAL_MAXIMA,
     PID_ALPHA, PID_SALIDA_MAX
 
 )
 from src.utils.lectores.sensor_reader import SensorReader
+from src.utils.lectores.puerto_compartido import SharedSerialPort
+from src.utils.lectores.registro_telemetria import TelemetryRecorder, ReplayReader
 from src.utils.auxiliares.trilateracion import obtener_posicion_tag_3d
+from src.utils.auxiliares.geometria_anchors import obtener_geometria
+from src.utils.auxiliares.nucleos_jit import precalentar
 from src.utils.auxiliares.kalman_adapter import filtrar_mediciones_kalman
 from src.utils.auxiliares.validador import verificar_distancias
 from src.utils.auxiliares.validador import debe_corregir
-from src.utils.auxiliares.uart_mediciones import obtener_distancias_uart
-from src.utils.auxiliares.angulo_direccion import calcular_angulo_entre_tag_y_robot
+from src.utils.auxiliares.uart_mediciones import obtener_distancias_uart_si_nuevas
 from src.utils.auxiliares.control_velocidad import calcular_velocidad_escalonada
+from src.utils.auxiliares.control_velocidad import limitar_por_incertidumbre
 from src.utils.auxiliares.filtro_media_movil import FiltroMediaMovil  #<----2
 from src.utils.auxiliares.control_diferencial import calcular_velocidades_diferenciales
 from src.utils.graficadores.graficador_angulo import graficar_direccion_robot_y_tag
@@ -41,10 +58,61 @@ import numpy as np
 import matplotlib.pyplot as plt
 plt.ion()  # Modo interactivo activado
 
+
+# ###########################################################
+# Controlador UART simulado (reproducción sin carrito)
+# ###########################################################
+class UARTController:
+    def __init__(self, port):
+        self.port = port
+
+    def connect(self):
+        return True
+
+    def disconnect(self):
+        pass
+
+    def send(self, msg):
+        print(f"UART enviado: {msg}")
+
+
 def main():
-    data_receiver = SensorReader(port=DATA_PORT, baudrate=BAUDRATE)
-    motor_controller = UARTMotorController(port=DATA_PORT, baudrate=BAUDRATE)
+    recorder = TelemetryRecorder(REGISTRO_TELEMETRIA) if REGISTRO_TELEMETRIA else None
+    reproduccion_rapida = bool(REPRODUCIR_TELEMETRIA) and not VELOCIDAD_REPRODUCCION
+
+    if REPRODUCIR_TELEMETRIA:
+        data_receiver = ReplayReader(
+            REPRODUCIR_TELEMETRIA,
+            speed=VELOCIDAD_REPRODUCCION,
+            history_size=HISTORIAL_TRAMAS,
+            frame_format=FORMATO_TRAMA
+        )
+        motor_controller = UARTController(port=DATA_PORT)
+    else:
+        # Una sola conexión a DATA_PORT compartida por telemetría y motores
+        puerto = SharedSerialPort(port=DATA_PORT, baudrate=BAUDRATE)
+        data_receiver = SensorReader(
+            port=DATA_PORT,
+            baudrate=BAUDRATE,
+            background=LECTURA_EN_SEGUNDO_PLANO,
+            history_size=HISTORIAL_TRAMAS,
+            frame_format=FORMATO_TRAMA,
+            shared_port=puerto,
+            recorder=recorder
+        )
+        motor_controller = UARTMotorController(
+            port=DATA_PORT,
+            baudrate=BAUDRATE,
+            shared_port=puerto,
+            background=ESCRITOR_MOTORES_EN_SEGUNDO_PLANO,
+            repeat_interval=REENVIO_COMANDO_MOTOR,
+            protocol=PROTOCOLO_MOTOR
+        )
     pwm_manager = PWMManager(motor_controller)
+    # Matrices de los anchors calculadas una sola vez (no por ciclo)
+    geometria = obtener_geometria(posiciones_anchors, n=N_SENSORES)
+    # Compilar los núcleos JIT antes de abrir el puerto, no en el primer ciclo
+    precalentar()
     filtro_angulo = FiltroMediaMovil(tamaño_ventana=MEDIA_MOVIL_VENTANA)
 
     if not data_receiver.connect():
@@ -74,37 +142,48 @@ def main():
     
     while True:
         print(f"\nCiclo #{ciclo+1}")
-        distancias = obtener_distancias_uart(data_receiver, N_SENSORES)
-        valido = verificar_distancias(distancias, motor_controller)
+        distancias = obtener_distancias_uart_si_nuevas(data_receiver, N_SENSORES)
+        edad_muestra = data_receiver.frame_age()
+        if edad_muestra is not None:
+            print(f"Edad de la muestra: {edad_muestra * 1000:.1f} ms")
+
+        if distancias is None:
+            # Sin trama nueva: no se repite la estimación sobre datos ya usados
+            valido = False
+            if edad_muestra is None or edad_muestra > EDAD_MAXIMA_TRAMA:
+                print("Sin tramas recientes — Deteniendo motores")
+                pwm_manager.detener()
+        else:
+            valido = verificar_distancias(distancias, motor_controller)
 
         if valido:
             try:
-                distancias_filtradas = filtrar_mediciones_kalman(distancias)
-                anchors = posiciones_anchors[:len(distancias_filtradas)]
+                # Filtros y PID avanzan el tiempo real entre tramas (None = un paso fijo)
+                instante = data_receiver.last_frame_info()[1] if USAR_INSTANTE_TRAMA else None
+                distancias_filtradas = filtrar_mediciones_kalman(distancias, instante=instante)
 
-                posicion_tag, radio_error = obtener_posicion_tag_3d(distancias_filtradas, anchors)
-                #graficador.actualizar(*posicion_tag, radio_error=radio_error)
+                posicion_tag, diagnostico = obtener_posicion_tag_3d(distancias_filtradas, geometria, diagnostico=True)
+                #graficador.actualizar(*posicion_tag, covarianza=diagnostico.covarianza)
 
-                # Control de dirección angular
-                sensor_1 = anchors[INDICES_SENSORES_ANGULO[0]]
-                sensor_2 = anchors[INDICES_SENSORES_ANGULO[1]]
-                angulo_raw = calcular_angulo_entre_tag_y_robot(posicion_tag, sensor_1, sensor_2)
+                # Control de dirección angular (referencia precalculada en la geometría)
+                angulo_raw = geometria.angulo_tag(posicion_tag)
 
                 if APLICAR_MEDIA_MOVIL:
-                    angulo_relativo = filtro_angulo.filtrar("tag_1", angulo_raw)
+                    angulo_relativo = filtro_angulo.filtrar("tag_1", angulo_raw, instante)
                     print(f"Ángulo relativo filtrado (media móvil): {angulo_relativo:.2f}°")
                 else:
                     angulo_relativo = angulo_raw
                     print(f"Ángulo relativo sin filtrar: {angulo_relativo:.2f}°")
 
                 if debe_corregir(angulo_relativo, umbral=UMBRAL):
-                    correccion = pid.update(angulo_relativo)
+                    correccion = pid.update(angulo_relativo, instante)
                     correccion = np.clip(correccion, PID_SALIDA_MIN, PID_SALIDA_MAX)
                     motor_controller.send_motor_command(int(correccion), int(-correccion))
                 else:
+                    pid.omitir(instante)
                     print(f"Corrección ignorada: ángulo de {angulo_relativo:.2f}° está dentro del umbral")
 
-                #graficar_direccion_robot_y_tag(posicion_tag, sensor_1, sensor_2)
+                #graficar_direccion_robot_y_tag(posicion_tag, *geometria.anchors[list(INDICES_SENSORES_ANGULO)])
 
                 # Control de velocidad lineal por distancia
                 distancia_al_tag = np.linalg.norm(posicion_tag)
@@ -114,6 +193,13 @@ def main():
                     velocidades_por_metro=VELOCIDADES_ESCALONADAS,
                     velocidad_maxima=VELOCIDAD_MAXIMA
                 )
+                # Menos velocidad cuanto más incierta es la posición (covarianza del solver)
+                velocidad_avance = limitar_por_incertidumbre(
+                    velocidad_avance,
+                    diagnostico.incertidumbre,
+                    INCERTIDUMBRE_VELOCIDAD_NOMINAL,
+                    INCERTIDUMBRE_VELOCIDAD_MAXIMA
+                )
 
                 if velocidad_avance > 0.0:
                     vel_izq, vel_der, giro_normalizado = calcular_velocidades_diferenciales(
@@ -149,17 +235,24 @@ def main():
         if ciclo % 10 == 0 and ciclo > 0:
             graficar_vel_izq_der(tiempos, historico_izq, historico_der)
         
-        if TIEMPO_ESPERA:
+        if TIEMPO_ESPERA and not reproduccion_rapida:
             sleep(TIEMPO_ESPERA)
 
         ciclo += 1
         if NUM_CICLOS is not None and ciclo >= NUM_CICLOS:
             print(f"\nFinalizando ejecución tras {NUM_CICLOS} ciclos.")
             break
+        if getattr(data_receiver, 'finished', False):
+            print(f"\nFin del registro reproducido tras {ciclo} ciclos.")
+            break
     
+    print(f"Estadísticas de tramas: {data_receiver.get_frame_stats()}")
+
     # Desconectar controladores
     data_receiver.disconnect()
     motor_controller.disconnect()
+    if recorder is not None:
+        recorder.close()
 
 if __name__ == "__main__":
     main()
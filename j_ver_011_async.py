@@ -0,0 +1,201 @@
+from src.config.variables import (
+    N_SENSORES,
+    posiciones_anchors,
+    DATA_PORT,
+    BAUDRATE,
+    HISTORIAL_TRAMAS,
+    FORMATO_TRAMA,
+    REENVIO_COMANDO_MOTOR,
+    PROTOCOLO_MOTOR,
+    EDAD_MAXIMA_TRAMA,
+    NUM_CICLOS,
+    USAR_INSTANTE_TRAMA,
+    MEDIA_MOVIL_VENTANA,
+    APLICAR_MEDIA_MOVIL,
+    UMBRAL,
+    PID_KP, PID_KI, PID_KD, PID_SETPOINT, PID_SALIDA_MIN, PID_SALIDA_MAX,
+    VELOCIDADES_ESCALONADAS,
+    DISTANCIA_MINIMA_PARADA,
+    VELOCIDAD_MAXIMA,
+    INCERTIDUMBRE_VELOCIDAD_NOMINAL,
+    INCERTIDUMBRE_VELOCIDAD_MAXIMA,
+    VELOCIDAD_DIFERENCIAL_MAXIMA,
+    PID_ALPHA,
+    SEGUIMIENTO_EKF,
+    EKF_ADELANTO
+)
+from src.utils.lectores.transportes import SerialTransport
+from src.utils.lectores.receptor_async import AsyncTelemetryReceiver
+from src.utils.controladores.motor_async import AsyncMotorController
+from src.utils.auxiliares.trilateracion import obtener_posicion_tag_3d, obtener_estadisticas_cache
+from src.utils.auxiliares.geometria_anchors import obtener_geometria
+from src.utils.auxiliares.nucleos_jit import precalentar
+from src.utils.auxiliares.kalman_adapter import filtrar_mediciones_kalman
+from src.utils.auxiliares.ekf_rangos import RangeEKF
+from src.utils.auxiliares.validador import verificar_distancias
+from src.utils.auxiliares.validador import debe_corregir
+from src.utils.auxiliares.control_velocidad import calcular_velocidad_escalonada
+from src.utils.auxiliares.control_velocidad import limitar_por_incertidumbre
+from src.utils.auxiliares.filtro_media_movil import FiltroMediaMovil
+from src.utils.auxiliares.control_diferencial import calcular_velocidades_diferenciales
+from src.utils.controladores.pid_controller import PIDController
+from src.utils.controladores.pwm_manager import PWMManager
+from src.utils.controladores.pwm_manager import velocidad_a_pwm
+import asyncio
+import time
+import numpy as np
+
+
+# ###########################################################
+# Watchdog: detiene los motores si la telemetría se corta
+# ###########################################################
+async def watchdog(data_receiver, pwm_manager):
+    while True:
+        await asyncio.sleep(EDAD_MAXIMA_TRAMA / 2)
+        edad_muestra = data_receiver.frame_age()
+        if edad_muestra is None or edad_muestra > EDAD_MAXIMA_TRAMA:
+            print("Sin tramas recientes — Deteniendo motores")
+            pwm_manager.detener()
+
+
+# ###########################################################
+# Registro periódico del estado de la telemetría y los motores
+# ###########################################################
+async def registrar_estado(data_receiver, motor_controller, periodo=1.0):
+    while True:
+        await asyncio.sleep(periodo)
+        print(f"Tramas: {data_receiver.get_frame_stats()}")
+        info = motor_controller.get_connection_info()
+        print(f"Motores: enviados={info['commands_sent']} "
+              f"agrupados={info['commands_coalesced']} errores={info['send_errors']}")
+        cache = obtener_estadisticas_cache()
+        print(f"Caché de trilateración: aciertos={cache['aciertos']} fallos={cache['fallos']}")
+
+
+async def main():
+    # Un solo descriptor para telemetría y motores
+    puerto = SerialTransport(port=DATA_PORT, baudrate=BAUDRATE, timeout=0)
+    data_receiver = AsyncTelemetryReceiver(
+        puerto,
+        history_size=HISTORIAL_TRAMAS,
+        frame_format=FORMATO_TRAMA
+    )
+    motor_controller = AsyncMotorController(
+        port=DATA_PORT,
+        baudrate=BAUDRATE,
+        transport=puerto,
+        repeat_interval=REENVIO_COMANDO_MOTOR,
+        protocol=PROTOCOLO_MOTOR
+    )
+    pwm_manager = PWMManager(motor_controller)
+    geometria = obtener_geometria(posiciones_anchors, n=N_SENSORES)
+    # Compilar los núcleos JIT antes de abrir el puerto, no en el primer ciclo
+    precalentar()
+    ekf = RangeEKF(geometria) if SEGUIMIENTO_EKF else None
+    filtro_angulo = FiltroMediaMovil(tamaño_ventana=MEDIA_MOVIL_VENTANA)
+
+    if not await data_receiver.connect():
+        print(f"Error: No se pudo conectar al receptor de datos en {DATA_PORT}")
+        return
+
+    if not await motor_controller.connect():
+        print(f"Error: No se pudo conectar al controlador de motores en {DATA_PORT}")
+        await data_receiver.disconnect()
+        return
+
+    pid = PIDController(
+        kp=PID_KP,
+        ki=PID_KI,
+        kd=PID_KD,
+        setpoint=PID_SETPOINT,
+        alpha=PID_ALPHA,
+        salida_maxima=PID_SALIDA_MAX
+    )
+    tareas = [
+        asyncio.create_task(watchdog(data_receiver, pwm_manager)),
+        asyncio.create_task(registrar_estado(data_receiver, motor_controller))
+    ]
+
+    ciclo = 0
+    try:
+        # Cada ciclo espera la próxima trama en lugar de dormir TIEMPO_ESPERA
+        async for _ in data_receiver:
+            print(f"\nCiclo #{ciclo+1}")
+            distancias = data_receiver.get_distances()[:N_SENSORES]
+
+            if verificar_distancias(distancias, motor_controller):
+                try:
+                    instante_trama = data_receiver.last_frame_info()[1]
+                    # Filtros y PID avanzan el tiempo real entre tramas (None = un paso fijo)
+                    instante = instante_trama if USAR_INSTANTE_TRAMA else None
+                    if ekf is not None:
+                        # Una predicción/corrección con las distancias crudas y el
+                        # instante de la trama; posición extrapolada hasta los motores
+                        ekf.actualizar(distancias, instante_trama)
+                        posicion_tag = ekf.posicion_en(time.monotonic() + EKF_ADELANTO)
+                        incertidumbre = ekf.incertidumbre
+                    else:
+                        distancias_filtradas = filtrar_mediciones_kalman(distancias, instante=instante)
+                        posicion_tag, diagnostico = obtener_posicion_tag_3d(
+                            distancias_filtradas, geometria, diagnostico=True
+                        )
+                        incertidumbre = diagnostico.incertidumbre
+
+                    # Control de dirección angular (referencia precalculada en la geometría)
+                    angulo_raw = geometria.angulo_tag(posicion_tag)
+
+                    if APLICAR_MEDIA_MOVIL and ekf is None:
+                        angulo_relativo = filtro_angulo.filtrar("tag_1", angulo_raw, instante)
+                    else:
+                        angulo_relativo = angulo_raw
+
+                    if debe_corregir(angulo_relativo, umbral=UMBRAL):
+                        correccion = pid.update(angulo_relativo, instante)
+                        correccion = np.clip(correccion, PID_SALIDA_MIN, PID_SALIDA_MAX)
+                        motor_controller.send_motor_command(int(correccion), int(-correccion))
+                    else:
+                        pid.omitir(instante)
+
+                    # Control de velocidad lineal por distancia
+                    distancia_al_tag = np.linalg.norm(posicion_tag)
+                    velocidad_avance = calcular_velocidad_escalonada(
+                        distancia=distancia_al_tag,
+                        distancia_minima=DISTANCIA_MINIMA_PARADA,
+                        velocidades_por_metro=VELOCIDADES_ESCALONADAS,
+                        velocidad_maxima=VELOCIDAD_MAXIMA
+                    )
+                    # Menos velocidad cuanto más incierta es la posición (covarianza del solver)
+                    velocidad_avance = limitar_por_incertidumbre(
+                        velocidad_avance,
+                        incertidumbre,
+                        INCERTIDUMBRE_VELOCIDAD_NOMINAL,
+                        INCERTIDUMBRE_VELOCIDAD_MAXIMA
+                    )
+
+                    if velocidad_avance > 0.0:
+                        vel_izq, vel_der, giro_normalizado = calcular_velocidades_diferenciales(
+                            v_lineal=velocidad_avance,
+                            angulo_relativo=angulo_relativo,
+                            max_v=VELOCIDAD_DIFERENCIAL_MAXIMA
+                        )
+                        pwm_manager.enviar_pwm(velocidad_a_pwm(vel_izq), velocidad_a_pwm(vel_der))
+                    else:
+                        pwm_manager.enviar_pwm(0, 0)
+
+                except Exception as e:
+                    print(f"Error en trilateración: {e}")
+                    pwm_manager.detener()
+
+            ciclo += 1
+            if NUM_CICLOS is not None and ciclo >= NUM_CICLOS:
+                print(f"\nFinalizando ejecución tras {NUM_CICLOS} ciclos.")
+                break
+    finally:
+        for tarea in tareas:
+            tarea.cancel()
+        print(f"Estadísticas de tramas: {data_receiver.get_frame_stats()}")
+        await motor_controller.disconnect()
+        await data_receiver.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main())
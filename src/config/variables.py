@@ -1,5 +1,5 @@
 import numpy as np
-from src.utils.auxiliares.mi_kalman import KalmanFilter
+from src.utils.auxiliares.mi_kalman import KalmanBank
 
 # #################################################################
 # NÚMERO DE CICLOS
@@ -10,6 +10,11 @@ NUM_CICLOS = 350
 # TIEMPO DE ESPERA
 # #################################################################
 TIEMPO_ESPERA = 0.1
+# Kalman, media móvil del ángulo y PID con el instante de cada trama
+# (last_frame_info): el paso de tiempo real se normaliza por TIEMPO_ESPERA,
+# el período con el que se ajustaron las ganancias, y el comportamiento no
+# cambia si el ciclo corre más rápido o pierde tramas (False = un paso fijo por ciclo)
+USAR_INSTANTE_TRAMA = False
 
 # #################################################################
 # COMUNICACIÓN UART
@@ -17,6 +22,30 @@ TIEMPO_ESPERA = 0.1
 DATA_PORT = '/dev/ttyAMA0'
 BAUDRATE = 500000
 
+# Lectura continua del puerto en un hilo (True) o una lectura por ciclo (False)
+LECTURA_EN_SEGUNDO_PLANO = False
+# Número de tramas recientes que se conservan en el historial del lector
+HISTORIAL_TRAMAS = 64
+# Formato de trama de telemetría: 'ascii' ([D1,D2,D3,Vbat,Currmot1,Currmot2]) o 'binario'
+FORMATO_TRAMA = 'ascii'
+
+# Envío de comandos de motor desde un hilo escritor (el último comando gana)
+ESCRITOR_MOTORES_EN_SEGUNDO_PLANO = False
+# Segundos tras los cuales se reenvía un comando idéntico al último enviado
+REENVIO_COMANDO_MOTOR = 0.5
+# Codificación de comandos de motor: 'json' (legado), 'ascii' (M<L>,<R>) o 'binario'
+PROTOCOLO_MOTOR = 'json'
+# Antigüedad máxima (s) de la última trama antes de detener los motores
+EDAD_MAXIMA_TRAMA = 0.5
+
+# Grabación / reproducción de telemetría (ver registro_telemetria.py)
+# Ruta donde grabar los bytes recibidos (None = no grabar)
+REGISTRO_TELEMETRIA = None
+# Ruta de un registro a reproducir en lugar del puerto serie (None = puerto real)
+REPRODUCIR_TELEMETRIA = None
+# 1.0 = tiempo real, k = k veces más rápido, None = lo más rápido posible
+VELOCIDAD_REPRODUCCION = 1.0
+
 
 # #################################################################
 # CONFIGURACIÓN DE SENSORES
@@ -35,6 +64,60 @@ posiciones_anchors = np.array([
     [0, 0, 1000]
 ])
 
+# #################################################################
+# TRILATERACIÓN
+# #################################################################
+# 'scipy' (L-BFGS-B desde [0, 0, 0], método original)
+# 'lineal' (mínimos cuadrados linealizados, pseudo-inversa precalculada)
+# 'gauss_newton' (Levenberg-Marquardt con arranque en caliente por tag)
+# 'esferas' (intersección cerrada de tres esferas, N_SENSORES = 3)
+# o 'robusto' (IRLS + RANSAC por ternas, rechaza anchors con multitrayecto)
+METODO_TRILATERACION = 'scipy'
+
+# Solución espejo preferida con anchors coplanares cuando no hay posición
+# previa: 1 = lado de la normal positiva (z > 0 con anchors en el plano XY), -1 = opuesto
+TRILATERACION_SEMIESPACIO = 1
+
+# Caché de soluciones por tag: con el tag quieto se reutiliza la última
+# posición (y su diagnóstico) mientras ninguna distancia filtrada se aleje
+# más de TRILATERACION_CACHE_EPSILON de las que la produjeron
+TRILATERACION_CACHE_EPSILON = None      # mm (p. ej. 0.5) ----> Con valor None no se aplica
+TRILATERACION_CACHE_EDAD_MAXIMA = 0.5   # Segundos máximos de reutilización de una solución
+
+# Trilateración robusta ('robusto', requiere N_SENSORES >= 4 para rechazar anchors)
+ROBUSTO_PONDERACION = 'tukey'     # Pesos IRLS: 'huber' o 'tukey'
+ROBUSTO_SIGMA = 20.0              # Ruido típico de las distancias (mm)
+ROBUSTO_UMBRAL_RECHAZO = 150.0    # Residuo (mm) a partir del cual se rechaza un anchor
+ROBUSTO_RANSAC = True             # Hipótesis inicial por ternas exhaustivas
+ROBUSTO_MAX_SUBCONJUNTOS = 64     # Límite de ternas evaluadas por trama
+ROBUSTO_MAX_ITERACIONES = 8       # Límite de iteraciones IRLS
+
+# Gauss-Newton / Levenberg-Marquardt
+GN_MAX_ITERACIONES = 10      # Límite de iteraciones por ciclo
+GN_TOLERANCIA = 1.0          # Norma del paso (mm) para considerar convergido
+GN_LAMBDA_INICIAL = 1e-3     # Amortiguamiento inicial
+GN_DISTANCIA_PLANO = 1.0     # Con anchors coplanares, distancia (mm) al plano por debajo de la
+                             # cual la posición previa no sirve de arranque (gradiente normal nulo)
+
+# Tabla de GDOP (dilución de precisión) de la geometría de anchors, en mm
+GDOP_RESOLUCION = 250.0      # Tamaño de celda de la grilla XY
+GDOP_EXTENSION = 10000.0     # La grilla cubre [-GDOP_EXTENSION, GDOP_EXTENSION] en X e Y
+GDOP_ALTURA = 1000.0         # Altura (Z) típica del tag
+
+# Diagnóstico de la posición (covarianza, GDOP y calidad, ver diagnostico_posicion.py)
+DIAGNOSTICO_SIGMA_DISTANCIA = 20.0         # Ruido nominal de las distancias (mm); piso de la estimación
+DIAGNOSTICO_GDOP_MAXIMO = 10.0             # GDOP a partir del cual la calidad es 'degradada'
+DIAGNOSTICO_INCERTIDUMBRE_MAXIMA = 300.0   # Incertidumbre (mm) a partir de la cual la calidad es 'degradada'
+
+# Seguimiento con EKF de velocidad constante sobre las distancias crudas (ver ekf_rangos.py)
+SEGUIMIENTO_EKF = False               # True = EKF en lugar de Kalman + media móvil + trilateración
+EKF_SIGMA_ACELERACION = 1000.0        # Aceleración típica del tag (mm/s²)
+EKF_SIGMA_DISTANCIA = 50.0            # Ruido de cada distancia cruda (mm)
+EKF_SIGMA_POSICION_INICIAL = 500.0    # mm
+EKF_SIGMA_VELOCIDAD_INICIAL = 1000.0  # mm/s
+EKF_DT_MAXIMO = 1.0                   # Segundos sin tramas tras los cuales se reinicia el filtro
+EKF_ADELANTO = 0.05                   # Segundos que se extrapola la posición (latencia hasta los motores)
+
 # #################################################################
 # PARÁMETROS KALMAN
 # #################################################################
@@ -42,10 +125,17 @@ posiciones_anchors = np.array([
 KALMAN_Q = 0.02
 KALMAN_R = 0.2
 KALMAN_ESTIMADO_INICIAL = 0.0
-kalman_sensores = [
-    KalmanFilter(q=KALMAN_Q, r=KALMAN_R, initial_estimate=KALMAN_ESTIMADO_INICIAL)
-    for _ in range(N_SENSORES)
-]
+# Ganancia estacionaria: al converger, cada actualización es x += k (z - x)
+KALMAN_ESTACIONARIO = False
+# Un canal por sensor, actualizados en un solo paso vectorial (KALMAN_Q por TIEMPO_ESPERA)
+kalman_sensores = KalmanBank(
+    N_SENSORES,
+    q=KALMAN_Q,
+    r=KALMAN_R,
+    initial_estimate=KALMAN_ESTIMADO_INICIAL,
+    steady_state=KALMAN_ESTACIONARIO,
+    dt_nominal=TIEMPO_ESPERA
+)
 
 # Debugging
 DEBUG_UART = True
@@ -99,6 +189,7 @@ Ahora si el ángulo fuera 0.5°:
 # Parámetros de suavizado para el PID
 PID_ALPHA = 0.3            # Factor de suavizado exponencial del error (entre 0 y 1) ---> Con valor 1 no se aplica
 PID_SALIDA_MAX = 30.0      # Límite máximo de corrección PID (saturación) ----> Con valor None no se aplica
+PID_DT_MAXIMO = 0.5        # Paso máximo (s) que integra/deriva el PID con instantes de trama ----> Con valor None no se aplica
 
 
 # #################################################################
@@ -117,6 +208,10 @@ VELOCIDADES_ESCALONADAS = {
 DISTANCIA_MINIMA_PARADA = 1
 VELOCIDAD_MAXIMA = 100.0  # A partir de 5 m
 
+# Reducción de la velocidad según la incertidumbre de la posición (mm)
+INCERTIDUMBRE_VELOCIDAD_NOMINAL = 100.0   # Hasta aquí, velocidad completa
+INCERTIDUMBRE_VELOCIDAD_MAXIMA = None     # Desde aquí, velocidad 0 ----> Con valor None no se aplica
+
 # #################################################################
 # CONTROL DIFERENCIAL POR ÁNGULO
 # #################################################################
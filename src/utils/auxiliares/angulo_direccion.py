@@ -1,10 +1,18 @@
 import numpy as np
+from src.utils.auxiliares.nucleos_jit import ACELERADO, angulo_plano
 
 def calcular_angulo_entre_tag_y_robot(pos_tag, sensor_1, sensor_2):
     """
     Calcula el ángulo entre el vector medio de los sensores 1 y 2 y el vector al tag.
     El ángulo se da en grados, positivo si el tag está a la derecha, negativo si está a la izquierda.
     """
+    if ACELERADO:
+        return angulo_plano(
+            float(pos_tag[0]), float(pos_tag[1]),
+            (sensor_1[0] + sensor_2[0]) / 2, (sensor_1[1] + sensor_2[1]) / 2,
+            float(sensor_2[0] - sensor_1[0]), float(sensor_2[1] - sensor_1[1])
+        )
+
     centro_referencia = (np.array(sensor_1) + np.array(sensor_2)) / 2
     frente_robot = np.array(sensor_2) - np.array(sensor_1)
     frente_robot[2] = 0  # ignorar componente Z para ángulo en plano XY
@@ -1,4 +1,5 @@
 import numpy as np
+from src.utils.auxiliares.nucleos_jit import ACELERADO, velocidades_diferenciales
 
 def calcular_velocidades_diferenciales(v_lineal, angulo_relativo, max_v=255):
     """
@@ -14,6 +15,12 @@ def calcular_velocidades_diferenciales(v_lineal, angulo_relativo, max_v=255):
     - (int, int): velocidades para rueda izquierda y derecha
     """
 
+    if ACELERADO:
+        vel_izq, vel_der, giro_normalizado = velocidades_diferenciales(
+            float(v_lineal), float(angulo_relativo), float(max_v)
+        )
+        return int(vel_izq), int(vel_der), giro_normalizado
+
     # Escalado del ángulo a [-1.0, 1.0] (control de curvatura)
     giro_normalizado = np.clip(angulo_relativo / 30.0, -1.0, 1.0)
 
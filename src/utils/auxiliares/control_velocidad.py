@@ -11,4 +11,21 @@ def calcular_velocidad_escalonada(distancia, distancia_minima, velocidades_por_m
     if nivel in velocidades_por_metro:
         return velocidades_por_metro[nivel]
     else:
-        return velocidad_maxima
\ No newline at end of file
+        return velocidad_maxima
+
+def limitar_por_incertidumbre(velocidad, incertidumbre, incertidumbre_nominal, incertidumbre_maxima):
+    """
+    Reduce la velocidad según la incertidumbre de la posición del tag (mm).
+    Hasta incertidumbre_nominal → velocidad sin cambios
+    Entre nominal y máxima → reducción lineal
+    Desde incertidumbre_maxima (o no finita) → velocidad 0
+    Con incertidumbre_maxima None no se aplica
+    """
+    if incertidumbre_maxima is None:
+        return velocidad
+    if not incertidumbre < incertidumbre_maxima:
+        return 0.0
+    if incertidumbre <= incertidumbre_nominal:
+        return velocidad
+    factor = (incertidumbre_maxima - incertidumbre) / (incertidumbre_maxima - incertidumbre_nominal)
+    return velocidad * factor
@@ -0,0 +1,103 @@
+"""
+Diagnóstico de una posición trilaterada.
+
+A partir de los residuos y del jacobiano del último paso del solver
+(J_i = (x - a_i) / |x - a_i|) se obtiene, sin volver a resolver:
+  - residuos por anchor,
+  - covarianza 3x3 = sigma² (JᵀJ)^-1,
+  - GDOP = sqrt(traza((JᵀJ)^-1)) en la posición (no la celda de la tabla),
+  - incertidumbre = sqrt(traza(covarianza)) = sigma * GDOP, en mm,
+  - una bandera de calidad.
+
+sigma es DIAGNOSTICO_SIGMA_DISTANCIA o, con más de tres anchors, la
+estimada de los residuos si es mayor.
+"""
+from collections import namedtuple
+import numpy as np
+from src.config.variables import (
+    DIAGNOSTICO_SIGMA_DISTANCIA,
+    DIAGNOSTICO_GDOP_MAXIMO,
+    DIAGNOSTICO_INCERTIDUMBRE_MAXIMA
+)
+
+CALIDAD_BUENA = 'buena'
+CALIDAD_DEGRADADA = 'degradada'      # GDOP o incertidumbre altos, solver sin converger o anchors rechazados
+CALIDAD_INVALIDA = 'invalida'        # Geometría degenerada o posición no finita
+
+DiagnosticoPosicion = namedtuple('DiagnosticoPosicion', [
+    'residuos',          # (k,) |x - a_i| - d_i en mm
+    'covarianza',        # (3, 3) en mm²
+    'gdop',
+    'incertidumbre',     # sqrt(traza(covarianza)) en mm
+    'error_promedio',    # Media de |residuos| (lo que antes retornaba calcular_error_promedio)
+    'calidad'
+])
+
+
+def _inversa_simetrica(m):
+    # Inversa 3x3 por adjunta en floats de Python (np.linalg.inv/det cuestan
+    # varias veces más en matrices tan chicas); None si es singular o no finita
+    (a, b, c), (_, e, f), (_, _, i) = m.tolist()
+    c00 = e * i - f * f
+    c01 = c * f - b * i
+    c02 = b * f - c * e
+    det = a * c00 + b * c01 + c * c02
+    if not abs(det) > 1e-12:
+        return None
+    return np.array((
+        (c00, c01, c02),
+        (c01, a * i - c * c, b * c - a * f),
+        (c02, b * c - a * f, a * e - b * b)
+    )) / det
+
+
+def diagnosticar(posicion, distancias, anchors, diff=None, rangos=None, residuos=None, activos=None,
+                 convergido=True, sigma=DIAGNOSTICO_SIGMA_DISTANCIA, gdop_maximo=DIAGNOSTICO_GDOP_MAXIMO,
+                 incertidumbre_maxima=DIAGNOSTICO_INCERTIDUMBRE_MAXIMA):
+    """
+    Args:
+        posicion: Posición resuelta (3,)
+        distancias: Distancias usadas por el solver (k,)
+        anchors: Anchors (k, 3)
+        diff, rangos, residuos: Arrays del último paso del solver (x - a_i, |x - a_i|,
+            |x - a_i| - d_i); si faltan se calculan una vez aquí
+        activos: Máscara (k,) de anchors no rechazados (None = todos)
+        convergido: El solver convergió (o las esferas se cortaron)
+        sigma: Ruido nominal de las distancias (mm)
+        gdop_maximo, incertidumbre_maxima: Límites para la calidad 'buena'
+
+    Returns:
+        DiagnosticoPosicion
+    """
+    d = np.asarray(distancias, dtype=np.float64)
+    if residuos is None:
+        diff = posicion - anchors[:len(d)]
+        rangos = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+        residuos = rangos - d
+    error_promedio = float(np.abs(residuos).sum()) / len(residuos)
+
+    J = diff / np.maximum(rangos, 1e-9)[:, None]
+    r = residuos
+    if activos is not None:
+        J = J[activos]
+        r = residuos[activos]
+
+    sigma2 = sigma * sigma
+    if len(r) > 3:
+        sigma2 = max(sigma2, float(r @ r) / (len(r) - 3))
+
+    inversa = _inversa_simetrica(J.T @ J)
+    if inversa is None:
+        covarianza = np.full((3, 3), np.inf)
+        return DiagnosticoPosicion(residuos, covarianza, np.inf, np.inf, error_promedio, CALIDAD_INVALIDA)
+
+    covarianza = sigma2 * inversa
+    gdop = float(np.sqrt(abs(inversa[0, 0] + inversa[1, 1] + inversa[2, 2])))
+    incertidumbre = float(np.sqrt(sigma2)) * gdop
+
+    if (not convergido or gdop > gdop_maximo or incertidumbre > incertidumbre_maxima
+            or (activos is not None and not np.all(activos))):
+        calidad = CALIDAD_DEGRADADA
+    else:
+        calidad = CALIDAD_BUENA
+    return DiagnosticoPosicion(residuos, covarianza, gdop, incertidumbre, error_promedio, calidad)
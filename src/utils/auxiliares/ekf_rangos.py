@@ -0,0 +1,186 @@
+"""
+Seguimiento del tag con un filtro de Kalman extendido sobre las distancias crudas.
+
+Estado (x, y, z, vx, vy, vz) con modelo de velocidad constante; la medida
+es directamente el vector de distancias a los anchors (el de SensorReader),
+con h_i(x) = |p - a_i| y fila de jacobiano ((p - a_i) / |p - a_i|, 0, 0, 0).
+Reemplaza la cadena Kalman por distancia + media móvil + trilateración +
+media móvil del ángulo por una predicción y una corrección por trama.
+
+El paso de tiempo sale del instante de cada trama (variable), el ruido de
+proceso es el de aceleración blanca:
+    Q = sigma_a² [[dt³/3 I, dt²/2 I], [dt²/2 I, dt I]]
+y posicion_en() extrapola la posición para compensar la latencia.
+
+Con anchors coplanares las distancias no distinguen los dos lados del
+plano: si la estimación lo cruza se refleja respecto de ese plano
+(p' = a0 + M (p - a0), v' = M v, covarianza con blockdiag(M, M)) al
+semiespacio TRILATERACION_SEMIESPACIO, como hacen los solvers.
+"""
+import time
+import numpy as np
+from src.config.variables import (
+    EKF_SIGMA_ACELERACION,
+    EKF_SIGMA_DISTANCIA,
+    EKF_SIGMA_POSICION_INICIAL,
+    EKF_SIGMA_VELOCIDAD_INICIAL,
+    EKF_DT_MAXIMO,
+    TRILATERACION_SEMIESPACIO
+)
+from src.utils.auxiliares.geometria_anchors import obtener_geometria
+from src.utils.auxiliares.trilateracion import resolver_lineal
+
+
+class RangeEKF:
+    """
+    EKF de velocidad constante para un tag, con medidas de distancia por anchor
+    """
+
+    def __init__(self, posiciones_anchors=None, n_anchors=None, sigma_aceleracion=EKF_SIGMA_ACELERACION,
+                 sigma_distancia=EKF_SIGMA_DISTANCIA, sigma_posicion=EKF_SIGMA_POSICION_INICIAL,
+                 sigma_velocidad=EKF_SIGMA_VELOCIDAD_INICIAL, dt_maximo=EKF_DT_MAXIMO):
+        """
+        Args:
+            posiciones_anchors: Anchors (k, 3), GeometriaAnchors o None (config)
+            n_anchors: Usar sólo los n primeros anchors (None = todos / N_SENSORES)
+            sigma_aceleracion: Aceleración típica del tag (mm/s²), ruido de proceso
+            sigma_distancia: Ruido de cada distancia cruda (mm)
+            sigma_posicion, sigma_velocidad: Incertidumbre inicial (mm, mm/s)
+            dt_maximo: Sin tramas por más de dt_maximo segundos se reinicia el filtro
+        """
+        self.geometria = obtener_geometria(posiciones_anchors, n=n_anchors)
+        self.q = sigma_aceleracion ** 2
+        self.r = sigma_distancia ** 2
+        self._R = self.r * np.eye(self.geometria.n)
+        self.sigma_posicion = sigma_posicion
+        self.sigma_velocidad = sigma_velocidad
+        self.dt_maximo = dt_maximo
+
+        # Reflexión respecto del plano de los anchors (sólo si son coplanares)
+        self._reflexion = None
+        if self.geometria.normal is not None:
+            normal = self.geometria.normal * TRILATERACION_SEMIESPACIO
+            espejo = np.eye(3) - 2.0 * np.outer(normal, normal)
+            self._normal = normal
+            self._reflexion = np.kron(np.eye(2), espejo)
+
+        # F = I + dt * (bloque posición-velocidad); Q = q (dt³/3 Q3 + dt²/2 Q2 + dt Q1)
+        self._F = np.eye(6)
+        self._bloque_pv = (np.arange(3), np.arange(3) + 3)
+        identidad = np.eye(3)
+        self._Q3 = np.kron([[1.0, 0.0], [0.0, 0.0]], identidad)
+        self._Q2 = np.kron([[0.0, 1.0], [1.0, 0.0]], identidad)
+        self._Q1 = np.kron([[0.0, 0.0], [0.0, 1.0]], identidad)
+
+        self.x = np.zeros(6)
+        self.P = np.eye(6)
+        self.instante = None   # Instante (monotónico) de la última corrección
+        self.inicializado = False
+
+    # #####################################################
+    # ESTADO
+    # #####################################################
+    def inicializar(self, distancias, instante=None):
+        """Posición por trilateración lineal, velocidad nula"""
+        self.x = np.zeros(6)
+        self.x[:3] = resolver_lineal(distancias, self.geometria)
+        self.P = np.diag([self.sigma_posicion ** 2] * 3 + [self.sigma_velocidad ** 2] * 3)
+        self.instante = time.monotonic() if instante is None else instante
+        self.inicializado = True
+
+    def reiniciar(self):
+        self.inicializado = False
+        self.instante = None
+
+    @property
+    def posicion(self):
+        return self.x[:3].copy()
+
+    @property
+    def velocidad(self):
+        return self.x[3:].copy()
+
+    @property
+    def covarianza_posicion(self):
+        return self.P[:3, :3].copy()
+
+    @property
+    def incertidumbre(self):
+        """sqrt(traza) de la covarianza de la posición (mm), como en DiagnosticoPosicion"""
+        return float(np.sqrt(self.P[0, 0] + self.P[1, 1] + self.P[2, 2]))
+
+    def posicion_en(self, instante):
+        """
+        Posición extrapolada con la velocidad estimada (compensa la latencia del ciclo);
+        sin instante o sin filtro inicializado, la posición actual
+        """
+        if instante is None or self.instante is None:
+            return self.posicion
+        return self.x[:3] + self.x[3:] * (instante - self.instante)
+
+    # #####################################################
+    # PREDICCIÓN Y CORRECCIÓN
+    # #####################################################
+    def predecir(self, dt):
+        if dt <= 0.0:
+            return
+        self.x[:3] += dt * self.x[3:]
+
+        F = self._F
+        F[self._bloque_pv] = dt
+        q_dt = self.q * dt
+        Q = (q_dt * dt * dt / 3) * self._Q3 + (q_dt * dt / 2) * self._Q2 + q_dt * self._Q1
+        self.P = F @ self.P @ F.T + Q
+
+    def actualizar(self, distancias, instante=None, mascara=None):
+        """
+        Predecir hasta el instante de la trama y corregir con sus distancias
+
+        Args:
+            distancias: Distancias crudas a los anchors (mm); no finitas o <= 0 se ignoran
+            instante: Instante monotónico de la trama (None = ahora),
+                p. ej. SensorReader.last_frame_info()[1]
+            mascara: Anchors con distancia válida (None = todas las finitas y positivas)
+
+        Returns:
+            Posición filtrada (3,) en el instante de la trama
+        """
+        instante = time.monotonic() if instante is None else instante
+        d = np.asarray(distancias, dtype=np.float64)[:self.geometria.n]
+        validos = np.isfinite(d) & (d > 0.0)
+        if mascara is not None:
+            validos &= mascara
+
+        if not self.inicializado or instante - self.instante > self.dt_maximo:
+            if validos.all():
+                self.inicializar(d, instante)
+            return self.posicion
+
+        self.predecir(instante - self.instante)
+        self.instante = instante
+        if not validos.any():
+            return self.posicion
+
+        if validos.all():
+            anchors, R = self.geometria.anchors, self._R
+        else:
+            anchors, d = self.geometria.anchors[validos], d[validos]
+            R = self.r * np.eye(len(d))
+        diff = self.x[:3] - anchors
+        rangos = np.maximum(np.sqrt(np.einsum('ij,ij->i', diff, diff)), 1e-9)
+        U = diff / rangos[:, None]          # H = [U, 0]
+        PHt = self.P[:, :3] @ U.T            # (6, m)
+        K = np.linalg.solve(U @ PHt[:3] + R, PHt.T).T   # S = H P Hᵀ + R, simétrica
+        self.x += K @ (d - rangos)
+        P = self.P - K @ PHt.T
+        self.P = (P + P.T) / 2
+
+        if self._reflexion is not None:
+            origen = self.geometria.anchors[0]
+            if self._normal @ (self.x[:3] - origen) < 0.0:
+                # Reflejar respecto del plano de los anchors (que no pasa por el origen)
+                self.x[:3] -= origen
+                self.x = self._reflexion @ self.x
+                self.x[:3] += origen
+                self.P = self._reflexion @ self.P @ self._reflexion
+        return self.posicion
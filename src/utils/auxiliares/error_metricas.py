@@ -1,10 +1,11 @@
 import numpy as np
 
 def calcular_error_promedio(posicion_estimada, distancias, anchors):
-    errores = [
-        abs(np.linalg.norm(posicion_estimada - anchor) - d)
-        for d, anchor in zip(distancias, anchors)
-    ]
+    n = min(len(distancias), len(anchors))
+    errores = np.abs(
+        np.linalg.norm(np.asarray(anchors[:n], dtype=np.float64) - posicion_estimada, axis=1)
+        - np.asarray(distancias[:n], dtype=np.float64)
+    )
     promedio = np.mean(errores)
     #print(f" Error promedio real: {promedio:.5f} mm\n")
     return promedio
\ No newline at end of file
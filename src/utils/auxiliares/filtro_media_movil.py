@@ -1,12 +1,156 @@
 from collections import deque
+import numpy as np
+from src.config.variables import TIEMPO_ESPERA
+
+# Actualizaciones entre re-sumas completas de BancoMediaMovil (acota la
+# deriva de redondeo de las sumas acumuladas)
+RESUMAR_CADA = 1024
+
+# Muestras máximas de una ventana de tiempo, en múltiplos de tamaño_ventana
+# (tramas más rápidas que dt_nominal o instantes repetidos no la hacen crecer sin límite)
+MUESTRAS_POR_VENTANA_TIEMPO = 4
+
 
 class FiltroMediaMovil:
-    def __init__(self, tamaño_ventana=5):
+    def __init__(self, tamaño_ventana=5, dt_nominal=TIEMPO_ESPERA):
+        """
+        dt_nominal: Período (s) al que corresponde tamaño_ventana; con
+            filtrar(clave, medicion, instante) la ventana es de tiempo y no de
+            muestras: promedia las de los últimos (tamaño_ventana - 0.5) * dt_nominal
+            segundos (tamaño_ventana muestras al período nominal, con margen
+            para el jitter), con a lo sumo MUESTRAS_POR_VENTANA_TIEMPO * tamaño_ventana
+            muestras
+        """
         self.ventanas = {}  # Historial por sensor/tag
+        self.ventanas_tiempo = {}  # (instante, medición) por sensor/tag
         self.tamaño = tamaño_ventana
+        self.duracion = (tamaño_ventana - 0.5) * dt_nominal
 
-    def filtrar(self, clave, nueva_medicion):
+    def filtrar(self, clave, nueva_medicion, instante=None):
+        if instante is not None:
+            return self._filtrar_en_tiempo(clave, nueva_medicion, instante)
         if clave not in self.ventanas:
             self.ventanas[clave] = deque(maxlen=self.tamaño)
         self.ventanas[clave].append(nueva_medicion)
-        return sum(self.ventanas[clave]) / len(self.ventanas[clave])
\ No newline at end of file
+        return sum(self.ventanas[clave]) / len(self.ventanas[clave])
+
+    def _filtrar_en_tiempo(self, clave, nueva_medicion, instante):
+        ventana = self.ventanas_tiempo.get(clave)
+        if ventana is None:
+            ventana = self.ventanas_tiempo[clave] = deque(
+                maxlen=max(1, MUESTRAS_POR_VENTANA_TIEMPO * self.tamaño)
+            )
+        ventana.append((instante, nueva_medicion))
+        while instante - ventana[0][0] >= self.duracion and len(ventana) > 1:
+            ventana.popleft()
+        return sum(medicion for _, medicion in ventana) / len(ventana)
+
+
+class BancoMediaMovil:
+    """
+    Media móvil de varios canales (índices enteros) sobre un buffer circular
+    preasignado y sumas acumuladas: cada muestra cuesta O(1) sin importar la
+    ventana. Misma media que FiltroMediaMovil, incluido el arranque con la
+    ventana incompleta (promedio de las muestras recibidas).
+
+    El buffer es (ventana, canales): mientras todos los canales se actualicen
+    juntos (canales=None) comparten la posición de escritura y la trama entra
+    como una fila contigua, sin indexado por canal.
+    """
+
+    def __init__(self, canales, tamaño_ventana=5, resumar_cada=RESUMAR_CADA):
+        """
+        Args:
+            canales: Número de canales
+            tamaño_ventana: Muestras por ventana
+            resumar_cada: Actualizaciones entre re-sumas completas del buffer
+        """
+        self.canales = canales
+        self.tamaño = max(1, int(tamaño_ventana))
+        self.resumar_cada = resumar_cada
+        self._buffer = np.zeros((self.tamaño, canales))
+        self._suma = np.zeros(canales)
+        self._columnas = np.arange(canales)
+        self._actualizaciones = 0
+        # Posición de escritura y muestras en la ventana (<= tamaño): escalares
+        # mientras los canales van sincronizados, por canal si no (None)
+        self._posicion = 0
+        self._conteo_comun = 0
+        self._indice = None
+        self._conteo = None
+
+    def _desincronizar(self):
+        # Pasar a posición y conteo por canal
+        if self._indice is None:
+            self._indice = np.full(self.canales, self._posicion, dtype=np.intp)
+            self._conteo = np.full(self.canales, self._conteo_comun, dtype=np.intp)
+
+    def filtrar(self, valores, canales=None):
+        """
+        Args:
+            valores: Una muestra por canal (o por cada índice de canales)
+            canales: Índices de los canales a actualizar (None = todos, en orden)
+
+        Returns:
+            Medias de los canales actualizados
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        if canales is None and self._indice is None:
+            fila = self._buffer[self._posicion]
+            # El buffer arranca en cero: la muestra saliente de una ventana
+            # incompleta es 0 y la suma sigue siendo la de las recibidas
+            self._suma += valores - fila
+            fila[:] = valores
+            self._posicion = self._posicion + 1 if self._posicion + 1 < self.tamaño else 0
+            if self._conteo_comun < self.tamaño:
+                self._conteo_comun += 1
+            medias = self._suma / self._conteo_comun
+        else:
+            self._desincronizar()
+            columnas = self._columnas if canales is None else np.asarray(canales, dtype=np.intp)
+            indice = self._indice[columnas]
+            self._suma[columnas] += valores - self._buffer[indice, columnas]
+            self._buffer[indice, columnas] = valores
+            indice += 1
+            indice[indice == self.tamaño] = 0
+            self._indice[columnas] = indice
+            conteo = np.minimum(self._conteo[columnas] + 1, self.tamaño)
+            self._conteo[columnas] = conteo
+            medias = self._suma[columnas] / conteo
+
+        # Re-suma periódica: las sumas acumuladas derivan por redondeo
+        self._actualizaciones += 1
+        if self._actualizaciones >= self.resumar_cada:
+            self._suma = self._buffer.sum(axis=0)
+            self._actualizaciones = 0
+        return medias
+
+    def ampliar(self, canales):
+        """Agregar canales (vacíos) hasta tener `canales`; los existentes conservan su ventana"""
+        if canales <= self.canales:
+            return
+        self._desincronizar()
+        nuevos = canales - self.canales
+        self._buffer = np.concatenate((self._buffer, np.zeros((self.tamaño, nuevos))), axis=1)
+        self._suma = np.concatenate((self._suma, np.zeros(nuevos)))
+        self._indice = np.concatenate((self._indice, np.zeros(nuevos, dtype=np.intp)))
+        self._conteo = np.concatenate((self._conteo, np.zeros(nuevos, dtype=np.intp)))
+        self._columnas = np.arange(canales)
+        self.canales = canales
+
+    def reiniciar(self, canales=None):
+        """Vaciar las ventanas (None = todos los canales)"""
+        if canales is None:
+            self._buffer[:] = 0.0
+            self._suma[:] = 0.0
+            self._posicion = 0
+            self._conteo_comun = 0
+            self._indice = None
+            self._conteo = None
+            return
+        self._desincronizar()
+        columnas = np.asarray(canales, dtype=np.intp)
+        self._buffer[:, columnas] = 0.0
+        self._suma[columnas] = 0.0
+        self._indice[columnas] = 0
+        self._conteo[columnas] = 0
@@ -0,0 +1,256 @@
+"""
+Geometría de anchors precalculada.
+
+Todo lo que depende sólo de las posiciones de los anchors (diferencias
+respecto del anchor de referencia, normas, pseudo-inversa del sistema
+linealizado, espacio nulo, referencia de ángulo y tabla de GDOP) se
+calcula una vez por configuración. Los solvers la buscan en un registro
+por clave de hash del conjunto de anchors; invalidar_geometria() descarta
+las entradas cuando los anchors cambian.
+"""
+import hashlib
+import itertools
+import numpy as np
+from src.utils.auxiliares.nucleos_jit import ACELERADO, angulo_plano
+from src.config.variables import (
+    posiciones_anchors as POSICIONES_ANCHORS,
+    N_SENSORES,
+    INDICES_SENSORES_ANGULO,
+    GDOP_RESOLUCION,
+    GDOP_EXTENSION,
+    GDOP_ALTURA
+)
+
+
+def clave_anchors(posiciones_anchors):
+    """Clave de hash del conjunto de anchors (forma y valores en float64)"""
+    anchors = np.ascontiguousarray(posiciones_anchors, dtype=np.float64)
+    return hashlib.blake2b(repr(anchors.shape).encode() + anchors.tobytes(), digest_size=16).hexdigest()
+
+
+def _solo_lectura(array):
+    array.flags.writeable = False
+    return array
+
+
+def calcular_gdop(posiciones, anchors):
+    """
+    GDOP geométrico sqrt(traza((JᵀJ)^-1)) con J los vectores unitarios
+    anchor -> posición. Acepta una posición (3,) o un lote (..., 3).
+    Retorna inf donde la geometría es degenerada.
+    """
+    posiciones = np.asarray(posiciones, dtype=np.float64)
+    diff = posiciones[..., None, :] - anchors
+    J = diff / np.maximum(np.linalg.norm(diff, axis=-1, keepdims=True), 1e-9)
+    JtJ = np.einsum('...ki,...kj->...ij', J, J)
+    det = np.linalg.det(JtJ)
+    validos = np.abs(det) > 1e-12
+    JtJ[~validos] = np.eye(3)
+    traza = np.trace(np.linalg.inv(JtJ), axis1=-2, axis2=-1)
+    return np.where(validos, np.sqrt(np.abs(traza)), np.inf)
+
+
+class GeometriaAnchors:
+    """
+    Matrices derivadas de un conjunto de anchors (sólo lectura)
+    """
+
+    def __init__(self, posiciones_anchors, indices_angulo=INDICES_SENSORES_ANGULO):
+        """
+        Args:
+            posiciones_anchors: Posiciones de los anchors (k, 3)
+            indices_angulo: Índices de los dos anchors que definen el frente del robot
+        """
+        anchors = np.array(posiciones_anchors, dtype=np.float64).reshape(-1, 3)
+        self.anchors = _solo_lectura(anchors)
+        self.n = len(anchors)
+        self.clave = clave_anchors(anchors)
+
+        # Sistema linealizado respecto del anchor 0 (ver trilateracion.py)
+        self.diferencias = _solo_lectura(anchors[1:] - anchors[0])
+        self.normas2 = _solo_lectura(np.einsum('ij,ij->i', anchors, anchors))
+        self.A = _solo_lectura(2.0 * self.diferencias)
+        self.pinv = _solo_lectura(np.linalg.pinv(self.A))
+        self.AtA = _solo_lectura(self.A.T @ self.A)
+
+        _, s, vt = np.linalg.svd(self.A)
+        self.rango = int(np.sum(s > s[0] * 1e-9)) if s.size else 0
+
+        # Con 3 anchors (o anchors coplanares) falta una dirección: la del
+        # espacio nulo de A, orientada hacia el semiespacio "positivo" (p. ej. z > 0)
+        self.normal = None
+        if self.rango == 2:
+            normal = vt[2].copy()
+            if normal[np.argmax(np.abs(normal))] < 0:
+                normal = -normal
+            self.normal = _solo_lectura(normal)
+
+        # Marco local para la intersección cerrada de tres esferas:
+        # ex hacia el anchor 1, ey en el plano de los tres, ez = ex × ey
+        # (orientado como normal). Floats de Python: el solver no usa numpy.
+        self.marco_esferas = None
+        if self.n == 3 and self.normal is not None:
+            d = np.linalg.norm(self.diferencias[0])
+            ex = self.diferencias[0] / d
+            i = ex @ self.diferencias[1]
+            ey = self.diferencias[1] - i * ex
+            j = np.linalg.norm(ey)
+            ey = ey / j
+            ez = np.cross(ex, ey)
+            if ez @ self.normal < 0:
+                ez = -ez
+            self.marco_esferas = (
+                tuple(anchors[0].tolist()), tuple(ex.tolist()), tuple(ey.tolist()), tuple(ez.tolist()),
+                float(d), float(i), float(j)
+            )
+
+        # Referencia de ángulo en el plano XY (ver angulo_direccion.py)
+        self.indices_angulo = tuple(indices_angulo)
+        self.centro_referencia = None
+        self.frente_unitario = None
+        if max(self.indices_angulo) < self.n:
+            sensor_1, sensor_2 = (anchors[i] for i in self.indices_angulo)
+            self.centro_referencia = _solo_lectura((sensor_1 + sensor_2) / 2)
+            frente = sensor_2 - sensor_1
+            frente[2] = 0.0
+            self.frente_unitario = _solo_lectura(frente / np.linalg.norm(frente))
+            # Como floats de Python para el núcleo compilado
+            self._centro_xy = tuple(self.centro_referencia[:2].tolist())
+            self._frente_xy = tuple(self.frente_unitario[:2].tolist())
+
+        self._tabla_gdop = None
+        self._marcos_subconjuntos = {}
+
+    # #####################################################
+    # SUBCONJUNTOS DE TRES ANCHORS (RANSAC)
+    # #####################################################
+    def marcos_subconjuntos(self, max_subconjuntos):
+        """
+        Marcos de intersección de tres esferas para cada terna de anchors no
+        colineales (como marco_esferas, pero en arrays). Se calculan una vez
+        por límite de ternas.
+
+        Returns:
+            dict con 'indices' (S, 3), 'p0', 'ex', 'ey', 'ez' (S, 3) y 'd', 'i', 'j' (S,)
+        """
+        marcos = self._marcos_subconjuntos.get(max_subconjuntos)
+        if marcos is None:
+            ternas = np.array(list(itertools.islice(
+                itertools.combinations(range(self.n), 3), max_subconjuntos
+            )), dtype=np.intp).reshape(-1, 3)
+            p = self.anchors[ternas]
+            u = p[:, 1] - p[:, 0]
+            v = p[:, 2] - p[:, 0]
+            d = np.linalg.norm(u, axis=1)
+            ex = u / d[:, None]
+            i = np.einsum('ij,ij->i', ex, v)
+            ey = v - i[:, None] * ex
+            j = np.linalg.norm(ey, axis=1)
+            validas = j > 1e-9 * np.maximum(d, 1.0)  # Ternas colineales fuera
+            ey = ey[validas] / j[validas, None]
+            ex = ex[validas]
+            marcos = {
+                'indices': ternas[validas],
+                'p0': p[validas, 0],
+                'ex': ex,
+                'ey': ey,
+                'ez': np.cross(ex, ey),
+                'd': d[validas],
+                'i': i[validas],
+                'j': j[validas]
+            }
+            for valor in marcos.values():
+                _solo_lectura(valor)
+            self._marcos_subconjuntos[max_subconjuntos] = marcos
+        return marcos
+
+    # #####################################################
+    # ÁNGULO ENTRE TAG Y ROBOT
+    # #####################################################
+    def angulo_tag(self, pos_tag):
+        """Igual que calcular_angulo_entre_tag_y_robot con los anchors de referencia"""
+        if ACELERADO:
+            return angulo_plano(
+                float(pos_tag[0]), float(pos_tag[1]),
+                self._centro_xy[0], self._centro_xy[1], self._frente_xy[0], self._frente_xy[1]
+            )
+        fx, fy = self.frente_unitario[0], self.frente_unitario[1]
+        dx = pos_tag[0] - self.centro_referencia[0]
+        dy = pos_tag[1] - self.centro_referencia[1]
+        if dx == 0.0 and dy == 0.0:
+            return np.nan  # Tag sobre el centro: sin dirección (como angulo_plano)
+        return np.degrees(np.arctan2(fx * dy - fy * dx, fx * dx + fy * dy))
+
+    # #####################################################
+    # TABLA DE GDOP
+    # #####################################################
+    @property
+    def tabla_gdop(self):
+        """
+        GDOP sobre una grilla XY a altura GDOP_ALTURA (calculada al primer uso)
+
+        Returns:
+            (ejes x (nx,), ejes y (ny,), gdop (ny, nx))
+        """
+        if self._tabla_gdop is None:
+            ejes = np.arange(-GDOP_EXTENSION, GDOP_EXTENSION + GDOP_RESOLUCION, GDOP_RESOLUCION, dtype=np.float64)
+            xx, yy = np.meshgrid(ejes, ejes)
+            puntos = np.stack((xx, yy, np.full_like(xx, GDOP_ALTURA)), axis=-1)
+            gdop = _solo_lectura(calcular_gdop(puntos, self.anchors))
+            self._tabla_gdop = (_solo_lectura(ejes), _solo_lectura(ejes.copy()), gdop)
+        return self._tabla_gdop
+
+    def gdop(self, posicion):
+        """GDOP de la celda de la tabla más cercana a la posición (inf fuera de la grilla)"""
+        ejes_x, ejes_y, gdop = self.tabla_gdop
+        ix = int(round((posicion[0] - ejes_x[0]) / GDOP_RESOLUCION))
+        iy = int(round((posicion[1] - ejes_y[0]) / GDOP_RESOLUCION))
+        if 0 <= ix < len(ejes_x) and 0 <= iy < len(ejes_y):
+            return gdop[iy, ix]
+        return np.inf
+
+
+# #####################################################
+# REGISTRO POR CLAVE DE HASH
+# #####################################################
+_registro = {}
+
+
+def obtener_geometria(posiciones_anchors=None, n=None):
+    """
+    Geometría del conjunto de anchors (creada la primera vez, luego del registro)
+
+    Args:
+        posiciones_anchors: Anchors (k, 3), una GeometriaAnchors (se retorna tal cual)
+            o None para los de src/config/variables.py
+        n: Usar sólo los n primeros anchors (None = todos; con los de config, N_SENSORES)
+    """
+    if isinstance(posiciones_anchors, GeometriaAnchors):
+        if n is None or n == posiciones_anchors.n:
+            return posiciones_anchors
+        posiciones_anchors = posiciones_anchors.anchors
+    elif posiciones_anchors is None:
+        posiciones_anchors = POSICIONES_ANCHORS
+        n = N_SENSORES if n is None else n
+    anchors = np.asarray(posiciones_anchors, dtype=np.float64)
+    if n is not None:
+        anchors = anchors[:n]
+    clave = clave_anchors(anchors)
+    geometria = _registro.get(clave)
+    if geometria is None:
+        geometria = GeometriaAnchors(anchors)
+        _registro[clave] = geometria
+    return geometria
+
+
+def invalidar_geometria(posiciones_anchors=None):
+    """
+    Descartar geometrías del registro
+
+    Args:
+        posiciones_anchors: Conjunto a descartar (None = todo el registro)
+    """
+    if posiciones_anchors is None:
+        _registro.clear()
+    else:
+        _registro.pop(clave_anchors(posiciones_anchors), None)
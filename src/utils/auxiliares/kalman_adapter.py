@@ -1,4 +1,28 @@
+import numpy as np
 from src.config.variables import kalman_sensores
 
-def filtrar_mediciones_kalman(distancias):
-    return [kf.update(d) for kf, d in zip(kalman_sensores, distancias)]
\ No newline at end of file
+def filtrar_mediciones_kalman(distancias, mascara=None, instante=None):
+    """
+    Args:
+        distancias: Distancias de los sensores (hasta N_SENSORES; las de más
+            se ignoran y los sensores que faltan conservan su estimación)
+        mascara: Sensores con distancia válida (None = todas las finitas);
+            los demás conservan su estimación
+        instante: Instante de la trama (last_frame_info); None = un paso de TIEMPO_ESPERA
+
+    Returns:
+        ndarray (ya no lista) con las distancias filtradas de los
+        min(len(distancias), N_SENSORES) sensores recibidos
+    """
+    n = kalman_sensores.n
+    z = np.asarray(distancias, dtype=np.float64)[:n]
+    recibidos = len(z)
+    if recibidos < n:
+        # Sensores sin distancia: fuera de la máscara, como una medida inválida
+        z = np.concatenate((z, np.full(n - recibidos, np.nan)))
+        if mascara is not None:
+            mascara = np.concatenate((np.asarray(mascara, dtype=bool)[:recibidos],
+                                      np.zeros(n - recibidos, dtype=bool)))
+    elif mascara is not None:
+        mascara = np.asarray(mascara, dtype=bool)[:n]
+    return kalman_sensores.update(z, mascara, instante)[:recibidos]
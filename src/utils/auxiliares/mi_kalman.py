@@ -1,13 +1,382 @@
+import math
+import numpy as np
+
+# Hasta esta cantidad de canales, update_batch recorre cada canal con la
+# recursión escalar (más barata que un paso NumPy por instante)
+CANALES_BATCH_ESCALAR = 16
+
+
+# Diferencia de ganancia con la estacionaria para pasar al modo de ganancia fija
+TOLERANCIA_GANANCIA = 1e-9
+
+# Desvío relativo del paso de tiempo respecto del nominal dentro del cual
+# el paso cuenta como nominal (q sin escalar: con KALMAN_Q/KALMAN_R la
+# ganancia cambia menos del 1%). Así el jitter de llegada de las tramas no
+# impide converger a la ganancia estacionaria; fuera de la tolerancia el
+# paso es completo con q escalado
+TOLERANCIA_PERIODO = 0.02
+
+
+def ganancia_estacionaria(q, r):
+    """
+    Ganancia a la que converge la recursión con q y r constantes (escalares o arrays).
+    Punto fijo de la covarianza predicha P = p + q con p = P r / (P + r):
+        P = (q + sqrt(q² + 4 q r)) / 2,  k = P / (P + r)
+    """
+    p_pred = (q + (q * q + 4 * q * r) ** 0.5) / 2
+    return p_pred / (p_pred + r)
+
+
+def factor_periodo(instante_anterior, instante, dt_nominal):
+    """
+    dt / dt_nominal entre dos instantes: el q de cada paso se escala por este
+    factor (q es la varianza del proceso acumulada en dt_nominal).
+    1.0 sin alguno de los instantes, sin dt_nominal (un paso fijo por update)
+    o dentro de TOLERANCIA_PERIODO; 0.0 si el instante no avanzó.
+    """
+    if instante is None or instante_anterior is None or not dt_nominal:
+        return 1.0
+    factor = max(instante - instante_anterior, 0.0) / dt_nominal
+    return 1.0 if abs(factor - 1.0) <= TOLERANCIA_PERIODO else factor
+
+
+def _solo_lectura(array):
+    # Vista sin escritura: modificar q o r en el lugar no pasaría por el setter
+    vista = array.view()
+    vista.flags.writeable = False
+    return vista
+
+
 class KalmanFilter:
-    def __init__(self, q, r, initial_estimate=0.0):
-        self.q = q  # Varianza del proceso
-        self.r = r  # Varianza del sensor
+    def __init__(self, q, r, initial_estimate=0.0, steady_state=False, dt_nominal=None):
+        """
+        steady_state: Al converger la ganancia a la estacionaria, cada update
+            se reduce a x += k (z - x); cambiar q o r vuelve a la recursión completa
+        dt_nominal: Período (s) al que corresponde q; con update(z, instante)
+            q se escala por dt / dt_nominal (None = un paso fijo por update)
+        """
+        self._q = q  # Varianza del proceso
+        self._r = r  # Varianza del sensor
         self.x_hat = initial_estimate  # Estimación inicial
         self.p = 1.0  # Error de estimación inicial
+        self.steady_state = steady_state
+        self.dt_nominal = dt_nominal
+        self.instante = None  # Instante de la última medida
+        self._reiniciar_ganancia()
+
+    @property
+    def q(self):
+        return self._q
+
+    @q.setter
+    def q(self, valor):
+        self._q = valor
+        self._reiniciar_ganancia()
+
+    @property
+    def r(self):
+        return self._r
+
+    @r.setter
+    def r(self, valor):
+        self._r = valor
+        self._reiniciar_ganancia()
 
-    def update(self, measurement):
-        self.p += self.q  # Predicción
-        k = self.p / (self.p + self.r)  # Ganancia Kalman
+    def _reiniciar_ganancia(self):
+        self.k_estacionaria = ganancia_estacionaria(self._q, self._r) if self._q + self._r > 0 else 0.0
+        self.convergido = False
+
+    def update(self, measurement, instante=None):
+        """
+        instante: Instante (s) de la medida, p. ej. el de la trama; None = un paso nominal
+        """
+        factor = 1.0
+        if instante is not None:
+            factor = factor_periodo(self.instante, instante, self.dt_nominal)
+            self.instante = instante
+        if self.convergido:
+            if factor == 1.0:
+                self.x_hat += self.k_estacionaria * (measurement - self.x_hat)
+                return self.x_hat
+            # Paso fuera del nominal: recursión completa desde la covarianza
+            # estacionaria (p = k r) hasta volver a converger
+            self.p = self.k_estacionaria * self._r
+            self.convergido = False
+        self.p += self._q * factor  # Predicción
+        k = self.p / (self.p + self._r)  # Ganancia Kalman
         self.x_hat += k * (measurement - self.x_hat)  # Corrección
         self.p *= (1 - k)
-        return self.x_hat
\ No newline at end of file
+        if self.steady_state and abs(k - self.k_estacionaria) <= TOLERANCIA_GANANCIA:
+            self.convergido = True
+        return self.x_hat
+
+
+class KalmanBank:
+    """
+    N filtros KalmanFilter independientes (uno por canal) con el estado en
+    arrays: todos los canales se actualizan en un solo paso vectorial, con
+    la misma aritmética que KalmanFilter.update.
+    Los canales enmascarados o con medida no finita (NaN = sin medida)
+    conservan su estado.
+    """
+
+    def __init__(self, n, q, r, initial_estimate=0.0, steady_state=False, dt_nominal=None):
+        """
+        Args:
+            n: Número de canales
+            q, r: Varianzas del proceso y del sensor (escalares o una por canal)
+            initial_estimate: Estimación inicial (escalar o una por canal)
+            steady_state: Como en KalmanFilter; la ganancia fija se usa cuando
+                todos los canales convergieron. Asignar q o r vuelve a la
+                recursión completa (q y r se leen como vistas de sólo lectura)
+            dt_nominal: Como en KalmanFilter (un mismo instante para todos los canales)
+        """
+        self.n = n
+        self._q = np.full(n, q, dtype=np.float64)  # Varianza del proceso
+        self._r = np.full(n, r, dtype=np.float64)  # Varianza del sensor
+        self._estimado_inicial = np.full(n, initial_estimate, dtype=np.float64)
+        self.x_hat = self._estimado_inicial.copy()  # Estimación inicial
+        self.p = np.ones(n)  # Error de estimación inicial
+        self.steady_state = steady_state
+        self.dt_nominal = dt_nominal
+        self.instante = None  # Instante de la última medida
+        self._reiniciar_ganancia()
+
+    def reiniciar(self, canales=None):
+        """Volver los canales a la estimación y covarianza iniciales (None = todos)"""
+        if canales is None:
+            self.x_hat[:] = self._estimado_inicial
+            self.p[:] = 1.0
+            self.convergido[:] = False
+            self.instante = None
+        else:
+            canales = np.asarray(canales, dtype=np.intp)
+            self.x_hat[canales] = self._estimado_inicial[canales]
+            self.p[canales] = 1.0
+            self.convergido[canales] = False
+        self._todos_convergidos = False
+
+    def ampliar(self, n, q=None, r=None, initial_estimate=None):
+        """
+        Agregar canales (en su estado inicial) hasta tener n; los existentes
+        conservan su estado. q, r, initial_estimate de los nuevos canales
+        (None = los del último canal existente)
+        """
+        if n <= self.n:
+            return
+        nuevos = n - self.n
+
+        def extender(array, valor):
+            if valor is None:
+                valor = array[-1] if self.n else 0.0
+            return np.concatenate((array, np.full(nuevos, valor, dtype=array.dtype)))
+
+        self._q = extender(self._q, q)
+        self._r = extender(self._r, r)
+        self._estimado_inicial = extender(self._estimado_inicial, initial_estimate)
+        self.x_hat = np.concatenate((self.x_hat, self._estimado_inicial[self.n:]))
+        self.p = np.concatenate((self.p, np.ones(nuevos)))
+        with np.errstate(invalid='ignore'):
+            k = ganancia_estacionaria(self._q[self.n:], self._r[self.n:])
+        k = np.where(self._q[self.n:] + self._r[self.n:] > 0, k, 0.0)
+        self.k_estacionaria = np.concatenate((self.k_estacionaria, k))
+        self.convergido = np.concatenate((self.convergido, np.zeros(nuevos, dtype=bool)))
+        self._todos_convergidos = False
+        self.n = n
+
+    @property
+    def q(self):
+        return _solo_lectura(self._q)
+
+    @q.setter
+    def q(self, valor):
+        self._q = np.full(self.n, valor, dtype=np.float64)
+        self._reiniciar_ganancia()
+
+    @property
+    def r(self):
+        return _solo_lectura(self._r)
+
+    @r.setter
+    def r(self, valor):
+        self._r = np.full(self.n, valor, dtype=np.float64)
+        self._reiniciar_ganancia()
+
+    def _reiniciar_ganancia(self):
+        with np.errstate(invalid='ignore'):
+            k = ganancia_estacionaria(self._q, self._r)
+        self.k_estacionaria = np.where(self._q + self._r > 0, k, 0.0)
+        self.convergido = np.zeros(self.n, dtype=bool)
+        self._todos_convergidos = False
+
+    def _registrar_ganancia(self, k):
+        self.convergido |= np.abs(k - self.k_estacionaria) <= TOLERANCIA_GANANCIA
+        self._todos_convergidos = bool(self.convergido.all())
+
+    def update(self, measurements, mask=None, instante=None, canales=None):
+        """
+        Args:
+            measurements: Medidas de los n canales (o de `canales`)
+            mask: Canales con medida válida (None = todos los finitos)
+            instante: Instante (s) de las medidas, p. ej. el de la trama; None = un paso nominal
+            canales: Índices de los canales medidos (None = todos); sólo esos
+                se actualizan, con un costo que no depende de n. No admite instante
+
+        Returns:
+            Copia de las estimaciones (n,) o de las de `canales`
+        """
+        z = np.asarray(measurements, dtype=np.float64)
+        if canales is not None:
+            if instante is not None:
+                raise ValueError("update con canales no admite instante (el reloj es común a todo el banco)")
+            return self._update_canales(z, np.asarray(canales, dtype=np.intp), mask)
+        factor = 1.0
+        if instante is not None:
+            factor = factor_periodo(self.instante, instante, self.dt_nominal)
+            self.instante = instante
+        nominal = factor == 1.0
+        sin_huecos = mask is None and math.isfinite(z.sum())
+        if sin_huecos and nominal and self._todos_convergidos:
+            self.x_hat += self.k_estacionaria * (z - self.x_hat)
+            return self.x_hat.copy()
+
+        if not nominal and self.convergido.any():
+            # Como en KalmanFilter: recursión completa desde la covarianza estacionaria
+            self.p = np.where(self.convergido, self.k_estacionaria * self._r, self.p)
+            self.convergido[:] = False
+        p = self.p + self._q * factor  # Predicción
+        k = p / (p + self._r)  # Ganancia Kalman
+        if sin_huecos:
+            self.x_hat += k * (z - self.x_hat)  # Corrección
+            p *= (1 - k)
+            self.p = p
+        else:
+            validos = np.isfinite(z)
+            if mask is not None:
+                validos &= mask
+            k[~validos] = 0.0
+            self.x_hat += k * (np.where(validos, z, self.x_hat) - self.x_hat)
+            p *= (1 - k)
+            if instante is None:
+                self.p = np.where(validos, p, self.p)
+            else:
+                # Con instantes el tiempo pasa también sin medida: queda la
+                # covarianza predicha (como un KalmanFilter que no se llama)
+                self.p = p
+                self.convergido &= validos
+        if self.steady_state:
+            self._registrar_ganancia(k)
+        return self.x_hat.copy()
+
+    def _update_canales(self, z, canales, mask):
+        # update sin instante restringido a `canales`: los demás ni se leen
+        validos = np.isfinite(z)
+        if mask is not None:
+            validos &= np.asarray(mask, dtype=bool)
+        x_hat = self.x_hat[canales]
+        if self.steady_state and validos.all() and self.convergido[canales].all():
+            x_hat += self.k_estacionaria[canales] * (z - x_hat)
+            self.x_hat[canales] = x_hat
+            return x_hat
+
+        p_anterior = self.p[canales]
+        p = p_anterior + self._q[canales]  # Predicción
+        k = p / (p + self._r[canales])  # Ganancia Kalman
+        k[~validos] = 0.0
+        x_hat += k * (np.where(validos, z, x_hat) - x_hat)  # Corrección
+        self.x_hat[canales] = x_hat
+        self.p[canales] = np.where(validos, p * (1 - k), p_anterior)
+        if self.steady_state:
+            nuevos = (np.abs(k - self.k_estacionaria[canales]) <= TOLERANCIA_GANANCIA) & ~self.convergido[canales]
+            if nuevos.any():
+                self.convergido[canales[nuevos]] = True
+                self._todos_convergidos = bool(self.convergido.all())
+        return x_hat
+
+    def update_batch(self, measurements, mask=None, instantes=None):
+        """
+        Procesar un registro completo (equivale a llamar update fila por fila)
+
+        Args:
+            measurements: Matriz (T, n) de medidas, una fila por instante
+            mask: Matriz (T, n) de medidas válidas (None = todas las finitas)
+            instantes: Instante (s) de cada fila (None = pasos nominales)
+
+        Returns:
+            Estimaciones (T, n); el estado queda en el último instante
+        """
+        z = np.asarray(measurements, dtype=np.float64).reshape(-1, self.n)
+        validos = np.isfinite(z)
+        if mask is not None:
+            validos &= np.asarray(mask, dtype=bool).reshape(z.shape)
+        z = np.where(validos, z, 0.0)
+        completos = validos.all(axis=1)
+        factores = self._factores(instantes, len(z))
+        con_instantes = instantes is not None
+
+        estimaciones = np.empty_like(z)
+        if self.n <= CANALES_BATCH_ESCALAR:
+            for j in range(self.n):
+                estimaciones[:, j] = self._batch_canal(j, z[:, j].tolist(), validos[:, j].tolist(),
+                                                       factores, con_instantes)
+            return estimaciones
+
+        # Muchos canales: recursión completa, la ganancia fija se retoma en update
+        x_hat, p, q, r = self.x_hat, self.p, self._q, self._r
+        k = None
+        for t in range(len(z)):
+            p_pred = p + q * factores[t]
+            k = p_pred / (p_pred + r)
+            if completos[t]:
+                x_hat += k * (z[t] - x_hat)
+                p = p_pred * (1 - k)
+            else:
+                k *= validos[t]
+                x_hat += k * (np.where(validos[t], z[t], x_hat) - x_hat)
+                p = p_pred * (1 - k) if con_instantes else np.where(validos[t], p_pred * (1 - k), p)
+            estimaciones[t] = x_hat
+        self.p = p
+        if self.steady_state and k is not None:
+            if con_instantes:
+                self.convergido[:] = False  # Sólo cuenta la ganancia del último paso
+            self._registrar_ganancia(k)
+        return estimaciones
+
+    def _factores(self, instantes, n_filas):
+        # dt / dt_nominal de cada fila (floats de Python); deja self.instante en la última
+        if instantes is None:
+            return [1.0] * n_filas
+        instantes = [float(t) for t in instantes]
+        anteriores = [self.instante] + instantes[:-1]
+        if instantes:
+            self.instante = instantes[-1]
+        return [factor_periodo(a, t, self.dt_nominal) for a, t in zip(anteriores, instantes)]
+
+    def _batch_canal(self, j, medidas, validos, factores, con_instantes):
+        # Misma recursión que update (un canal) sobre floats de Python
+        x_hat, p, q, r = float(self.x_hat[j]), float(self.p[j]), float(self._q[j]), float(self._r[j])
+        k_estacionaria = float(self.k_estacionaria[j])
+        convergido = bool(self.convergido[j])
+        estimaciones = []
+        for medida, valido, factor in zip(medidas, validos, factores):
+            nominal = factor == 1.0
+            if valido and convergido and nominal:
+                x_hat += k_estacionaria * (medida - x_hat)
+            elif valido or con_instantes:
+                # Con instantes el tiempo pasa también sin medida (p predicha)
+                if convergido:
+                    if not nominal:
+                        p = k_estacionaria * r
+                    convergido = False
+                p += q * factor
+                if valido:
+                    k = p / (p + r)
+                    x_hat += k * (medida - x_hat)
+                    p *= (1 - k)
+                    convergido = self.steady_state and abs(k - k_estacionaria) <= TOLERANCIA_GANANCIA
+            estimaciones.append(x_hat)
+        self.x_hat[j] = x_hat
+        self.p[j] = p
+        self.convergido[j] = convergido
+        self._todos_convergidos = bool(self.convergido.all())
+        return estimaciones
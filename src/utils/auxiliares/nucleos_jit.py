@@ -0,0 +1,137 @@
+"""
+Núcleos compilados (Numba) del camino caliente por trama.
+
+Si numba está instalado, cada núcleo se compila con @njit la primera vez
+que se llama y ACELERADO es True; trilateracion (objetivo de scipy),
+angulo_direccion, geometria_anchors, pid_controller y control_diferencial
+eligen entonces el núcleo en lugar de su camino NumPy. Sin numba,
+ACELERADO es False y todo queda como antes. precalentar() fuerza la
+compilación (o la carga desde la caché) antes del lazo de control, para
+que no caiga en el primer ciclo.
+
+KalmanFilter.update no lo usa: ya opera sobre floats de Python y el costo
+de llamar a un núcleo compilado supera al de la actualización (ver
+bench_nucleos.py); kalman_paso queda como referencia.
+
+Los núcleos operan sobre floats escalares y arrays float64, con la misma
+fórmula que el camino NumPy (difieren a lo sumo en el último bit). La
+versión Python sin compilar de cada uno queda en .py_func.
+"""
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_DISPONIBLE = njit is not None
+ACELERADO = NUMBA_DISPONIBLE
+
+
+def _compilar(funcion):
+    if ACELERADO:
+        return njit(cache=True)(funcion)
+    funcion.py_func = funcion
+    return funcion
+
+
+# #####################################################
+# FILTRO KALMAN ESCALAR (mismo paso que KalmanFilter.update)
+# #####################################################
+@_compilar
+def kalman_paso(x_hat, p, q, r, medida):
+    """Returns: (nueva estimación, nueva covarianza)"""
+    p += q
+    k = p / (p + r)
+    x_hat += k * (medida - x_hat)
+    p *= (1 - k)
+    return x_hat, p
+
+
+# #####################################################
+# OBJETIVO DE TRILATERACIÓN (resolver_scipy)
+# #####################################################
+@_compilar
+def objetivo_trilateracion(pos, anchors, distancias):
+    """Suma de (|pos - a_i| - d_i)² sobre los anchors"""
+    total = 0.0
+    for i in range(distancias.shape[0]):
+        dx = pos[0] - anchors[i, 0]
+        dy = pos[1] - anchors[i, 1]
+        dz = pos[2] - anchors[i, 2]
+        residuo = math.sqrt(dx * dx + dy * dy + dz * dz) - distancias[i]
+        total += residuo * residuo
+    return total
+
+
+# #####################################################
+# ÁNGULO ENTRE TAG Y ROBOT EN EL PLANO XY
+# #####################################################
+@_compilar
+def angulo_plano(tag_x, tag_y, centro_x, centro_y, frente_x, frente_y):
+    """
+    Ángulo (grados) del vector centro -> tag respecto del frente, ambos en XY.
+    NaN si alguno de los dos vectores es nulo (como el camino NumPy, que los normaliza)
+    """
+    dx = tag_x - centro_x
+    dy = tag_y - centro_y
+    if (dx == 0.0 and dy == 0.0) or (frente_x == 0.0 and frente_y == 0.0):
+        return math.nan
+    return math.degrees(math.atan2(frente_x * dy - frente_y * dx, frente_x * dx + frente_y * dy))
+
+
+# #####################################################
+# PID CON FILTRO EXPONENCIAL DEL ERROR (PIDController.update)
+# #####################################################
+@_compilar
+def pid_paso(medida, setpoint, alpha, kp, ki, kd, integral, error_anterior, salida_maxima, factor=1.0):
+    """
+    salida_maxima: Saturación simétrica (inf = sin saturación)
+    factor: dt / dt_nominal del paso (1.0 = paso nominal, misma aritmética que antes)
+
+    Returns:
+        (salida, nueva integral, error filtrado)
+    """
+    if factor != 1.0:
+        alpha = 1.0 - (1.0 - alpha) ** factor
+    error_actual = setpoint - medida
+    error_filtrado = alpha * error_actual + (1 - alpha) * error_anterior
+    integral += error_filtrado * factor
+    derivada = (error_filtrado - error_anterior) / factor if factor > 0.0 else 0.0
+    salida = kp * error_filtrado + ki * integral + kd * derivada
+    salida = max(min(salida, salida_maxima), -salida_maxima)
+    return salida, integral, error_filtrado
+
+
+# #####################################################
+# VELOCIDADES DIFERENCIALES
+# #####################################################
+@_compilar
+def velocidades_diferenciales(v_lineal, angulo_relativo, max_v):
+    """Returns: (velocidad izquierda, velocidad derecha, giro normalizado) sin truncar"""
+    giro = min(max(angulo_relativo / 30.0, -1.0), 1.0)
+    vel_der = min(max(v_lineal * (1.0 - giro), 0.0), max_v)
+    vel_izq = min(max(v_lineal * (1.0 + giro), 0.0), max_v)
+    return vel_izq, vel_der, giro
+
+
+# #####################################################
+# PRECALENTAMIENTO
+# #####################################################
+def precalentar():
+    """
+    Compilar cada núcleo con los tipos del camino caliente (floats y arrays
+    float64; los anchors de GeometriaAnchors son de sólo lectura, otra
+    especialización para numba). Sin numba no hace nada.
+    """
+    if not ACELERADO:
+        return
+    kalman_paso(0.0, 1.0, 0.02, 0.2, 1.0)
+    anchors = np.eye(3)
+    objetivo_trilateracion(np.zeros(3), anchors, np.ones(3))
+    anchors.flags.writeable = False
+    objetivo_trilateracion(np.zeros(3), anchors, np.ones(3))
+    angulo_plano(1.0, 1.0, 0.0, 0.0, 1.0, 0.0)
+    pid_paso(1.0, 0.0, 0.3, 1.0, 0.1, 0.1, 0.0, 0.0, math.inf, 1.0)
+    velocidades_diferenciales(10.0, 5.0, 255.0)
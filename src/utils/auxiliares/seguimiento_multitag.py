@@ -0,0 +1,196 @@
+"""
+Seguimiento de varios tags a la vez.
+
+Cada tag ocupa un slot entero y cada par (tag, anchor) un canal de un
+KalmanBank y de un BancoMediaMovil (canal = slot * k + anchor), en lugar de
+dicts con claves f"{id_tag}_{i}" y listas de objetos. Todos los tags con
+distancias nuevas se filtran y resuelven en un solo paso vectorial que sólo
+recorre sus canales: el costo del ciclo depende de los tags actualizados,
+no de la capacidad.
+
+    tracker = MultiTagTracker(posiciones_anchors)
+    posiciones, errores = tracker.actualizar(['tag_1', 'tag_2'], distancias)  # (2, k)
+"""
+import time
+import numpy as np
+from src.config.variables import (
+    N_SENSORES,
+    KALMAN_Q,
+    KALMAN_R,
+    KALMAN_ESTIMADO_INICIAL,
+    MEDIA_MOVIL_VENTANA
+)
+from src.utils.auxiliares.filtro_media_movil import BancoMediaMovil
+from src.utils.auxiliares.geometria_anchors import obtener_geometria
+from src.utils.auxiliares.mi_kalman import KalmanBank
+from src.utils.auxiliares.trilateracion import METODO_LINEAL
+from src.utils.auxiliares.trilateracion_lote import obtener_posiciones_lote
+
+
+class MultiTagTracker:
+    """
+    Filtros y posiciones de muchos tags en arrays por slot.
+    Equivale, por tag, a filtrar_mediciones_kalman + obtener_posicion_tag_3d
+    (Kalman por anchor, luego media móvil, luego trilateración).
+    """
+
+    def __init__(self, posiciones_anchors=None, n_anchors=N_SENSORES, capacidad=8,
+                 ventana=MEDIA_MOVIL_VENTANA, q=KALMAN_Q, r=KALMAN_R,
+                 estimado_inicial=KALMAN_ESTIMADO_INICIAL, metodo=METODO_LINEAL):
+        """
+        Args:
+            posiciones_anchors: Anchors (k, 3), GeometriaAnchors o None (config)
+            n_anchors: Cantidad de anchors usados (distancias por tag)
+            capacidad: Slots iniciales (se duplica al llenarse)
+            ventana: Tamaño de la media móvil (0 o 1 = sin media móvil)
+            q, r, estimado_inicial: Parámetros del Kalman por anchor
+            metodo: 'lineal' o 'gauss_newton' (ver trilateracion_lote.py)
+        """
+        self.geometria = obtener_geometria(posiciones_anchors, n=n_anchors)
+        self.k = self.geometria.n
+        self.ventana = max(1, int(ventana))
+        self.q = q
+        self.r = r
+        self.estimado_inicial = estimado_inicial
+        self.metodo = metodo
+
+        self._slots = {}   # id_tag -> slot
+        self._ids = []     # slot -> id_tag (None si está libre)
+        self._libres = []
+        self._kalman = None
+        self._medias = BancoMediaMovil(0, tamaño_ventana=self.ventana)
+        self._reservar(max(1, int(capacidad)))
+
+    # #####################################################
+    # SLOTS
+    # #####################################################
+    def _reservar(self, capacidad):
+        anterior = len(self._ids)
+        canales = capacidad * self.k
+
+        # Los bancos crecen en el lugar: los canales existentes conservan su estado
+        if self._kalman is None:
+            self._kalman = KalmanBank(canales, q=self.q, r=self.r, initial_estimate=self.estimado_inicial)
+        else:
+            self._kalman.ampliar(canales, q=self.q, r=self.r, initial_estimate=self.estimado_inicial)
+        self._medias.ampliar(canales)
+
+        def crecer(nombre, forma, valor=0.0, dtype=np.float64):
+            nuevo = np.full((capacidad,) + forma, valor, dtype=dtype)
+            if anterior:
+                nuevo[:anterior] = getattr(self, nombre)
+            setattr(self, nombre, nuevo)
+
+        crecer('_posiciones', (3,), np.nan)              # Última posición
+        crecer('_errores', (), np.nan)                   # Último error promedio
+        crecer('_ultima', (), np.nan)                    # Instante monotónico de la última actualización
+
+        self._ids.extend([None] * (capacidad - anterior))
+        self._libres.extend(range(capacidad - 1, anterior - 1, -1))
+
+    def _canales(self, slots):
+        # Canales de los slots, en el orden de las distancias (M * k,)
+        return (np.asarray(slots, dtype=np.intp)[:, None] * self.k + np.arange(self.k)).ravel()
+
+    def _reiniciar_slot(self, slot):
+        canales = self._canales([slot])
+        self._kalman.reiniciar(canales)
+        self._medias.reiniciar(canales)
+        self._posiciones[slot] = np.nan
+        self._errores[slot] = np.nan
+        self._ultima[slot] = np.nan
+
+    def agregar_tag(self, id_tag):
+        """Asignar un slot al tag (o retornar el que ya tiene)"""
+        slot = self._slots.get(id_tag)
+        if slot is None:
+            if not self._libres:
+                # Crecimiento geométrico: O(1) amortizado por tag agregado
+                self._reservar(2 * len(self._ids))
+            slot = self._libres.pop()
+            self._reiniciar_slot(slot)
+            self._slots[id_tag] = slot
+            self._ids[slot] = id_tag
+        return slot
+
+    def eliminar_tag(self, id_tag):
+        """Liberar el slot del tag (su estado se descarta)"""
+        slot = self._slots.pop(id_tag, None)
+        if slot is not None:
+            self._ids[slot] = None
+            self._libres.append(slot)
+
+    def eliminar_inactivos(self, edad_maxima):
+        """
+        Liberar los tags sin actualizar hace más de edad_maxima segundos
+
+        Returns:
+            Lista de id_tag eliminados
+        """
+        limite = time.monotonic() - edad_maxima
+        viejos = [id_tag for id_tag, slot in self._slots.items() if not self._ultima[slot] >= limite]
+        for id_tag in viejos:
+            self.eliminar_tag(id_tag)
+        return viejos
+
+    @property
+    def tags(self):
+        return list(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, id_tag):
+        return id_tag in self._slots
+
+    # #####################################################
+    # ACTUALIZACIÓN VECTORIAL
+    # #####################################################
+    def actualizar(self, ids_tags, distancias):
+        """
+        Filtrar y resolver todos los tags con distancias nuevas en un paso
+
+        Args:
+            ids_tags: Identificadores de los M tags (sin repetir); los nuevos se agregan
+            distancias: Matriz (M, k) de distancias crudas
+
+        Returns:
+            (posiciones (M, 3), error promedio de las distancias (M,))
+        """
+        slots = np.fromiter((self.agregar_tag(id_tag) for id_tag in ids_tags), dtype=np.intp)
+        if len(np.unique(slots)) != len(slots):
+            raise ValueError("Cada tag puede aparecer una sola vez por actualización")
+        z = np.asarray(distancias, dtype=np.float64).reshape(len(slots), -1)[:, :self.k]
+        canales = self._canales(slots)
+
+        # Kalman por (tag, anchor): sólo los canales de estos tags, los demás
+        # conservan su estado sin recorrerse
+        x = self._kalman.update(z.ravel(), canales=canales)
+
+        # Media móvil sobre las estimaciones Kalman
+        filtradas = self._medias.filtrar(x, canales=canales).reshape(len(slots), self.k)
+
+        posiciones, errores = obtener_posiciones_lote(filtradas, self.geometria, metodo=self.metodo)
+        self._posiciones[slots] = posiciones
+        self._errores[slots] = errores
+        self._ultima[slots] = time.monotonic()
+        return posiciones, errores
+
+    # #####################################################
+    # CONSULTAS
+    # #####################################################
+    def posicion(self, id_tag):
+        """(posición (3,), error promedio) del tag o None si no tiene estimación"""
+        slot = self._slots.get(id_tag)
+        if slot is None or np.isnan(self._errores[slot]):
+            return None
+        return self._posiciones[slot].copy(), float(self._errores[slot])
+
+    def posiciones(self):
+        """
+        Returns:
+            (ids de los tags activos, posiciones (T, 3), errores (T,), instantes de actualización (T,))
+        """
+        ids = list(self._slots)
+        slots = np.fromiter(self._slots.values(), dtype=np.intp, count=len(ids))
+        return ids, self._posiciones[slots], self._errores[slots], self._ultima[slots]
@@ -1,7 +1,20 @@
+import time
 import numpy as np
 from scipy.optimize import minimize
-from src.utils.auxiliares.error_metricas import calcular_error_promedio
-from src.utils.auxiliares.filtro_media_movil import FiltroMediaMovil
+from src.config.variables import (
+    METODO_TRILATERACION,
+    GN_MAX_ITERACIONES,
+    GN_TOLERANCIA,
+    GN_LAMBDA_INICIAL,
+    GN_DISTANCIA_PLANO,
+    TRILATERACION_SEMIESPACIO,
+    TRILATERACION_CACHE_EPSILON,
+    TRILATERACION_CACHE_EDAD_MAXIMA
+)
+from src.utils.auxiliares.diagnostico_posicion import diagnosticar
+from src.utils.auxiliares.geometria_anchors import GeometriaAnchors, obtener_geometria
+from src.utils.auxiliares.filtro_media_movil import BancoMediaMovil
+from src.utils.auxiliares.nucleos_jit import ACELERADO, objetivo_trilateracion
 """
 def obtener_posicion_tag_3d(distancias, posiciones_anchors):
     def funcion_objetivo(pos):
@@ -12,22 +25,408 @@ def obtener_posicion_tag_3d(distancias, posiciones_anchors):
     margen_error = calcular_error_promedio(posicion_estimada, distancias, posiciones_anchors)
     return posicion_estimada, margen_error
 """
-filtro_medidas = FiltroMediaMovil(tamaño_ventana=5)
+METODO_SCIPY = 'scipy'
+METODO_LINEAL = 'lineal'
+METODO_GAUSS_NEWTON = 'gauss_newton'
+METODO_ESFERAS = 'esferas'
+METODO_ROBUSTO = 'robusto'
 
-def obtener_posicion_tag_3d(distancias_crudas, posiciones_anchors, id_tag='default'):
-    # Filtrar distancias
-    distancias_filtradas = [
-        filtro_medidas.filtrar(f"{id_tag}_{i}", d)
-        for i, d in enumerate(distancias_crudas)
-    ]
+# Media móvil de las distancias: un banco por tag, un canal por anchor
+filtro_medidas = {}
+VENTANA_MEDIDAS = 5
+
+
+def _filtrar_distancias(id_tag, distancias_crudas):
+    banco = filtro_medidas.get(id_tag)
+    if banco is None or banco.canales != len(distancias_crudas):
+        banco = filtro_medidas[id_tag] = BancoMediaMovil(len(distancias_crudas), tamaño_ventana=VENTANA_MEDIDAS)
+    return banco.filtrar(distancias_crudas).tolist()
 
-    def funcion_objetivo(pos):
-        return sum(
-            (np.linalg.norm(pos - anchor) - d_filt)**2
-            for d_filt, anchor in zip(distancias_filtradas, posiciones_anchors)
-        )
+
+# #################################################################
+# MÍNIMOS CUADRADOS NO LINEALES (SCIPY, L-BFGS-B)
+# #################################################################
+def resolver_scipy(distancias, posiciones_anchors):
+    if isinstance(posiciones_anchors, GeometriaAnchors):
+        posiciones_anchors = posiciones_anchors.anchors
+
+    if ACELERADO:
+        n = min(len(distancias), len(posiciones_anchors))
+        d = np.asarray(distancias[:n], dtype=np.float64)
+        anchors = np.asarray(posiciones_anchors[:n], dtype=np.float64)
+
+        def funcion_objetivo(pos):
+            return objetivo_trilateracion(pos, anchors, d)
+    else:
+        def funcion_objetivo(pos):
+            return sum(
+                (np.linalg.norm(pos - anchor) - d)**2
+                for d, anchor in zip(distancias, posiciones_anchors)
+            )
 
     resultado = minimize(funcion_objetivo, x0=np.array([0, 0, 0]), method='L-BFGS-B')
-    posicion_estimada = resultado.x
-    margen_error = calcular_error_promedio(posicion_estimada, distancias_filtradas, posiciones_anchors)
-    return posicion_estimada, margen_error
\ No newline at end of file
+    return resultado.x
+
+
+# #################################################################
+# MÍNIMOS CUADRADOS LINEALIZADOS
+# #################################################################
+# Restando la ecuación del anchor de referencia (el primero) a las demás:
+#   |x - a_i|² - |x - a_0|² = d_i² - d_0²
+#   2 (a_i - a_0) · x = d_0² - d_i² + |a_i|² - |a_0|²
+# queda un sistema lineal A x = b cuya pseudo-inversa depende sólo de los
+# anchors y se toma de la geometría precalculada (geometria_anchors.py).
+def resolver_lineal(distancias, posiciones_anchors):
+    geometria = obtener_geometria(posiciones_anchors)
+    d2 = np.square(np.asarray(distancias, dtype=np.float64))
+    normas2 = geometria.normas2
+
+    b = d2[0] - d2[1:] + normas2[1:] - normas2[0]
+    posicion = geometria.pinv @ b
+
+    normal = geometria.normal
+    if normal is not None:
+        # |p + t n - a_0|² = d_0²  ->  t² + 2 beta t + c = 0
+        rel = posicion - geometria.anchors[0]
+        beta = normal @ rel
+        c = rel @ rel - d2[0]
+        discriminante = beta * beta - c
+        # Sin intersección (ruido): el punto más cercano a la esfera
+        t = -beta + np.sqrt(discriminante) if discriminante > 0.0 else -beta
+        posicion = posicion + t * normal
+    return posicion
+
+
+# #################################################################
+# GAUSS-NEWTON / LEVENBERG-MARQUARDT CON JACOBIANO ANALÍTICO
+# #################################################################
+# Residuos r_i = |x - a_i| - d_i, jacobiano J_i = (x - a_i) / |x - a_i|.
+# Paso: (JᵀJ + λ diag(JᵀJ)) δ = -Jᵀr; λ baja si el paso reduce el costo
+# y sube si no. Arrancando desde la posición del ciclo anterior suele
+# converger en 2-3 iteraciones.
+def resolver_gauss_newton(distancias, posiciones_anchors, x0=None,
+                          max_iteraciones=GN_MAX_ITERACIONES, tolerancia=GN_TOLERANCIA,
+                          lambda_inicial=GN_LAMBDA_INICIAL):
+    """
+    Args:
+        distancias: Distancias a cada anchor
+        posiciones_anchors: Posiciones de los anchors (k, 3)
+        x0: Posición inicial (None = solución lineal)
+        max_iteraciones: Límite de iteraciones
+        tolerancia: Norma del paso por debajo de la cual se considera convergido
+        lambda_inicial: Amortiguamiento inicial de Levenberg-Marquardt
+
+    Returns:
+        (posición, iteraciones, convergido)
+    """
+    return _gauss_newton(distancias, posiciones_anchors, x0, max_iteraciones, tolerancia, lambda_inicial)[:3]
+
+
+def _gauss_newton(distancias, posiciones_anchors, x0=None, max_iteraciones=GN_MAX_ITERACIONES,
+                  tolerancia=GN_TOLERANCIA, lambda_inicial=GN_LAMBDA_INICIAL):
+    # Como resolver_gauss_newton, pero también retorna diff, rangos y
+    # residuos en la posición final (para el diagnóstico, sin recalcular)
+    geometria = obtener_geometria(posiciones_anchors, n=len(distancias))
+    anchors = geometria.anchors
+    d = np.asarray(distancias, dtype=np.float64)
+    x = resolver_lineal(d, geometria) if x0 is None else np.array(x0, dtype=np.float64)
+
+    diff = x - anchors
+    rangos = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+    residuos = rangos - d
+    costo = residuos @ residuos
+    lam = lambda_inicial
+
+    for iteracion in range(1, max_iteraciones + 1):
+        J = diff / np.maximum(rangos, 1e-9)[:, None]
+        JtJ = J.T @ J
+        gradiente = J.T @ residuos
+        amortiguado = JtJ + lam * np.diag(np.diag(JtJ) + 1e-12)
+        try:
+            paso = -np.linalg.solve(amortiguado, gradiente)
+        except np.linalg.LinAlgError:
+            return x, iteracion, False, diff, rangos, residuos
+
+        x_nuevo = x + paso
+        diff_nuevo = x_nuevo - anchors
+        rangos_nuevo = np.sqrt(np.einsum('ij,ij->i', diff_nuevo, diff_nuevo))
+        residuos_nuevo = rangos_nuevo - d
+        costo_nuevo = residuos_nuevo @ residuos_nuevo
+
+        if costo_nuevo <= costo:
+            x, diff, rangos, residuos, costo = x_nuevo, diff_nuevo, rangos_nuevo, residuos_nuevo, costo_nuevo
+            lam *= 0.1
+            if np.sqrt(paso @ paso) < tolerancia:
+                return x, iteracion, True, diff, rangos, residuos
+        else:
+            lam *= 10.0
+            if np.sqrt(paso @ paso) < tolerancia:
+                # El paso ya no mejora el costo: mínimo alcanzado
+                return x, iteracion, True, diff, rangos, residuos
+
+    return x, max_iteraciones, False, diff, rangos, residuos
+
+
+# #################################################################
+# INTERSECCIÓN CERRADA DE TRES ESFERAS
+# #################################################################
+# En el marco local de la geometría (anchor 0 en el origen, anchor 1 sobre
+# ex, anchor 2 en el plano ex-ey):
+#   x = (r0² - r1² + d²) / 2d
+#   y = (r0² - r2² + i² + j²) / 2j - i x / j
+#   z = ±sqrt(r0² - x² - y²)
+# Costo fijo, sin numpy salvo el array de salida.
+def resolver_esferas(distancias, posiciones_anchors, previa=None, semiespacio=TRILATERACION_SEMIESPACIO):
+    """
+    Args:
+        distancias: Distancias a los tres anchors
+        posiciones_anchors: Tres anchors no colineales (o GeometriaAnchors)
+        previa: Posición anterior; elige la solución espejo de su mismo lado
+        semiespacio: Lado preferido sin posición previa (1 o -1, ver variables.py)
+
+    Returns:
+        (posición, intersecta). Si las esferas no se cortan por el ruido,
+        intersecta es False y la posición es la solución linealizada sobre
+        el plano de los anchors (z = 0).
+    """
+    geometria = obtener_geometria(posiciones_anchors, n=len(distancias))
+    marco = geometria.marco_esferas
+    if marco is None:
+        # Más de tres anchors o anchors colineales: mínimos cuadrados
+        return resolver_lineal(distancias, geometria), True
+
+    (p0x, p0y, p0z), (exx, exy, exz), (eyx, eyy, eyz), (ezx, ezy, ezz), d, i, j = marco
+    r0, r1, r2 = float(distancias[0]), float(distancias[1]), float(distancias[2])
+    r0_2 = r0 * r0
+    x = (r0_2 - r1 * r1 + d * d) / (2.0 * d)
+    y = (r0_2 - r2 * r2 + i * i + j * j) / (2.0 * j) - i * x / j
+    z2 = r0_2 - x * x - y * y
+
+    intersecta = z2 >= 0.0
+    z = z2 ** 0.5 if intersecta else 0.0
+    if z:
+        if previa is not None:
+            lado = (previa[0] - p0x) * ezx + (previa[1] - p0y) * ezy + (previa[2] - p0z) * ezz
+            signo = semiespacio if lado == 0.0 else (1.0 if lado > 0.0 else -1.0)
+        else:
+            signo = semiespacio
+        z *= signo
+
+    posicion = np.array((
+        p0x + x * exx + y * eyx + z * ezx,
+        p0y + x * exy + y * eyy + z * ezy,
+        p0z + x * exz + y * eyz + z * ezz
+    ))
+    return posicion, intersecta
+
+
+# Última posición y estado del solver por tag (arranque en caliente)
+_posiciones_previas = {}
+estado_solver = {}
+
+
+def obtener_estado_solver(id_tag='default'):
+    """
+    Returns:
+        dict con 'metodo', 'iteraciones' y 'convergido' del último cálculo del tag
+        ('robusto' agrega 'rechazados'; 'en_cache' es True si se reutilizó la
+        solución de la caché); None si todavía no se calculó
+    """
+    return estado_solver.get(id_tag)
+
+
+def reiniciar_tag(id_tag='default'):
+    """Descartar la posición previa del tag (el próximo cálculo arranca en frío)"""
+    _posiciones_previas.pop(id_tag, None)
+    estado_solver.pop(id_tag, None)
+    _cache_soluciones.pop(id_tag, None)
+
+
+# Caché de soluciones por tag: distancias que la produjeron, método, clave
+# de la geometría, instante, posición, diagnóstico y el arranque en caliente
+# que dejó el solver (posición previa y estado)
+_cache_soluciones = {}
+_estadisticas_cache = {'aciertos': 0, 'fallos': 0}
+
+
+def obtener_estadisticas_cache(reiniciar=False):
+    """
+    Returns:
+        dict con 'aciertos', 'fallos' y 'tasa_aciertos' de la caché de soluciones
+    """
+    aciertos, fallos = _estadisticas_cache['aciertos'], _estadisticas_cache['fallos']
+    if reiniciar:
+        _estadisticas_cache['aciertos'] = _estadisticas_cache['fallos'] = 0
+    total = aciertos + fallos
+    return {'aciertos': aciertos, 'fallos': fallos, 'tasa_aciertos': aciertos / total if total else 0.0}
+
+
+def _consultar_cache(id_tag, metodo, geometria, distancias, ahora):
+    entrada = _cache_soluciones.get(id_tag)
+    if (entrada is not None
+            and entrada['metodo'] == metodo
+            and entrada['clave'] == geometria.clave
+            and ahora - entrada['instante'] <= TRILATERACION_CACHE_EDAD_MAXIMA
+            and all(abs(d - c) <= TRILATERACION_CACHE_EPSILON
+                    for d, c in zip(distancias, entrada['distancias']))):
+        _estadisticas_cache['aciertos'] += 1
+        return entrada
+    _estadisticas_cache['fallos'] += 1
+    return None
+
+
+def _restaurar_arranque(id_tag, entrada):
+    """Dejar la posición previa y el estado del tag como los dejó la solución reutilizada"""
+    if entrada['previa'] is None:
+        _posiciones_previas.pop(id_tag, None)
+    else:
+        _posiciones_previas[id_tag] = entrada['previa'].copy()
+    if entrada['estado'] is None:
+        estado_solver.pop(id_tag, None)
+    else:
+        estado_solver[id_tag] = dict(entrada['estado'], iteraciones=0, en_cache=True)
+
+
+def reflejar_al_semiespacio(posicion, posiciones_anchors, semiespacio=TRILATERACION_SEMIESPACIO):
+    """
+    Con anchors coplanares, reflejar respecto de su plano (p' = a0 + M (p - a0))
+    una posición caída del lado opuesto a `semiespacio` (mismas distancias),
+    como RangeEKF. Retorna la misma posición si no hace falta
+    """
+    geometria = obtener_geometria(posiciones_anchors)
+    if geometria.normal is None:
+        return posicion
+    normal = geometria.normal * semiespacio
+    altura = normal @ (posicion - geometria.anchors[0])
+    if altura >= 0.0:
+        return posicion
+    return posicion - 2.0 * altura * normal
+
+
+def _resolver_gauss_newton_tag(distancias, posiciones_anchors, id_tag):
+    geometria = obtener_geometria(posiciones_anchors, n=len(distancias))
+    x0 = _posiciones_previas.get(id_tag)
+    normal = None
+    if geometria.normal is not None:
+        normal = geometria.normal * TRILATERACION_SEMIESPACIO
+        if x0 is not None and abs(normal @ (x0 - geometria.anchors[0])) < GN_DISTANCIA_PLANO:
+            # Anchors coplanares y previa sobre el plano: ahí el gradiente
+            # normal es nulo y no sale; arrancar de la lineal, que elige el semiespacio
+            x0 = None
+    posicion, iteraciones, convergido, diff, rangos, residuos = _gauss_newton(
+        distancias, geometria, x0=x0
+    )
+    if normal is not None:
+        reflejada = reflejar_al_semiespacio(posicion, geometria)
+        if reflejada is not posicion:
+            posicion, diff = reflejada, reflejada - geometria.anchors   # Rangos iguales
+    if convergido:
+        _posiciones_previas[id_tag] = posicion
+    else:
+        # No arrastrar una solución no convergida al próximo ciclo
+        _posiciones_previas.pop(id_tag, None)
+    estado_solver[id_tag] = {
+        'metodo': METODO_GAUSS_NEWTON,
+        'iteraciones': iteraciones,
+        'convergido': convergido
+    }
+    return posicion, {'diff': diff, 'rangos': rangos, 'residuos': residuos, 'convergido': convergido}
+
+
+def _resolver_esferas_tag(distancias, posiciones_anchors, id_tag):
+    posicion, intersecta = resolver_esferas(distancias, posiciones_anchors, previa=_posiciones_previas.get(id_tag))
+    if intersecta:
+        _posiciones_previas[id_tag] = posicion
+    estado_solver[id_tag] = {
+        'metodo': METODO_ESFERAS,
+        'iteraciones': 0,
+        'convergido': intersecta
+    }
+    return posicion, {'convergido': intersecta}
+
+
+def _resolver_robusto_tag(distancias, posiciones_anchors, id_tag):
+    # Importación diferida: trilateracion_robusta no depende de este módulo,
+    # pero así el método robusto no se carga si no se usa
+    from src.utils.auxiliares.trilateracion_robusta import resolver_robusto
+    posicion, rechazados, iteraciones = resolver_robusto(
+        distancias, posiciones_anchors, previa=_posiciones_previas.get(id_tag)
+    )
+    _posiciones_previas[id_tag] = posicion
+    estado_solver[id_tag] = {
+        'metodo': METODO_ROBUSTO,
+        'iteraciones': iteraciones,
+        'convergido': True,
+        'rechazados': rechazados.tolist()
+    }
+    activos = np.ones(len(distancias), dtype=bool)
+    activos[rechazados] = False
+    return posicion, {'activos': activos}
+
+
+_RESOLVEDORES = {
+    METODO_SCIPY: resolver_scipy,
+    METODO_LINEAL: resolver_lineal
+}
+
+
+def obtener_posicion_tag_3d(distancias_crudas, posiciones_anchors, id_tag='default', metodo=None,
+                            diagnostico=False):
+    """
+    Args:
+        distancias_crudas: Distancias a cada anchor
+        posiciones_anchors: Posiciones de los anchors (k, 3) o GeometriaAnchors
+        id_tag: Identificador del tag para el filtro de media móvil
+        metodo: 'scipy', 'lineal', 'gauss_newton', 'esferas' o 'robusto'
+            (None = METODO_TRILATERACION)
+        diagnostico: Retornar el DiagnosticoPosicion completo en lugar del error promedio
+
+    Returns:
+        (posición estimada, error promedio de las distancias) o
+        (posición estimada, DiagnosticoPosicion) con diagnostico=True
+    """
+    # Filtrar distancias
+    distancias_filtradas = _filtrar_distancias(id_tag, distancias_crudas)
+
+    geometria = obtener_geometria(posiciones_anchors, n=len(distancias_filtradas))
+    metodo = METODO_TRILATERACION if metodo is None else metodo
+
+    # Tag quieto: misma solución mientras las distancias no se muevan
+    if TRILATERACION_CACHE_EPSILON is not None:
+        ahora = time.monotonic()
+        entrada = _consultar_cache(id_tag, metodo, geometria, distancias_filtradas, ahora)
+        if entrada is not None:
+            _restaurar_arranque(id_tag, entrada)
+            resultado = entrada['diagnostico']
+            return entrada['posicion'].copy(), resultado if diagnostico else resultado.error_promedio
+
+    if metodo == METODO_GAUSS_NEWTON:
+        posicion_estimada, datos = _resolver_gauss_newton_tag(distancias_filtradas, geometria, id_tag)
+    elif metodo == METODO_ESFERAS:
+        posicion_estimada, datos = _resolver_esferas_tag(distancias_filtradas, geometria, id_tag)
+    elif metodo == METODO_ROBUSTO:
+        posicion_estimada, datos = _resolver_robusto_tag(distancias_filtradas, geometria, id_tag)
+    else:
+        try:
+            resolver = _RESOLVEDORES[metodo]
+        except KeyError:
+            raise ValueError(f"Método de trilateración desconocido: {metodo}")
+        posicion_estimada, datos = resolver(distancias_filtradas, geometria), {}
+
+    resultado = diagnosticar(posicion_estimada, distancias_filtradas, geometria.anchors, **datos)
+    if TRILATERACION_CACHE_EPSILON is not None:
+        previa = _posiciones_previas.get(id_tag)
+        estado = estado_solver.get(id_tag)
+        _cache_soluciones[id_tag] = {
+            'distancias': [float(d) for d in distancias_filtradas],
+            'metodo': metodo,
+            'clave': geometria.clave,
+            'instante': ahora,
+            'posicion': posicion_estimada.copy(),
+            'diagnostico': resultado,
+            'previa': None if previa is None else previa.copy(),
+            'estado': None if estado is None else dict(estado)
+        }
+    if diagnostico:
+        return posicion_estimada, resultado
+    return posicion_estimada, resultado.error_promedio
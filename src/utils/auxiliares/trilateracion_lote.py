@@ -0,0 +1,143 @@
+"""
+Trilateración por lotes para análisis de registros y ajuste de parámetros.
+
+A diferencia de obtener_posicion_tag_3d, no pasa por el filtro de media
+móvil ni guarda estado por tag: cada fila se resuelve de forma
+independiente y todas las operaciones son vectoriales sobre el lote. Las
+filas degeneradas (distancias no finitas o negativas, p. ej. el -1.0 de
+una medición inválida) resultan en NaN sin afectar al resto del lote.
+"""
+import numpy as np
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from src.config.variables import GN_MAX_ITERACIONES, GN_TOLERANCIA, GN_LAMBDA_INICIAL
+from src.utils.auxiliares.geometria_anchors import obtener_geometria
+from src.utils.auxiliares.trilateracion import METODO_LINEAL, METODO_GAUSS_NEWTON
+
+# Filas por bloque al repartir entre procesos
+TAMANO_BLOQUE = 20000
+
+
+def _lineal_lote(d, geometria):
+    d2 = np.square(d)
+    normas2 = geometria.normas2
+    b = d2[:, :1] - d2[:, 1:] + (normas2[1:] - normas2[0])
+    posiciones = b @ geometria.pinv.T
+
+    normal = geometria.normal
+    if normal is not None:
+        # Misma elevación sobre el espacio nulo que resolver_lineal, por fila
+        rel = posiciones - geometria.anchors[0]
+        beta = rel @ normal
+        c = np.einsum('ij,ij->i', rel, rel) - d2[:, 0]
+        discriminante = beta * beta - c
+        t = -beta + np.sqrt(np.maximum(discriminante, 0.0))
+        posiciones += t[:, None] * normal
+    return posiciones
+
+
+def _costo_lote(x, anchors, d):
+    diff = x[:, None, :] - anchors[None, :, :]
+    rangos = np.sqrt(np.einsum('nkj,nkj->nk', diff, diff))
+    residuos = rangos - d
+    return diff, rangos, residuos, np.einsum('nk,nk->n', residuos, residuos)
+
+
+def _gauss_newton_lote(d, anchors, x, max_iteraciones, tolerancia, lambda_inicial):
+    # Levenberg-Marquardt con amortiguamiento por fila; las filas
+    # convergidas dejan de actualizarse
+    diff, rangos, residuos, costo = _costo_lote(x, anchors, d)
+    lam = np.full(len(x), lambda_inicial)
+    activas = np.ones(len(x), dtype=bool)
+    identidad = np.eye(3)
+
+    for _ in range(max_iteraciones):
+        if not activas.any():
+            break
+        J = diff / np.maximum(rangos, 1e-9)[:, :, None]
+        JtJ = np.einsum('nki,nkj->nij', J, J)
+        gradiente = np.einsum('nki,nk->ni', J, residuos)
+        diagonal = np.einsum('nii->ni', JtJ) + 1e-12
+        amortiguado = JtJ + (lam[:, None] * diagonal)[:, :, None] * identidad
+        # Sistema singular en una fila: se detiene ahí (como _gauss_newton)
+        # en lugar de abortar el lote entero
+        singulares = ~(np.abs(np.linalg.det(amortiguado)) > 0.0)
+        if singulares.any():
+            amortiguado[singulares] = identidad
+            gradiente[singulares] = 0.0
+            activas &= ~singulares
+        paso = -np.linalg.solve(amortiguado, gradiente[:, :, None])[:, :, 0]
+        paso[~activas] = 0.0
+
+        x_nuevo = x + paso
+        diff_n, rangos_n, residuos_n, costo_n = _costo_lote(x_nuevo, anchors, d)
+        mejora = (costo_n <= costo) & activas
+
+        x[mejora] = x_nuevo[mejora]
+        diff[mejora] = diff_n[mejora]
+        rangos[mejora] = rangos_n[mejora]
+        residuos[mejora] = residuos_n[mejora]
+        costo[mejora] = costo_n[mejora]
+        lam = np.where(mejora, lam * 0.1, lam * 10.0)
+
+        activas &= np.sqrt(np.einsum('ni,ni->n', paso, paso)) >= tolerancia
+    return x, residuos
+
+
+def _resolver_bloque(distancias, anchors, metodo, max_iteraciones, tolerancia, lambda_inicial):
+    d = np.asarray(distancias, dtype=np.float64)
+    posiciones = np.full((len(d), 3), np.nan)
+    errores = np.full(len(d), np.nan)
+
+    validas = np.all(np.isfinite(d) & (d >= 0.0), axis=1)
+    if not validas.any():
+        return posiciones, errores
+    d = d[validas]
+
+    geometria = obtener_geometria(anchors)
+    x = _lineal_lote(d, geometria)
+    if metodo == METODO_GAUSS_NEWTON:
+        x, residuos = _gauss_newton_lote(
+            d, geometria.anchors, x, max_iteraciones, tolerancia, lambda_inicial
+        )
+    else:
+        residuos = _costo_lote(x, geometria.anchors, d)[2]
+    posiciones[validas] = x
+    errores[validas] = np.mean(np.abs(residuos), axis=1)
+    return posiciones, errores
+
+
+def obtener_posiciones_lote(distancias, posiciones_anchors, metodo=METODO_LINEAL, procesos=None,
+                            max_iteraciones=GN_MAX_ITERACIONES, tolerancia=GN_TOLERANCIA,
+                            lambda_inicial=GN_LAMBDA_INICIAL, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Resolver N posiciones a partir de una matriz de distancias
+
+    Args:
+        distancias: Matriz (N, k) de distancias a los k primeros anchors
+        posiciones_anchors: Posiciones de los anchors (>= k, 3) o GeometriaAnchors
+        metodo: 'lineal' o 'gauss_newton' (refinado desde la solución lineal)
+        procesos: Número de procesos para repartir el lote (None o 1 = en este proceso)
+        max_iteraciones, tolerancia, lambda_inicial: Parámetros de Gauss-Newton
+        tamano_bloque: Filas por bloque enviado a cada proceso
+
+    Returns:
+        (posiciones (N, 3), error promedio de las distancias por fila (N,)),
+        con NaN en las filas degeneradas
+    """
+    if metodo not in (METODO_LINEAL, METODO_GAUSS_NEWTON):
+        raise ValueError(f"Método de trilateración por lotes desconocido: {metodo}")
+    d = np.atleast_2d(np.asarray(distancias, dtype=np.float64))
+    anchors = obtener_geometria(posiciones_anchors, n=d.shape[1]).anchors
+    resolver = partial(_resolver_bloque, anchors=anchors, metodo=metodo, max_iteraciones=max_iteraciones,
+                       tolerancia=tolerancia, lambda_inicial=lambda_inicial)
+
+    if not procesos or procesos <= 1 or len(d) <= tamano_bloque:
+        return resolver(d)
+
+    bloques = [d[i:i + tamano_bloque] for i in range(0, len(d), tamano_bloque)]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        resultados = list(pool.map(resolver, bloques))
+    posiciones = np.concatenate([r[0] for r in resultados])
+    residuos = np.concatenate([r[1] for r in resultados])
+    return posiciones, residuos
@@ -0,0 +1,139 @@
+"""
+Trilateración robusta para cuatro o más anchors.
+
+Una distancia con multitrayecto arrastra toda la solución de mínimos
+cuadrados. Este solver:
+  1. (opcional) RANSAC exhaustivo: resuelve en forma cerrada cada terna de
+     anchors (ambas soluciones espejo, todas a la vez) y elige la hipótesis
+     con más anchors consistentes;
+  2. refina con IRLS (Gauss-Newton ponderado, pesos de Huber o Tukey);
+  3. informa qué anchors quedaron fuera.
+
+El costo por trama está acotado por ROBUSTO_MAX_SUBCONJUNTOS ternas y
+ROBUSTO_MAX_ITERACIONES iteraciones.
+"""
+import numpy as np
+from src.config.variables import (
+    ROBUSTO_PONDERACION,
+    ROBUSTO_SIGMA,
+    ROBUSTO_UMBRAL_RECHAZO,
+    ROBUSTO_RANSAC,
+    ROBUSTO_MAX_SUBCONJUNTOS,
+    ROBUSTO_MAX_ITERACIONES,
+    GN_TOLERANCIA
+)
+from src.utils.auxiliares.geometria_anchors import obtener_geometria
+
+PONDERACION_HUBER = 'huber'
+PONDERACION_TUKEY = 'tukey'
+
+# Constantes de 95 % de eficiencia con ruido gaussiano, en unidades de sigma
+_CONSTANTES = {
+    PONDERACION_HUBER: 1.345,
+    PONDERACION_TUKEY: 4.685
+}
+
+
+def pesos_robustos(residuos, ponderacion=ROBUSTO_PONDERACION, sigma=ROBUSTO_SIGMA):
+    """Pesos IRLS para los residuos dados (mismo shape)"""
+    try:
+        c = _CONSTANTES[ponderacion] * sigma
+    except KeyError:
+        raise ValueError(f"Ponderación robusta desconocida: {ponderacion}")
+    u = np.abs(residuos) / c
+    if ponderacion == PONDERACION_HUBER:
+        return 1.0 / np.maximum(u, 1.0)
+    return np.square(np.clip(1.0 - u * u, 0.0, None))
+
+
+def _hipotesis_ransac(d, geometria, umbral, max_subconjuntos, previa=None):
+    # Todas las ternas y ambos espejos en una sola pasada vectorial
+    marcos = geometria.marcos_subconjuntos(max_subconjuntos)
+    ternas = marcos['indices']
+    if len(ternas) == 0:
+        return None
+    r = d[ternas]
+    r0_2 = r[:, 0] ** 2
+    dd, i, j = marcos['d'], marcos['i'], marcos['j']
+    x = (r0_2 - r[:, 1] ** 2 + dd * dd) / (2.0 * dd)
+    y = (r0_2 - r[:, 2] ** 2 + i * i + j * j) / (2.0 * j) - i * x / j
+    z = np.sqrt(np.maximum(r0_2 - x * x - y * y, 0.0))
+
+    base = marcos['p0'] + x[:, None] * marcos['ex'] + y[:, None] * marcos['ey']
+    desplazamiento = z[:, None] * marcos['ez']
+    candidatas = np.concatenate((base + desplazamiento, base - desplazamiento))
+
+    diff = candidatas[:, None, :] - geometria.anchors[None, :, :]
+    residuos = np.sqrt(np.einsum('skj,skj->sk', diff, diff)) - d
+    inliers = np.abs(residuos) < umbral
+    # Más inliers primero; a igualdad, la más cercana a la posición previa
+    # (las dos soluciones espejo de una terna ajustan igual de bien) o, sin
+    # previa, menor suma de cuadrados de los inliers
+    n_inliers = inliers.sum(axis=1)
+    empatadas = np.flatnonzero(n_inliers == n_inliers.max())
+    if previa is not None:
+        desempate = np.linalg.norm(candidatas[empatadas] - previa, axis=1)
+    else:
+        desempate = np.where(inliers[empatadas], np.square(residuos[empatadas]), 0.0).sum(axis=1)
+    return candidatas[empatadas[np.argmin(desempate)]]
+
+
+def _inicial_lineal(d, geometria):
+    d2 = d * d
+    b = d2[0] - d2[1:] + geometria.normas2[1:] - geometria.normas2[0]
+    return geometria.pinv @ b
+
+
+def resolver_robusto(distancias, posiciones_anchors, x0=None, previa=None, ponderacion=ROBUSTO_PONDERACION,
+                     sigma=ROBUSTO_SIGMA, umbral_rechazo=ROBUSTO_UMBRAL_RECHAZO, ransac=ROBUSTO_RANSAC,
+                     max_subconjuntos=ROBUSTO_MAX_SUBCONJUNTOS, max_iteraciones=ROBUSTO_MAX_ITERACIONES,
+                     tolerancia=GN_TOLERANCIA):
+    """
+    Args:
+        distancias: Distancias a los k anchors (k >= 4 para poder rechazar)
+        posiciones_anchors: Anchors (k, 3) o GeometriaAnchors
+        x0: Posición inicial (None = RANSAC o solución lineal)
+        previa: Posición anterior del tag; desempata las hipótesis RANSAC
+        ponderacion: 'huber' o 'tukey'
+        sigma: Ruido típico de las distancias (mm); escala de los pesos
+        umbral_rechazo: Residuo (mm) a partir del cual un anchor se declara rechazado
+        ransac: Buscar la hipótesis inicial por ternas exhaustivas
+        max_subconjuntos: Límite de ternas evaluadas
+        max_iteraciones: Límite de iteraciones IRLS
+        tolerancia: Norma del paso (mm) para detener IRLS
+
+    Returns:
+        (posición, índices de anchors rechazados (array), iteraciones IRLS)
+    """
+    geometria = obtener_geometria(posiciones_anchors, n=len(distancias))
+    anchors = geometria.anchors
+    d = np.asarray(distancias, dtype=np.float64)
+
+    x = None
+    if x0 is not None:
+        x = np.array(x0, dtype=np.float64)
+    elif ransac and geometria.n >= 4:
+        x = _hipotesis_ransac(d, geometria, umbral_rechazo, max_subconjuntos, previa)
+    if x is None:
+        x = _inicial_lineal(d, geometria)
+
+    iteraciones = 0
+    for iteraciones in range(1, max_iteraciones + 1):
+        diff = x - anchors
+        rangos = np.maximum(np.sqrt(np.einsum('ij,ij->i', diff, diff)), 1e-9)
+        residuos = rangos - d
+        w = pesos_robustos(residuos, ponderacion, sigma)
+        J = diff / rangos[:, None]
+        JtW = J.T * w
+        try:
+            # Amortiguamiento mínimo: con Tukey algunos pesos pueden ser 0
+            paso = -np.linalg.solve(JtW @ J + 1e-9 * np.eye(3), JtW @ residuos)
+        except np.linalg.LinAlgError:
+            break
+        x = x + paso
+        if np.sqrt(paso @ paso) < tolerancia:
+            break
+
+    residuos = np.linalg.norm(x - anchors, axis=1) - d
+    rechazados = np.flatnonzero(np.abs(residuos) > umbral_rechazo)
+    return x, rechazados, iteraciones
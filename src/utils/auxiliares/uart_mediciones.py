@@ -1,9 +1,20 @@
 import numpy as np
 
 def obtener_distancias_uart(data_receiver, n_sensores):
-    data_array = data_receiver.read_data()
+    data_array = data_receiver.read_data_view()
     print(">>>>>>>>: ", data_array)
     if data_array is not None:
         distances = data_receiver.get_distances()
         return distances[:n_sensores]
-    return np.zeros(n_sensores, dtype=np.float64)
\ No newline at end of file
+    return np.zeros(n_sensores, dtype=np.float64)
+
+def obtener_distancias_uart_si_nuevas(data_receiver, n_sensores):
+    """
+    Igual que obtener_distancias_uart pero retorna None si no llegó una
+    trama nueva desde el ciclo anterior, para no repetir la estimación
+    sobre datos ya procesados.
+    """
+    data_array = data_receiver.read_if_new_view()
+    if data_array is None:
+        return None
+    return data_receiver.get_distances()[:n_sensores]
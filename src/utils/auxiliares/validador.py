@@ -3,7 +3,11 @@ import numpy as np
 def verificar_distancias(distances, uart_controller):
     if distances is None or len(distances) == 0 or np.any(distances <= 0.0):
         print("Distancias inválidas — Deteniendo motores")
-        uart_controller.send("STOP")
+        # UARTMotorController y sus variantes no tienen send(): usar stop_motors()
+        if hasattr(uart_controller, 'stop_motors'):
+            uart_controller.stop_motors()
+        else:
+            uart_controller.send("STOP")
         return False
     return True
 
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Async Motor Controller Module
+Versión asyncio de UARTMotorController: el envío lo hace una tarea del
+event loop con escrituras no bloqueantes sobre el descriptor del puerto
+(loop.add_writer cuando el driver no acepta más bytes).
+
+send_motor_command() sólo deja el comando en un buzón (el último gana) y
+retorna; await send(...) además espera a que ese comando, o uno que lo
+reemplazó, salga por el puerto. Los métodos deben llamarse desde el hilo
+del event loop.
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from src.utils.controladores.protocolo_motor import PROTOCOLO_JSON
+from src.utils.controladores.uart_motor_controller import UARTMotorController, MotorCommand
+from src.utils.lectores.transportes import SerialTransport, Transport
+
+
+class AsyncMotorController(UARTMotorController):
+    """
+    Controlador de motores dirigido por el event loop.
+    Conserva la API síncrona de UARTMotorController (move_direction,
+    move_with_steering, PWMManager, ...) sobre el buzón asíncrono.
+    """
+
+    def __init__(self, port: str = '/dev/ttyAMA0', baudrate: int = 2000000,
+                 transport: Optional[Transport] = None, repeat_interval: float = 0.5,
+                 protocol: str = PROTOCOLO_JSON):
+        """
+        Args:
+            port: Puerto serie (si no se indica transport)
+            baudrate: Velocidad de comunicación
+            transport: Transporte con descriptor (SerialTransport, PtyTransport,
+                UnixSocketTransport). Puede ser el mismo del AsyncTelemetryReceiver:
+                si ya está abierto no se reabre ni se cierra al desconectar.
+            repeat_interval: Segundos tras los cuales se reenvía un comando idéntico
+            protocol: 'json', 'ascii' o 'binario'
+        """
+        super().__init__(port=port, baudrate=baudrate, timeout=0.0,
+                         repeat_interval=repeat_interval, protocol=protocol)
+        self.transport = transport if transport is not None else SerialTransport(port, baudrate, timeout=0)
+        self._owns_transport = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._waiters: List[asyncio.Future] = []
+        self._backlog = bytearray()  # Bytes que el driver aún no aceptó
+
+    # #####################################################
+    # CONEXIÓN Y DESCONEXIÓN
+    # #####################################################
+    async def connect(self) -> bool:
+        self._loop = asyncio.get_running_loop()
+        if not self.transport.is_open:
+            if not self.transport.open():
+                print(f"Error: No se pudo abrir el puerto {self.port}")
+                return False
+            self._owns_transport = True
+        try:
+            self._fd = self.transport.fileno()
+            os.set_blocking(self._fd, False)
+        except (OSError, AttributeError, ValueError) as e:
+            print(f"Error conectando Motor Controller: {e}")
+            if self._owns_transport:
+                self.transport.close()
+            return False
+
+        self.serial_conn = self.transport
+        self.is_connected = True
+        self._wake = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = self._loop.create_task(self._writer_task())
+        print(f"Motor Controller (asyncio) conectado a {self.transport.kind}")
+
+        # Enviar comando inicial (parar motores)
+        self.stop_motors()
+        return True
+
+    async def disconnect(self):
+        """Parar motores, esperar el envío y liberar el puerto"""
+        if self.is_connected:
+            self.stop_motors()
+            await self.wait_sent(timeout=0.5)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(False)
+        self._waiters.clear()
+        if self._owns_transport:
+            self.transport.close()
+            self._owns_transport = False
+        self.serial_conn = None
+        self.is_connected = False
+        print("Motor Controller desconectado")
+
+    # #####################################################
+    # BUZÓN Y TAREA ESCRITORA
+    # #####################################################
+    def send_motor_command(self, left_speed: int, right_speed: int, smooth: bool = True) -> bool:
+        """
+        Dejar un comando en el buzón (reemplaza al pendiente) y retornar
+
+        Returns:
+            bool: True si el comando quedó encolado
+        """
+        if not self.is_connected:
+            print("Error: Motor Controller no conectado")
+            return False
+        command = self._prepare_command(left_speed, right_speed, smooth)
+        if self._pending is not None:
+            self.commands_coalesced += 1
+        self._pending = command
+        self._set_status(command)
+        self._notify()
+        return True
+
+    async def send(self, left_speed: int, right_speed: int, smooth: bool = True) -> bool:
+        """
+        Encolar un comando y esperar a que salga (o a que salga uno posterior)
+
+        Returns:
+            bool: True si se escribió en el puerto
+        """
+        if not self.send_motor_command(left_speed, right_speed, smooth):
+            return False
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        return await waiter
+
+    def emergency_stop(self) -> bool:
+        """Parada de emergencia: descarta el comando pendiente y sale primero"""
+        if not self.is_connected:
+            return False
+        if self._pending is not None:
+            self._pending = None
+            self.commands_coalesced += 1
+        self._priority = self._encode_emergency()
+        self._set_status(MotorCommand(0, 0))
+        self._notify()
+        return True
+
+    async def wait_sent(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que el buzón quede vacío y el puerto acepte todo lo enviado"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _set_status(self, command: MotorCommand):
+        self.current_command = command
+        self.motor_status.left_speed = command.left_speed
+        self.motor_status.right_speed = command.right_speed
+        self.motor_status.last_command_time = command.timestamp or time.time()
+
+    def _notify(self):
+        self._idle.clear()
+        self._wake.set()
+
+    async def _writer_task(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            # La parada de emergencia sale antes que cualquier comando
+            priority, command = self._priority, None
+            if priority is not None:
+                self._priority = None
+            else:
+                command, self._pending = self._pending, None
+
+            if priority is not None or command is not None:
+                waiters, self._waiters = self._waiters, []
+                errors = self.send_errors
+                try:
+                    if priority is not None:
+                        self._transmit_emergency(priority)
+                    else:
+                        self._transmit(command)
+                    await self._drain()
+                except Exception as e:
+                    self.send_errors += 1
+                    print(f"Error enviando comando de motor: {e}")
+                ok = self.send_errors == errors
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(ok)
+
+            if self._pending is not None or self._priority is not None:
+                self._wake.set()
+            else:
+                self._idle.set()
+
+    # #####################################################
+    # ESCRITURA NO BLOQUEANTE
+    # #####################################################
+    def _write(self, data: bytes, priority: bool = False) -> int:
+        # Escribe lo que el driver acepte; el resto queda para _drain()
+        if self._backlog:
+            self._backlog += data
+            return len(data)
+        try:
+            n = os.write(self._fd, data)
+        except BlockingIOError:
+            n = 0
+        if n < len(data):
+            self._backlog += data[n:]
+        return len(data)
+
+    async def _drain(self):
+        while self._backlog:
+            await self._writable()
+            try:
+                n = os.write(self._fd, self._backlog)
+            except BlockingIOError:
+                continue
+            del self._backlog[:n]
+
+    async def _writable(self):
+        future = self._loop.create_future()
+        self._loop.add_writer(self._fd, lambda: future.done() or future.set_result(None))
+        try:
+            await future
+        finally:
+            self._loop.remove_writer(self._fd)
+
+    def get_connection_info(self) -> Dict[str, Any]:
+        info = super().get_connection_info()
+        info.update({
+            'background': self._task is not None,
+            'transport': self.transport.kind,
+            'pending_bytes': len(self._backlog)
+        })
+        return info
@@ -1,5 +1,19 @@
+import math
+from src.config.variables import TIEMPO_ESPERA, PID_DT_MAXIMO
+from src.utils.auxiliares.nucleos_jit import ACELERADO, pid_paso
+
+
 class PIDController:
-    def __init__(self, kp, ki, kd, setpoint=0.0, alpha=0.2, salida_maxima=None):
+    def __init__(self, kp, ki, kd, setpoint=0.0, alpha=0.2, salida_maxima=None,
+                 dt_nominal=TIEMPO_ESPERA, dt_maximo=PID_DT_MAXIMO):
+        """
+        dt_nominal: Período (s) con el que se ajustaron kp, ki, kd y alpha; con
+            update(medida, instante) la integral suma e·dt/dt_nominal, la
+            derivada se multiplica por dt_nominal/dt y el filtro del error usa
+            alpha_ef = 1 - (1 - alpha)^(dt/dt_nominal)
+        dt_maximo: Paso máximo (s) que se integra/deriva (pausas largas entre
+            correcciones no cargan la integral)
+        """
         self.kp = kp
         self.ki = ki
         self.kd = kd
@@ -9,17 +23,51 @@ class PIDController:
         self.error_anterior = 0.0
         self.integral = 0.0
         self.salida_maxima = salida_maxima
+        self.dt_nominal = dt_nominal
+        self.dt_maximo = dt_maximo
+        self.instante = None  # Instante de la última trama vista (actualizada u omitida)
+
+    def omitir(self, instante=None):
+        """
+        Trama sin corrección (ángulo dentro del umbral): el próximo update
+        mide dt desde esta trama y no integra el tiempo pasado en la zona muerta
+        """
+        if instante is not None:
+            self.instante = instante
+
+    def _factor(self, instante):
+        # dt / dt_nominal desde la última trama vista (1.0 sin instantes)
+        anterior, self.instante = self.instante, instante
+        if instante is None or anterior is None or not self.dt_nominal:
+            return 1.0
+        dt = max(instante - anterior, 0.0)
+        if self.dt_maximo is not None:
+            dt = min(dt, self.dt_maximo)
+        return dt / self.dt_nominal
+
+    def update(self, medida_actual, instante=None):
+        """
+        instante: Instante (s) de la medida, p. ej. el de la trama; None = un paso nominal
+        """
+        factor = self._factor(instante)
+        if ACELERADO:
+            salida, self.integral, self.error_anterior = pid_paso(
+                float(medida_actual), self.setpoint, self.alpha, self.kp, self.ki, self.kd,
+                self.integral, self.error_anterior,
+                math.inf if self.salida_maxima is None else self.salida_maxima, factor
+            )
+            return salida
 
-    def update(self, medida_actual):
         # Error actual
         error_actual = self.setpoint - medida_actual
 
-        # Filtro exponencial del error
-        error_filtrado = self.alpha * error_actual + (1 - self.alpha) * self.error_anterior
+        # Filtro exponencial del error (misma constante de tiempo con cualquier dt)
+        alpha = self.alpha if factor == 1.0 else 1.0 - (1.0 - self.alpha) ** factor
+        error_filtrado = alpha * error_actual + (1 - alpha) * self.error_anterior
 
-        # PID clásico sobre error filtrado
-        self.integral += error_filtrado
-        derivada = error_filtrado - self.error_anterior
+        # PID clásico sobre error filtrado, en unidades del paso nominal
+        self.integral += error_filtrado * factor
+        derivada = (error_filtrado - self.error_anterior) / factor if factor > 0.0 else 0.0
         self.error_anterior = error_filtrado
 
         salida = (
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Motor Command Protocol Module
+Codificación de comandos de motor hacia el ESP32.
+
+Protocolos:
+    json     {"type": "motor_command", "left_speed": L, ...}\\n  (~100 bytes, legado)
+    ascii    M<L>,<R>\\n          ej. b"M-40,40\\n"   |  parada de emergencia b"E\\n"
+    binario  A5 01 <L:int16> <R:int16> <chk>     (7 bytes, little-endian)
+             A5 02 00 00 00 00 <chk>             parada de emergencia
+             chk = suma de los bytes anteriores & 0xFF
+
+Los protocolos compactos no construyen dicts ni strings por comando: el
+ASCII concatena fragmentos precalculados y el binario empaqueta los 7
+bytes con un solo struct.pack (un único objeto bytes por comando: el
+mensaje puede quedar en la cola de SharedSerialPort, así que no se
+reutiliza un buffer que el próximo comando sobrescribiría).
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import json
+import time
+import struct
+from typing import Optional, Tuple
+
+PROTOCOLO_JSON = 'json'
+PROTOCOLO_ASCII = 'ascii'
+PROTOCOLO_BINARIO = 'binario'
+
+VELOCIDAD_LIMITE = 255
+
+# Binario
+CABECERA_BINARIA = 0xA5
+TIPO_COMANDO = 0x01
+TIPO_EMERGENCIA = 0x02
+_BINARIO = struct.Struct('<BBhh')
+_BINARIO_CHK = struct.Struct('<BBhhB')
+TAMANO_BINARIO = _BINARIO_CHK.size
+_SUMA_CABECERA = CABECERA_BINARIA + TIPO_COMANDO
+
+# ASCII: representación de cada velocidad posible, calculada una sola vez
+_ASCII_VELOCIDADES = tuple(str(v).encode('ascii') for v in range(-VELOCIDAD_LIMITE, VELOCIDAD_LIMITE + 1))
+
+
+def _empaquetar_binario(tipo: int, left: int, right: int) -> bytes:
+    buf = bytearray(TAMANO_BINARIO)
+    _BINARIO.pack_into(buf, 0, CABECERA_BINARIA, tipo, left, right)
+    buf[-1] = sum(buf[:-1]) & 0xFF
+    return bytes(buf)
+
+
+# Mensajes constantes
+ASCII_STOP = b'M0,0\n'
+ASCII_EMERGENCIA = b'E\n'
+BINARIO_STOP = _empaquetar_binario(TIPO_COMANDO, 0, 0)
+BINARIO_EMERGENCIA = _empaquetar_binario(TIPO_EMERGENCIA, 0, 0)
+
+
+class MotorCommandEncoder:
+    """
+    Codificador de comandos de motor para el protocolo configurado
+    """
+
+    def __init__(self, protocol: str = PROTOCOLO_JSON):
+        """
+        Args:
+            protocol: 'json', 'ascii' o 'binario'
+        """
+        if protocol not in (PROTOCOLO_JSON, PROTOCOLO_ASCII, PROTOCOLO_BINARIO):
+            raise ValueError(f"Protocolo de motor desconocido: {protocol}")
+        self.protocol = protocol
+
+        if protocol == PROTOCOLO_ASCII:
+            self.stop = ASCII_STOP
+            self.emergency = ASCII_EMERGENCIA
+        elif protocol == PROTOCOLO_BINARIO:
+            self.stop = BINARIO_STOP
+            self.emergency = BINARIO_EMERGENCIA
+        else:
+            self.stop = None       # JSON lleva timestamp e id: no es constante
+            self.emergency = None
+
+    def encode(self, left_speed: int, right_speed: int,
+               timestamp: float = 0.0, command_id: int = 0) -> bytes:
+        """
+        Codificar un comando de motor
+
+        Args:
+            left_speed: Velocidad motor izquierdo (-255 a 255, ya limitada)
+            right_speed: Velocidad motor derecho (-255 a 255, ya limitada)
+            timestamp: Sólo se usa en JSON
+            command_id: Sólo se usa en JSON
+
+        Returns:
+            bytes listos para escribir en el puerto
+        """
+        if self.protocol == PROTOCOLO_ASCII:
+            if left_speed == 0 and right_speed == 0:
+                return ASCII_STOP
+            tabla = _ASCII_VELOCIDADES
+            return b''.join((b'M', tabla[left_speed + VELOCIDAD_LIMITE], b',',
+                             tabla[right_speed + VELOCIDAD_LIMITE], b'\n'))
+
+        if self.protocol == PROTOCOLO_BINARIO:
+            if left_speed == 0 and right_speed == 0:
+                return BINARIO_STOP
+            # Checksum por aritmética sobre los int16 (complemento a 2 con & 0xFF)
+            chk = (_SUMA_CABECERA + (left_speed & 0xFF) + ((left_speed >> 8) & 0xFF)
+                   + (right_speed & 0xFF) + ((right_speed >> 8) & 0xFF)) & 0xFF
+            return _BINARIO_CHK.pack(CABECERA_BINARIA, TIPO_COMANDO, left_speed, right_speed, chk)
+
+        message = {
+            "type": "motor_command",
+            "left_speed": left_speed,
+            "right_speed": right_speed,
+            "timestamp": timestamp,
+            "command_id": command_id
+        }
+        return (json.dumps(message) + '\n').encode('utf-8')
+
+    def encode_emergency(self, command_id: int = 0) -> bytes:
+        """Mensaje de parada de emergencia (constante salvo en JSON)"""
+        if self.emergency is not None:
+            return self.emergency
+        message = {
+            "type": "emergency_stop",
+            "timestamp": time.time(),
+            "command_id": command_id
+        }
+        return (json.dumps(message) + '\n').encode('utf-8')
+
+
+def decode_command(data: bytes, protocol: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Decodificador de referencia (simulador / pruebas)
+
+    Returns:
+        ('motor_command', L, R), ('emergency_stop', 0, 0) o None si es inválido
+    """
+    try:
+        if protocol == PROTOCOLO_BINARIO:
+            if len(data) != TAMANO_BINARIO or (sum(data[:-1]) & 0xFF) != data[-1]:
+                return None
+            cabecera, tipo, left, right = _BINARIO.unpack_from(data)
+            if cabecera != CABECERA_BINARIA:
+                return None
+            if tipo == TIPO_EMERGENCIA:
+                return ('emergency_stop', 0, 0)
+            return ('motor_command', left, right) if tipo == TIPO_COMANDO else None
+
+        if protocol == PROTOCOLO_ASCII:
+            texto = data.strip()
+            if texto == b'E':
+                return ('emergency_stop', 0, 0)
+            if texto[:1] != b'M':
+                return None
+            left, right = (int(v) for v in texto[1:].split(b','))
+            return ('motor_command', left, right)
+
+        message = json.loads(data)
+        if message.get('type') == 'emergency_stop':
+            return ('emergency_stop', 0, 0)
+        return ('motor_command', int(message['left_speed']), int(message['right_speed']))
+    except (ValueError, KeyError, struct.error):
+        return None
@@ -9,12 +9,12 @@ Date: July 2025
 
 import serial
 import time
-import json
 import numpy as np
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, Optional
 from dataclasses import dataclass
-from threading import Lock
+from threading import Lock, Condition, Thread
 from enum import Enum
+from src.utils.controladores.protocolo_motor import MotorCommandEncoder, PROTOCOLO_JSON
 
 class MotorDirection(Enum):
     """Direcciones de movimiento del motor"""
@@ -48,7 +48,9 @@ class UARTMotorController:
     Envía comandos de control de motores al ESP32
     """
     
-    def __init__(self, port: str = '/dev/ttyAMA0', baudrate: int = 2000000, timeout: float = 0.5):
+    def __init__(self, port: str = '/dev/ttyAMA0', baudrate: int = 2000000, timeout: float = 0.5,
+                 shared_port=None, background: bool = False, repeat_interval: float = 0.5,
+                 protocol: str = PROTOCOLO_JSON):
         """
         Inicializar el controlador de motores
         
@@ -56,10 +58,21 @@ class UARTMotorController:
             port: Puerto serie (ej: '/dev/ttyAMA0', 'COM3')
             baudrate: Velocidad de comunicación  
             timeout: Timeout para escritura de datos
+            shared_port: SharedSerialPort dueño de la conexión (opcional). Si se
+                indica, los comandos se encolan en su escritor en lugar de
+                abrir un segundo serial.Serial sobre el mismo dispositivo.
+            background: Enviar desde un hilo escritor; send_motor_command sólo
+                deja el comando en un buzón (el último gana) y retorna
+            repeat_interval: Segundos tras los cuales se reenvía un comando
+                idéntico al último enviado (en modo background)
+            protocol: Codificación de comandos: 'json', 'ascii' o 'binario'
+                (ver protocolo_motor.py)
         """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.shared_port = shared_port
+        self.encoder = MotorCommandEncoder(protocol)
         self.serial_conn = None
         self.is_connected = False
         self.lock = Lock()
@@ -76,6 +89,24 @@ class UARTMotorController:
         # Configuración de suavizado
         self.enable_smoothing = True
         self.max_acceleration = 50  # Cambio máximo por comando
+
+        # Hilo escritor con buzón "el último gana"
+        self.background = background
+        self.repeat_interval = repeat_interval
+        self._writer: Optional[Thread] = None
+        self._writer_cond = Condition()
+        self._writer_stop = False
+        self._writer_busy = False
+        self._pending: Optional[MotorCommand] = None   # Último comando sin enviar
+        self._priority: Optional[bytes] = None         # Parada de emergencia pendiente
+        self._last_sent: Optional[Tuple[int, int]] = None
+        self._last_sent_time = 0.0
+
+        # Estadísticas del escritor
+        self.commands_sent = 0
+        self.commands_coalesced = 0  # Reemplazados en el buzón antes de enviarse
+        self.commands_skipped = 0    # Idénticos al último enviado
+        self.send_errors = 0
         
     def connect(self) -> bool:
         """
@@ -85,18 +116,26 @@ class UARTMotorController:
             bool: True si la conexión fue exitosa
         """
         try:
-            self.serial_conn = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                timeout=self.timeout,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                bytesize=serial.EIGHTBITS
-            )
+            if self.shared_port is not None:
+                if not self.shared_port.open():
+                    return False
+                # La conexión real pertenece al puerto compartido
+                self.serial_conn = self.shared_port
+            else:
+                self.serial_conn = serial.Serial(
+                    port=self.port,
+                    baudrate=self.baudrate,
+                    timeout=self.timeout,
+                    parity=serial.PARITY_NONE,
+                    stopbits=serial.STOPBITS_ONE,
+                    bytesize=serial.EIGHTBITS
+                )
             
             if self.serial_conn.is_open:
                 self.is_connected = True
-                print(f"Motor Controller conectado a {self.port} @ {self.baudrate} bps")
+                print(f"Motor Controller conectado a {self.serial_conn.port} @ {self.serial_conn.baudrate} bps")
+                if self.background:
+                    self._start_writer()
                 
                 # Enviar comando inicial (parar motores)
                 self.stop_motors()
@@ -113,19 +152,130 @@ class UARTMotorController:
     
     def disconnect(self):
         """Desconectar del puerto serie"""
+        # Parar motores antes de desconectar (fuera del lock: stop_motors lo toma)
+        if self.is_connected:
+            self.stop_motors()
+            if self._writer is not None:
+                self._stop_writer()
+            time.sleep(0.1)  # Dar tiempo para que se envíe el comando
+
         with self.lock:
-            # Parar motores antes de desconectar
-            if self.is_connected:
-                self.stop_motors()
-                time.sleep(0.1)  # Dar tiempo para que se envíe el comando
-            
-            if self.serial_conn and self.serial_conn.is_open:
+            if self.shared_port is not None and self.serial_conn is not None:
+                self.shared_port.close()
+                print("Motor Controller desconectado")
+            elif self.serial_conn and self.serial_conn.is_open:
                 self.serial_conn.close()
                 print("Motor Controller desconectado")
             
             self.serial_conn = None
             self.is_connected = False
     
+    # #####################################################
+    # HILO ESCRITOR
+    # #####################################################
+    def _start_writer(self):
+        self._writer_stop = False
+        self._writer = Thread(target=self._writer_loop, name="UARTMotorController-tx", daemon=True)
+        self._writer.start()
+
+    def _stop_writer(self):
+        # Envía lo que quede en el buzón antes de terminar
+        with self._writer_cond:
+            self._writer_stop = True
+            self._writer_cond.notify_all()
+        self._writer.join(timeout=max(self.timeout, 0.1) * 4)
+        self._writer = None
+
+    def _writer_loop(self):
+        while True:
+            with self._writer_cond:
+                while self._pending is None and self._priority is None and not self._writer_stop:
+                    self._writer_cond.wait()
+                # La parada de emergencia sale antes que cualquier comando
+                priority, command = self._priority, None
+                if priority is not None:
+                    self._priority = None
+                else:
+                    command, self._pending = self._pending, None
+                if priority is None and command is None:
+                    return
+                self._writer_busy = True
+            try:
+                if priority is not None:
+                    self._transmit_emergency(priority)
+                else:
+                    self._transmit(command)
+            except Exception as e:
+                self.send_errors += 1
+                print(f"Error enviando comando de motor: {e}")
+            finally:
+                with self._writer_cond:
+                    self._writer_busy = False
+                    self._writer_cond.notify_all()
+
+    def wait_sent(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que el buzón del escritor quede vacío"""
+        with self._writer_cond:
+            return self._writer_cond.wait_for(
+                lambda: self._pending is None and self._priority is None and not self._writer_busy,
+                timeout=timeout
+            )
+
+    def _transmit(self, command: MotorCommand):
+        speeds = (command.left_speed, command.right_speed)
+        if speeds == self._last_sent and time.monotonic() - self._last_sent_time < self.repeat_interval:
+            self.commands_skipped += 1
+            return
+        bytes_sent = self._write(self._encode_command(command))
+        if bytes_sent and bytes_sent > 0:
+            self._last_sent = speeds
+            self._last_sent_time = time.monotonic()
+            self.commands_sent += 1
+            print(f"Comando enviado: L={command.left_speed}, R={command.right_speed}")
+        else:
+            self.send_errors += 1
+            print("Error: No se enviaron datos")
+
+    def _transmit_emergency(self, data: bytes):
+        bytes_sent = self._write(data, priority=True)
+        if bytes_sent and bytes_sent > 0:
+            self._last_sent = (0, 0)
+            self._last_sent_time = time.monotonic()
+            self.commands_sent += 1
+            print("PARADA DE EMERGENCIA enviada")
+        else:
+            self.send_errors += 1
+            print("Error: No se pudo enviar parada de emergencia")
+
+    # #####################################################
+    # CODIFICACIÓN Y ENVÍO
+    # #####################################################
+    def _encode_command(self, command: MotorCommand) -> bytes:
+        return self.encoder.encode(
+            command.left_speed, command.right_speed,
+            command.timestamp, command.command_id
+        )
+
+    def _encode_emergency(self) -> bytes:
+        return self.encoder.encode_emergency(self.command_counter + 1)
+
+    def _write(self, data: bytes, priority: bool = False) -> int:
+        """
+        Enviar bytes por el puerto propio o encolarlos en el puerto compartido
+        
+        Args:
+            data: Bytes a enviar
+            priority: Adelantar el mensaje en la cola del puerto compartido
+            
+        Returns:
+            Cantidad de bytes enviados/encolados (0 si falló)
+        """
+        if self.shared_port is not None:
+            return len(data) if self.shared_port.write(data, priority=priority) else 0
+        bytes_sent = self.serial_conn.write(data)
+        self.serial_conn.flush()
+        return bytes_sent
+    
     def _clamp_speed(self, speed: int) -> int:
         """
         Limitar velocidad a rangos seguros
@@ -172,6 +322,30 @@ class UARTMotorController:
         
         return int(smooth_left), int(smooth_right)
     
+    def _prepare_command(self, left_speed: int, right_speed: int, smooth: bool) -> MotorCommand:
+        """
+        Limitar, suavizar y numerar un comando de motor
+        
+        Returns:
+            MotorCommand listo para codificar
+        """
+        # Limitar velocidades
+        left_speed = self._clamp_speed(left_speed)
+        right_speed = self._clamp_speed(right_speed)
+        
+        # Aplicar suavizado si está habilitado
+        if smooth and self.enable_smoothing:
+            left_speed, right_speed = self._apply_smoothing(left_speed, right_speed)
+        
+        # Crear comando
+        self.command_counter += 1
+        return MotorCommand(
+            left_speed=left_speed,
+            right_speed=right_speed,
+            timestamp=time.time(),
+            command_id=self.command_counter
+        )
+    
     def send_motor_command(self, left_speed: int, right_speed: int, smooth: bool = True) -> bool:
         """
         Enviar comando de motor
@@ -190,42 +364,33 @@ class UARTMotorController:
         
         try:
             with self.lock:
-                # Limitar velocidades
-                left_speed = self._clamp_speed(left_speed)
-                right_speed = self._clamp_speed(right_speed)
-                
-                # Aplicar suavizado si está habilitado
-                if smooth and self.enable_smoothing:
-                    left_speed, right_speed = self._apply_smoothing(left_speed, right_speed)
-                
-                # Crear comando
-                self.command_counter += 1
-                command = MotorCommand(
-                    left_speed=left_speed,
-                    right_speed=right_speed,
-                    timestamp=time.time(),
-                    command_id=self.command_counter
-                )
-                
-                # Crear mensaje JSON
-                message = {
-                    "type": "motor_command",
-                    "left_speed": command.left_speed,
-                    "right_speed": command.right_speed,
-                    "timestamp": command.timestamp,
-                    "command_id": command.command_id
-                }
+                command = self._prepare_command(left_speed, right_speed, smooth)
+                left_speed, right_speed = command.left_speed, command.right_speed
                 
+                if self._writer is not None:
+                    # Dejar el comando en el buzón; el escritor lo envía. El
+                    # estado se actualiza dentro del mismo bloque que el buzón:
+                    # una parada de emergencia no puede quedar entre ambos
+                    with self._writer_cond:
+                        if self._pending is not None:
+                            self.commands_coalesced += 1
+                        self._pending = command
+                        self.current_command = command
+                        self.motor_status.left_speed = left_speed
+                        self.motor_status.right_speed = right_speed
+                        self.motor_status.last_command_time = command.timestamp
+                        self._writer_cond.notify()
+                    return True
+
                 # Enviar comando
-                json_data = json.dumps(message) + '\n'
-                bytes_sent = self.serial_conn.write(json_data.encode('utf-8'))
-                self.serial_conn.flush()
+                bytes_sent = self._write(self._encode_command(command))
                 
                 if bytes_sent and bytes_sent > 0:
                     self.current_command = command
                     self.motor_status.left_speed = left_speed
                     self.motor_status.right_speed = right_speed
                     self.motor_status.last_command_time = command.timestamp
+                    self.commands_sent += 1
                     
                     print(f"Comando enviado: L={left_speed}, R={right_speed}")
                     return True
@@ -277,17 +442,23 @@ class UARTMotorController:
             return False
         
         try:
+            # Camino prioritario: no espera al lock de send_motor_command
+            if self._writer is not None:
+                with self._writer_cond:
+                    # Descarta el comando pendiente: ya no debe enviarse
+                    if self._pending is not None:
+                        self._pending = None
+                        self.commands_coalesced += 1
+                    self._priority = self._encode_emergency()
+                    self.current_command = MotorCommand(0, 0)
+                    self.motor_status.left_speed = 0
+                    self.motor_status.right_speed = 0
+                    self.motor_status.last_command_time = time.time()
+                    self._writer_cond.notify()
+                return True
+
             with self.lock:
-                # Crear mensaje de emergencia
-                message = {
-                    "type": "emergency_stop",
-                    "timestamp": time.time(),
-                    "command_id": self.command_counter + 1
-                }
-                
-                json_data = json.dumps(message) + '\n'
-                bytes_sent = self.serial_conn.write(json_data.encode('utf-8'))
-                self.serial_conn.flush()
+                bytes_sent = self._write(self._encode_emergency(), priority=True)
                 
                 if bytes_sent and bytes_sent > 0:
                     # Actualizar estado local
@@ -430,10 +601,17 @@ class UARTMotorController:
         return {
             'connected': self.is_connected,
             'port': self.port,
+            'shared_port': self.shared_port is not None,
+            'protocol': self.encoder.protocol,
             'baudrate': self.baudrate,
             'current_left_speed': self.current_command.left_speed,
             'current_right_speed': self.current_command.right_speed,
             'last_command_time': self.motor_status.last_command_time,
+            'background': self._writer is not None,
+            'commands_sent': self.commands_sent,
+            'commands_coalesced': self.commands_coalesced,
+            'commands_skipped': self.commands_skipped,
+            'send_errors': self.send_errors,
             'smoothing_enabled': self.enable_smoothing,
             'max_acceleration': self.max_acceleration,
             'speed_limits': [self.min_speed, self.max_speed]
@@ -29,7 +29,13 @@ class TagPlotter:
         plt.ion()
         plt.show()
 
-    def actualizar(self, x, y, z, radio_error=100):
+    def actualizar(self, x, y, z, radio_error=100, covarianza=None):
+        """
+        radio_error: Radio de la esfera de error (mm)
+        covarianza: Covarianza 3x3 de la posición (DiagnosticoPosicion.covarianza);
+            si se da, se dibuja el elipsoide de 1 sigma y radio_error pasa a ser
+            la incertidumbre sqrt(traza(covarianza))
+        """
         self.xs.append(x)
         self.ys.append(y)
         self.zs.append(z)
@@ -47,14 +53,20 @@ class TagPlotter:
         # Trayectoria histórica
         self.ax.plot(self.xs, self.ys, self.zs, marker='o', color='blue')
 
+        # Esfera (o elipsoide de covarianza) de error en último punto
+        u, v = np.mgrid[0:2*np.pi:20j, 0:np.pi:10j]
+        esfera = np.stack((np.cos(u) * np.sin(v), np.sin(u) * np.sin(v), np.cos(v)))
+        if covarianza is not None and np.all(np.isfinite(covarianza)):
+            autovalores, autovectores = np.linalg.eigh(covarianza)
+            ejes = autovectores * np.sqrt(np.maximum(autovalores, 0.0))
+            radio_error = float(np.sqrt(np.sum(autovalores)))
+            xs, ys, zs = np.einsum('ij,jkl->ikl', ejes, esfera)
+        else:
+            xs, ys, zs = radio_error * esfera
+        xs, ys, zs = xs + x, ys + y, zs + z
+
         # Determinar color
         color_esfera = determinar_color_error(radio_error)
-
-        # Esfera de error en último punto
-        u, v = np.mgrid[0:2*np.pi:20j, 0:np.pi:10j]
-        xs = x + radio_error * np.cos(u) * np.sin(v)
-        ys = y + radio_error * np.sin(u) * np.sin(v)
-        zs = z + radio_error * np.cos(v)
         self.ax.plot_surface(xs, ys, zs, color=color_esfera, alpha=0.6)
 
         # Mostrar el valor del error cerca del tag (opcional)
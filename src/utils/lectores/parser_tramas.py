@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Parser incremental de tramas ASCII
+Decodifica todas las tramas completas [D1,D2,D3,Vbat,Currmot1,Currmot2]
+presentes en el buffer en una sola pasada, avanzando un offset en lugar de
+copiar la cola del buffer tras cada trama.
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import numpy as np
+from typing import List, Optional, Union
+
+FORMATO_ASCII = 'ascii'
+FORMATO_BINARIO = 'binario'
+
+
+class AsciiFrameParser:
+    """
+    Escanea el buffer por offset y re-sincroniza en el siguiente '[' ante
+    una trama corrupta, sin descartar las tramas válidas que la siguen.
+    """
+
+    def __init__(self, n_fields: int = 6, compact_threshold: int = 4096, verbose: bool = True):
+        """
+        Args:
+            n_fields: Cantidad de valores esperados por trama
+            compact_threshold: Bytes consumidos a partir de los cuales se compacta el buffer
+            verbose: Imprimir los errores de parseo
+        """
+        self.n_fields = n_fields
+        self.compact_threshold = compact_threshold
+        self.verbose = verbose
+
+        self.buffer = bytearray()
+        self._offset = 0  # Primer byte aún no consumido
+
+        # Contadores
+        self.frames_ok = 0
+        self.malformed = 0     # Tramas que no se pueden convertir o sin cierre antes del siguiente '['
+        self.wrong_count = 0   # Tramas con cantidad incorrecta de valores
+        self.invalid = 0       # Tramas con algún valor -1.0
+
+    @property
+    def dropped(self) -> int:
+        return self.malformed + self.wrong_count + self.invalid
+
+    @property
+    def pending(self) -> int:
+        """Bytes recibidos y todavía sin consumir"""
+        return len(self.buffer) - self._offset
+
+    def feed(self, data: bytes):
+        self.buffer.extend(data)
+
+    def reset(self):
+        self.buffer.clear()
+        self._offset = 0
+
+    def parse(self, all_frames: bool = False) -> Union[Optional[np.ndarray], List[np.ndarray]]:
+        """
+        Decodifica todas las tramas completas del buffer.
+
+        Args:
+            all_frames: Retornar la lista de todas las tramas en lugar de sólo la más reciente
+
+        Returns:
+            La trama válida más reciente (o None), o la lista de tramas válidas
+        """
+        buf = self.buffer
+        size = len(buf)
+        pos = self._offset
+        frames = []
+
+        with memoryview(buf) as view:
+            while True:
+                start = buf.find(b'[', pos)
+                if start == -1:
+                    pos = size  # Nada útil: descartar basura
+                    break
+                end = buf.find(b']', start + 1)
+                if end == -1:
+                    pos = start  # Trama incompleta: esperar más bytes
+                    break
+
+                resync = buf.find(b'[', start + 1, end)
+                if resync != -1:
+                    # Trama cortada: continuar desde el siguiente inicio
+                    self._error('malformed', f" Trama truncada descartada en offset {start}")
+                    pos = resync
+                    continue
+                pos = end + 1
+
+                fields = view[start + 1:end].tobytes().split(b',')
+                if len(fields) != self.n_fields:
+                    self._error('wrong_count', f" Cantidad incorrecta de valores: {len(fields)}")
+                    continue
+                try:
+                    values = [float(v) for v in fields]
+                except ValueError as e:
+                    self._error('malformed', f" Error parseando datos: {e}")
+                    continue
+                if -1.0 in values:
+                    self._error('invalid', "Valor inválido (-1.0) detectado en los datos del sensor")
+                    continue
+
+                frames.append(np.array(values, dtype=np.float64))
+
+        # Compactar sólo cuando se consumió todo o se acumuló suficiente
+        if pos >= size:
+            buf.clear()
+            pos = 0
+        elif pos >= self.compact_threshold:
+            del buf[:pos]
+            pos = 0
+        self._offset = pos
+
+        self.frames_ok += len(frames)
+        if all_frames:
+            return frames
+        return frames[-1] if frames else None
+
+    def _error(self, counter: str, message: str):
+        setattr(self, counter, getattr(self, counter) + 1)
+        if self.verbose:
+            print(message)
+
+    def get_stats(self) -> dict:
+        return {
+            'ok': self.frames_ok,
+            'malformed': self.malformed,
+            'wrong_count': self.wrong_count,
+            'invalid': self.invalid,
+            'pending_bytes': self.pending
+        }
+
+
+def create_frame_parser(frame_format: str = FORMATO_ASCII, verbose: bool = True):
+    """
+    Crear el parser correspondiente al formato de trama configurado
+
+    Args:
+        frame_format: 'ascii' ([D1,...]) o 'binario' (ver trama_binaria)
+        verbose: Imprimir los errores de parseo
+    """
+    if frame_format == FORMATO_ASCII:
+        return AsciiFrameParser(n_fields=6, verbose=verbose)
+    if frame_format == FORMATO_BINARIO:
+        from src.utils.lectores.trama_binaria import BinaryFrameParser
+        return BinaryFrameParser(verbose=verbose)
+    raise ValueError(f"Formato de trama desconocido: {frame_format}")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared Serial Port Module
+Dueño único de la conexión serie compartida entre la telemetría del ESP32
+(lectura) y los comandos de motor (escritura).
+
+- Un hilo lector entrega cada bloque de bytes recibido a los suscriptores.
+- Un hilo escritor envía en orden los mensajes encolados, de modo que
+  lectura y escritura no se bloquean entre sí. Los mensajes prioritarios
+  (parada de emergencia) van en una cola aparte, sin límite, que se vacía
+  antes que la normal y nunca se descarta.
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import serial
+from collections import deque
+from threading import Lock, Condition, Thread, Event
+from typing import Callable, List, Optional
+
+
+class SharedSerialPort:
+    """
+    Conexión serie única con lectura y escritura multiplexadas.
+    Los clientes (SensorReader, UARTMotorController) llaman a open()/close();
+    el puerto se abre con el primer cliente y se cierra con el último.
+    """
+
+    def __init__(self, port: str = '/dev/ttyAMA0', baudrate: int = 2000000,
+                 timeout: float = 0.05, max_queue: int = 64):
+        """
+        Args:
+            port: Puerto serie (ej: '/dev/ttyAMA0', 'COM3')
+            baudrate: Velocidad de comunicación
+            timeout: Timeout de lectura del hilo lector
+            max_queue: Mensajes normales pendientes máximos; al desbordar se
+                descarta el más antiguo (nunca un mensaje prioritario)
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+
+        self.serial_conn: Optional[serial.Serial] = None
+        self.lock = Lock()
+        self._users = 0
+
+        self._subscribers: List[Callable[[bytes], None]] = []
+        self._write_queue = deque(maxlen=max_queue)
+        self._priority_queue = deque()
+        self._write_cond = Condition()
+        self._writing = False
+        self._stop_event = Event()
+        self._reader: Optional[Thread] = None
+        self._writer: Optional[Thread] = None
+
+        # Estadísticas
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+        self.writes_dropped = 0  # Mensajes normales descartados por cola llena
+
+    # #####################################################
+    # APERTURA Y CIERRE (CON CONTEO DE CLIENTES)
+    # #####################################################
+    def open(self) -> bool:
+        with self.lock:
+            if self.is_open:
+                self._users += 1
+                return True
+            try:
+                self.serial_conn = serial.Serial(
+                    port=self.port,
+                    baudrate=self.baudrate,
+                    timeout=self.timeout,
+                    write_timeout=None,
+                    parity=serial.PARITY_NONE,
+                    stopbits=serial.STOPBITS_ONE,
+                    bytesize=serial.EIGHTBITS
+                )
+            except Exception as e:
+                print(f"Error al abrir puerto compartido {self.port}: {e}")
+                self.serial_conn = None
+                return False
+
+            self._users = 1
+            self._stop_event.clear()
+            self._reader = Thread(target=self._read_loop, name="SharedSerialPort-rx", daemon=True)
+            self._writer = Thread(target=self._write_loop, name="SharedSerialPort-tx", daemon=True)
+            self._reader.start()
+            self._writer.start()
+            print(f"Puerto compartido abierto en {self.port} @ {self.baudrate} bps")
+            return True
+
+    def close(self):
+        with self.lock:
+            if self._users > 1:
+                self._users -= 1
+                return
+            self._users = 0
+            if not self.is_open:
+                return
+
+        # Dejar salir lo pendiente antes de detener los hilos
+        self.flush(timeout=0.5)
+        self._stop_event.set()
+        with self._write_cond:
+            self._write_cond.notify_all()
+        for thread in (self._reader, self._writer):
+            if thread is not None:
+                thread.join(timeout=max(self.timeout, 0.1) * 4)
+        self._reader = self._writer = None
+
+        with self.lock:
+            if self.serial_conn and self.serial_conn.is_open:
+                self.serial_conn.close()
+                print("Puerto compartido cerrado")
+            self.serial_conn = None
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.serial_conn and self.serial_conn.is_open)
+
+    # #####################################################
+    # LECTURA: DISTRIBUCIÓN A SUSCRIPTORES
+    # #####################################################
+    def subscribe(self, callback: Callable[[bytes], None]):
+        """Registrar una función que recibe cada bloque de bytes leído"""
+        with self.lock:
+            if callback not in self._subscribers:
+                self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[bytes], None]):
+        with self.lock:
+            self._subscribers = [cb for cb in self._subscribers if cb != callback]
+
+    def _read_loop(self):
+        conn = self.serial_conn
+        while not self._stop_event.is_set():
+            try:
+                chunk = conn.read(conn.in_waiting or 1)
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    print(f"Error leyendo puerto compartido: {e}")
+                break
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            for callback in self._subscribers:
+                try:
+                    callback(chunk)
+                except Exception as e:
+                    print(f"Error en suscriptor del puerto compartido: {e}")
+
+    # #####################################################
+    # ESCRITURA: COLA SERIALIZADA
+    # #####################################################
+    def write(self, data: bytes, priority: bool = False) -> bool:
+        """
+        Encolar un mensaje para enviar. No bloquea.
+
+        Args:
+            data: Bytes a enviar
+            priority: Enviar antes que cualquier mensaje normal pendiente
+
+        Returns:
+            bool: True si el mensaje quedó encolado
+        """
+        if not self.is_open:
+            return False
+        with self._write_cond:
+            if priority:
+                self._priority_queue.append(data)
+            else:
+                if len(self._write_queue) == self._write_queue.maxlen:
+                    self.writes_dropped += 1
+                self._write_queue.append(data)
+            self._write_cond.notify()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que la cola de escritura se vacíe y el último envío termine"""
+        with self._write_cond:
+            return self._write_cond.wait_for(
+                lambda: (not self._priority_queue and not self._write_queue and not self._writing)
+                or not self.is_open,
+                timeout=timeout
+            )
+
+    def _write_loop(self):
+        conn = self.serial_conn
+        while True:
+            with self._write_cond:
+                while not self._priority_queue and not self._write_queue and not self._stop_event.is_set():
+                    self._write_cond.wait()
+                if self._priority_queue:
+                    data = self._priority_queue.popleft()
+                elif self._write_queue:
+                    data = self._write_queue.popleft()
+                else:
+                    return
+                self._writing = True
+            try:
+                conn.write(data)
+                conn.flush()
+                self.bytes_written += len(data)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"Error escribiendo puerto compartido: {e}")
+            with self._write_cond:
+                self._writing = False
+                self._write_cond.notify_all()
+
+    def get_connection_info(self) -> dict:
+        return {
+            'port': self.port,
+            'baudrate': self.baudrate,
+            'connected': self.is_open,
+            'users': self._users,
+            'subscribers': len(self._subscribers),
+            'pending_writes': len(self._priority_queue) + len(self._write_queue),
+            'writes_dropped': self.writes_dropped,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'write_errors': self.write_errors
+        }
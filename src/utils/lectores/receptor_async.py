@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Async Telemetry Receiver Module
+Versión asyncio de TelemetryReceiver: el descriptor del transporte se
+registra con loop.add_reader() y cada trama nueva despierta a quien la
+espere, sin hilos ni sleep(TIEMPO_ESPERA).
+
+    receptor = AsyncTelemetryReceiver(SerialTransport(DATA_PORT, BAUDRATE, timeout=0))
+    await receptor.connect()
+    async for trama in receptor:
+        ...
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import asyncio
+import numpy as np
+from typing import Optional
+
+from src.utils.lectores.parser_tramas import FORMATO_ASCII
+from src.utils.lectores.receptor_telemetria import TelemetryReceiver
+from src.utils.lectores.transportes import Transport
+
+
+class AsyncTelemetryReceiver(TelemetryReceiver):
+    """
+    Receptor de telemetría dirigido por el event loop.
+    Los accesores síncronos (get_distances, frame_age, ...) siguen
+    disponibles; read_data()/read_if_new() no leen del transporte, sólo
+    consultan lo ya publicado.
+    """
+
+    def __init__(self, transport: Transport, history_size: int = 64,
+                 frame_format: str = FORMATO_ASCII, recorder=None, poll_interval: float = 0.01):
+        """
+        Args:
+            transport: Fuente de bytes; si no tiene descriptor (p. ej. replay)
+                se consulta cada poll_interval segundos
+            history_size: Tramas que conserva el buffer circular
+            frame_format: 'ascii' o 'binario'
+            recorder: TelemetryRecorder opcional
+            poll_interval: Periodo de consulta para transportes sin descriptor
+        """
+        super().__init__(transport, background=False, history_size=history_size,
+                         frame_format=frame_format, recorder=recorder)
+        self.poll_interval = poll_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fd: Optional[int] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._new_frame: Optional[asyncio.Event] = None
+        self._closed = False
+
+    # #####################################################
+    # CONEXIÓN Y DESCONEXIÓN
+    # #####################################################
+    async def connect(self) -> bool:
+        if not self.transport.open():
+            return False
+        self._loop = asyncio.get_running_loop()
+        self._new_frame = asyncio.Event()
+        self._closed = False
+
+        if self.transport.push:
+            # Los bytes llegan desde otro hilo: reenviarlos al event loop
+            self.transport.set_callback(
+                lambda chunk: self._loop.call_soon_threadsafe(self._feed, chunk)
+            )
+            return True
+        try:
+            self._fd = self.transport.fileno()
+            self._loop.add_reader(self._fd, self._on_readable)
+        except (OSError, AttributeError, ValueError):
+            self._fd = None
+            self._poll_task = self._loop.create_task(self._poll_loop())
+        return True
+
+    async def disconnect(self):
+        self._shutdown()
+        self.transport.close()
+
+    def _shutdown(self):
+        if self._fd is not None and self._loop is not None:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        self._closed = True
+        if self._new_frame is not None:
+            self._new_frame.set()  # Despertar a quien esté esperando
+
+    # #####################################################
+    # LECTURA DIRIGIDA POR EL EVENT LOOP
+    # #####################################################
+    def _on_readable(self):
+        try:
+            chunk, t_rx = self.transport.read_available_with_time()
+        except Exception as e:
+            print(f"Error leyendo telemetría: {e}")
+            chunk, t_rx = b'', None
+        if chunk:
+            self._feed(chunk, t_rx)
+        elif not self.transport.is_open:
+            self._shutdown()
+
+    async def _poll_loop(self):
+        while self.transport.is_open:
+            chunk, t_rx = self.transport.read_available_with_time()
+            if chunk:
+                self._feed(chunk, t_rx)
+            await asyncio.sleep(self.poll_interval)
+        self._shutdown()
+
+    def _feed(self, chunk: bytes, t_rx: Optional[float] = None):
+        received = self.frames_received
+        self._ingest(chunk, t_rx)
+        if self.frames_received != received:
+            self._new_frame.set()
+
+    def _poll(self) -> bool:
+        # La lectura la hace el event loop
+        return self.transport.is_open or self.data_valid
+
+    async def next_frame(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Esperar la próxima trama no leída (la más reciente si hay varias)
+
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
+
+        Returns:
+            Copia de la trama, o None si venció el timeout o se cerró
+        """
+        while self.frames_received == self._read_seq:
+            if self._closed:
+                return None
+            self._new_frame.clear()
+            try:
+                await asyncio.wait_for(self._new_frame.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.read_if_new()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> np.ndarray:
+        frame = await self.next_frame()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Telemetry Receiver Module
+Receptor único de telemetría del ESP32 sobre un transporte intercambiable
+(pyserial, pty, socket Unix, puerto compartido o reproducción de registro).
+Formato de datos: [D1,D2,D3,Vbat,Currmot1,Currmot2] (ASCII) o trama binaria
+(ver trama_binaria.py), según frame_format.
+
+Las tramas se copian a un buffer circular preasignado. Los accesores
+(read_data, get_distances, ...) retornan copias, como los lectores
+originales; las variantes *_view retornan vistas de sólo lectura sobre el
+buffer, sin crear arrays nuevos. Una vista sigue siendo válida hasta que el
+buffer da la vuelta (history_size tramas).
+
+SensorReader y UARTDataReceiver son adaptadores de compatibilidad sobre
+esta clase.
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import time
+import numpy as np
+from threading import Lock, Thread, Event
+from typing import List, Optional, Tuple, Union
+
+from src.utils.lectores.parser_tramas import FORMATO_ASCII, create_frame_parser
+from src.utils.lectores.transportes import Transport
+
+N_CAMPOS = 6
+CM_A_MM = 10.0
+
+
+def _solo_lectura(array: np.ndarray) -> np.ndarray:
+    vista = array.view()
+    vista.flags.writeable = False
+    return vista
+
+
+_CEROS_6 = _solo_lectura(np.zeros(N_CAMPOS, dtype=np.float64))  # Vistas sin datos
+_CEROS_3 = _solo_lectura(np.zeros(3, dtype=np.float64))
+_CEROS_2 = _solo_lectura(np.zeros(2, dtype=np.float64))
+
+
+class TelemetryReceiver:
+    """
+    Recibe, decodifica y publica tramas de telemetría.
+
+    - background=True: un hilo lee el transporte continuamente y publica
+      cada trama; las lecturas son O(1) y no bloquean.
+    - background=False: cada read_data()/read_if_new() trae lo pendiente.
+    - Transportes push (puerto compartido): publica desde el hilo del dueño.
+    """
+
+    def __init__(self, transport: Transport, background: bool = False, history_size: int = 64,
+                 frame_format: str = FORMATO_ASCII, recorder=None, poll_timeout: float = 0.05):
+        """
+        Args:
+            transport: Fuente de bytes (ver transportes.py)
+            background: Leer el transporte desde un hilo propio
+            history_size: Tramas que conserva el buffer circular (mínimo 2)
+            frame_format: 'ascii' o 'binario'
+            recorder: TelemetryRecorder opcional para grabar los bytes recibidos
+            poll_timeout: Espera máxima de cada lectura del hilo
+        """
+        self.transport = transport
+        self.background = background
+        self.frame_format = frame_format
+        self.recorder = recorder
+        self.poll_timeout = poll_timeout
+
+        self.lock = Lock()
+        self.parser = create_frame_parser(frame_format)
+
+        # Buffer circular preasignado: tramas, distancias en mm, secuencias y tiempos
+        self.history_size = max(2, int(history_size))
+        self._frames = np.zeros((self.history_size, N_CAMPOS), dtype=np.float64)
+        self._dist_mm = np.zeros((self.history_size, 3), dtype=np.float64)
+        self._seqs = np.zeros(self.history_size, dtype=np.int64)
+        self._times = np.zeros(self.history_size, dtype=np.float64)
+        self._frames_ro = _solo_lectura(self._frames)
+        self._dist_mm_ro = _solo_lectura(self._dist_mm)
+
+        # Buzón: (seq, instante de recepción, fila) en una sola asignación
+        self._latest: Optional[Tuple[int, float, int]] = None
+        self._read_seq = 0  # Secuencia de la última trama entregada
+
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+
+        # Contadores de tramas
+        self.frames_received = 0     # Tramas válidas publicadas
+        self.frames_overwritten = 0  # Tramas reemplazadas sin haber sido leídas
+
+    # #####################################################
+    # CONEXIÓN Y DESCONEXIÓN
+    # #####################################################
+    def connect(self) -> bool:
+        if not self.transport.open():
+            return False
+        if self.transport.push:
+            self.transport.set_callback(self._ingest)
+        elif self.background:
+            self.start()
+        return True
+
+    def disconnect(self):
+        self.stop()
+        with self.lock:
+            self.transport.close()
+
+    @property
+    def data_valid(self) -> bool:
+        return self._latest is not None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.transport.is_open
+
+    # #####################################################
+    # HILO DE LECTURA EN SEGUNDO PLANO
+    # #####################################################
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._ingest_loop, name="TelemetryReceiver", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.poll_timeout, 0.1) * 20)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        if self.transport.push:
+            return self.transport.is_open
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ingest_loop(self):
+        transport = self.transport
+        while not self._stop_event.is_set():
+            try:
+                chunk, t_rx = transport.read_with_time(self.poll_timeout)
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    print(f"Error en hilo de lectura de telemetría: {e}")
+                break
+            if chunk:
+                self._ingest(chunk, t_rx)
+            elif not transport.is_open:
+                break
+
+    def _ingest(self, chunk: bytes, t_rx: Optional[float] = None):
+        # Punto único de entrada de bytes crudos: registro + parseo + publicación.
+        # t_rx: instante de recepción del transporte (None = ahora)
+        with self.lock:
+            if t_rx is None:
+                t_rx = time.monotonic()
+            if self.recorder is not None:
+                self.recorder.record(chunk, t_rx)
+            self.parser.feed(chunk)
+            # Todas las tramas de un bloque comparten el instante de recepción
+            for frame in self._parse_buffer(all_frames=True):
+                self._publish(frame, t_rx)
+
+    def _publish(self, frame: np.ndarray, t_rx: float):
+        seq = self.frames_received + 1
+        row = seq % self.history_size
+        # La fila escrita nunca es la del buzón actual (history_size >= 2)
+        self._frames[row] = frame
+        np.multiply(self._frames[row, :3], CM_A_MM, out=self._dist_mm[row])
+        self._seqs[row] = seq
+        self._times[row] = t_rx
+        if self.frames_received > self._read_seq:
+            self.frames_overwritten += 1
+        self._latest = (seq, t_rx, row)
+        self.frames_received = seq
+
+    def _poll(self) -> bool:
+        # Modo sin hilo: traer lo pendiente hasta publicar una trama nueva.
+        # Retorna False si no hay conexión
+        if self.is_running():
+            return True
+        if not self.transport.is_open:
+            return False
+        received = self.frames_received
+        while True:
+            chunk, t_rx = self.transport.read_available_with_time()
+            if not chunk:
+                break
+            self._ingest(chunk, t_rx)
+            if self.frames_received != received:
+                break
+        return True
+
+    # #####################################################
+    # INTERPRETA LOS DATOS - PARSEO DE BUFFER
+    # #####################################################
+    def _parse_buffer(self, all_frames: bool = False) -> Union[Optional[np.ndarray], List[np.ndarray]]:
+        # Decodifica todas las tramas completas; retorna la más reciente
+        # (o todas con all_frames=True) y re-sincroniza ante errores
+        return self.parser.parse(all_frames=all_frames)
+
+    @property
+    def frames_dropped(self) -> int:
+        return self.parser.dropped
+
+    # #####################################################
+    # LECTURA DE DATOS
+    # #####################################################
+    def _leer(self, solo_nueva: bool) -> Optional[int]:
+        # Fila del buffer con la trama a entregar (None si no hay o ya se leyó)
+        try:
+            if not self._poll():
+                return None
+        except Exception as e:
+            print(f"Error al leer datos de telemetría: {e}")
+            return None
+
+        latest = self._latest
+        if latest is None or (solo_nueva and latest[0] == self._read_seq):
+            return None
+        self._read_seq = latest[0]
+        return latest[2]
+
+    def read_data(self) -> Optional[np.ndarray]:
+        """Última trama válida (copia) o None si nunca llegó una"""
+        row = self._leer(solo_nueva=False)
+        return None if row is None else self._frames[row].copy()
+
+    def read_if_new(self) -> Optional[np.ndarray]:
+        """Retorna la trama más reciente (copia) sólo si no fue leída antes; si no, None"""
+        row = self._leer(solo_nueva=True)
+        return None if row is None else self._frames[row].copy()
+
+    def read_data_view(self) -> Optional[np.ndarray]:
+        """Como read_data, pero retorna una vista de sólo lectura del buffer"""
+        row = self._leer(solo_nueva=False)
+        return None if row is None else self._frames_ro[row]
+
+    def read_if_new_view(self) -> Optional[np.ndarray]:
+        """Como read_if_new, pero retorna una vista de sólo lectura del buffer"""
+        row = self._leer(solo_nueva=True)
+        return None if row is None else self._frames_ro[row]
+
+    def frame_age(self) -> Optional[float]:
+        """Segundos desde la recepción de la última trama (None si no hubo ninguna)"""
+        latest = self._latest
+        return None if latest is None else self.transport.now() - latest[1]
+
+    def last_frame_info(self) -> Tuple[int, Optional[float]]:
+        """
+        (número de secuencia, instante monotónico de recepción) de la última trama;
+        en reproducción, el instante grabado (reloj de transport.now())
+        """
+        latest = self._latest
+        return (0, None) if latest is None else (latest[0], latest[1])
+
+    # #####################################################
+    # ACCESORES (COPIAS)
+    # #####################################################
+    def get_distances(self) -> np.ndarray:
+        """[D1, D2, D3] en milímetros"""
+        return self.get_distances_view().copy()
+
+    def get_power_info(self) -> np.ndarray:
+        """[Vbat, Currmot1, Currmot2]"""
+        return self.get_power_info_view().copy()
+
+    def get_full_data(self) -> np.ndarray:
+        """[D1, D2, D3, Vbat, Currmot1, Currmot2]"""
+        return self.get_full_data_view().copy()
+
+    def get_battery_voltage(self) -> float:
+        latest = self._latest
+        return 0.0 if latest is None else float(self._frames[latest[2], 3])
+
+    def get_motor_currents(self) -> np.ndarray:
+        """[Currmot1, Currmot2]"""
+        return self.get_motor_currents_view().copy()
+
+    # #####################################################
+    # ACCESORES (VISTAS DE SÓLO LECTURA)
+    # #####################################################
+    def get_distances_view(self) -> np.ndarray:
+        latest = self._latest
+        return _CEROS_3 if latest is None else self._dist_mm_ro[latest[2]]
+
+    def get_power_info_view(self) -> np.ndarray:
+        latest = self._latest
+        return _CEROS_3 if latest is None else self._frames_ro[latest[2], 3:]
+
+    def get_full_data_view(self) -> np.ndarray:
+        latest = self._latest
+        return _CEROS_6 if latest is None else self._frames_ro[latest[2]]
+
+    def get_motor_currents_view(self) -> np.ndarray:
+        latest = self._latest
+        return _CEROS_2 if latest is None else self._frames_ro[latest[2], 4:6]
+
+    def get_history(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Últimas n tramas en orden cronológico (copias)
+
+        Returns:
+            (seq (n,), instantes de recepción (n,), tramas (n, 6))
+        """
+        latest = self._latest
+        available = min(self.frames_received, self.history_size)
+        n = available if n is None else min(n, available)
+        if latest is None or n == 0:
+            return (np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros((0, N_CAMPOS)))
+        rows = (latest[0] - np.arange(n - 1, -1, -1)) % self.history_size
+        return self._seqs[rows], self._times[rows], self._frames[rows]
+
+    # #####################################################
+    # ESTADO
+    # #####################################################
+    def get_connection_info(self) -> dict:
+        info = self.transport.info()
+        info.update({
+            'frame_format': self.frame_format,
+            'connected': self.is_connected,
+            'data_valid': self.data_valid,
+            'last_data': self.get_full_data_view().tolist() if self.data_valid else None,
+            'background': self.is_running(),
+            'frame_stats': self.get_frame_stats()
+        })
+        return info
+
+    def get_frame_stats(self) -> dict:
+        return {
+            'received': self.frames_received,
+            'dropped': self.frames_dropped,
+            'overwritten': self.frames_overwritten,
+            'history': min(self.frames_received, self.history_size),
+            'last_seq': self.frames_received,
+            'frame_age': self.frame_age(),
+            'malformed': self.parser.malformed,
+            'wrong_count': self.parser.wrong_count,
+            'invalid': self.parser.invalid,
+            'pending_bytes': self.parser.pending
+        }
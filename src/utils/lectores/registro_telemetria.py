@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Telemetry Record & Replay Module
+Grabación de los bytes crudos recibidos del ESP32 y reproducción posterior
+como transporte de TelemetryReceiver (misma interfaz que SensorReader), para
+correr los j_ver_* sin el carrito (benchmarks, perfiles, salidas de campo).
+
+Formato del archivo (little-endian, sólo se agrega al final):
+    cabecera  8 bytes  b'GCTLM\\x00\\x01\\x00'
+    registro  float64  instante monotónico de recepción (s)
+              uint32   longitud N del bloque
+              N bytes  bytes crudos tal como llegaron del puerto
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import os
+import mmap
+import time
+import struct
+from threading import Lock
+from typing import Iterator, Optional, Tuple
+
+from src.utils.lectores.parser_tramas import FORMATO_ASCII
+from src.utils.lectores.receptor_telemetria import TelemetryReceiver
+from src.utils.lectores.transportes import Transport
+
+MAGIC = b'GCTLM\x00\x01\x00'
+REGISTRO = struct.Struct('<dI')
+
+
+class TelemetryRecorder:
+    """
+    Grabador de bytes crudos con marca de tiempo monotónica.
+    Se pasa a TelemetryReceiver/SensorReader(recorder=...) y graba cada
+    bloque recibido.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.records = 0
+        self.bytes_recorded = 0
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'ab')
+        if new_file:
+            self._file.write(MAGIC)
+
+    def record(self, chunk: bytes, t: Optional[float] = None):
+        if t is None:
+            t = time.monotonic()
+        with self.lock:
+            if self._file is None:
+                return
+            self._file.write(REGISTRO.pack(t, len(chunk)))
+            self._file.write(chunk)
+            self.records += 1
+            self.bytes_recorded += len(chunk)
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                print(f"Registro de telemetría cerrado: {self.records} bloques en {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iterate_records(path: str) -> Iterator[Tuple[float, bytes]]:
+    """
+    Recorrer un registro vía mmap sin cargarlo completo en memoria
+
+    Yields:
+        (instante monotónico de recepción, bytes crudos)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} no es un registro de telemetría")
+            offset = len(MAGIC)
+            end = len(mm)
+            while offset + REGISTRO.size <= end:
+                t, n = REGISTRO.unpack_from(mm, offset)
+                offset += REGISTRO.size
+                if offset + n > end:
+                    break  # Registro truncado (corte durante la grabación)
+                yield t, mm[offset:offset + n]
+                offset += n
+
+
+class ReplayTransport(Transport):
+    """
+    Transporte que entrega los bloques de un registro.
+
+    Modos según speed:
+        1.0        tiempo real (respeta los intervalos grabados)
+        k > 0      tiempo escalado (k=2.0 reproduce al doble de velocidad)
+        None o 0   lo más rápido posible: un bloque por lectura
+
+    read_with_time()/read_available_with_time() entregan el instante grabado
+    del último bloque, y now() el reloj del registro (el instante grabado que
+    corresponde a este momento; sin tiempo real, el del último bloque): los
+    filtros con instantes de trama se reproducen igual en cualquier modo.
+    Con loop=True cada vuelta continúa el reloj en lugar de volver atrás.
+    """
+    kind = 'replay'
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, loop: bool = False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.finished = False
+
+        self._records: Optional[Iterator[Tuple[float, bytes]]] = None
+        self._next: Optional[Tuple[float, bytes]] = None
+        self._t0_log = 0.0
+        self._t0_wall = 0.0
+        self._offset = 0.0                  # Desplazamiento del reloj por vuelta (loop)
+        self._last_t: Optional[float] = None  # Instante (ya desplazado) del último bloque
+
+    def open(self) -> bool:
+        self._offset = 0.0
+        self._last_t = None
+        try:
+            self._rewind()
+        except (OSError, ValueError) as e:
+            print(f" Error al abrir registro de telemetría: {e}")
+            return False
+        print(f" Reproduciendo {self.path} (velocidad: {self.speed or 'máxima'})")
+        return True
+
+    def close(self):
+        if self._records is not None:
+            self._records.close()
+        self._records = None
+        self._next = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._records is not None
+
+    def _rewind(self):
+        if self._records is not None:
+            self._records.close()
+            if self._last_t is not None:
+                # Nueva vuelta: el primer bloque sigue al último
+                self._offset = self._last_t - self._t0_log
+        self._records = iterate_records(self.path)
+        self._next = next(self._records, None)
+        self.finished = self._next is None
+        self._t0_log = self._next[0] if self._next else 0.0
+        self._t0_wall = time.monotonic()
+
+    def _pop(self) -> bytes:
+        t, chunk = self._next
+        self._last_t = t + self._offset
+        self._next = next(self._records, None)
+        if self._next is None:
+            if self.loop:
+                self._rewind()
+            else:
+                self.finished = True
+        return chunk
+
+    def _due(self) -> float:
+        """Segundos hasta que corresponde entregar el próximo bloque"""
+        log_now = self._t0_log + (time.monotonic() - self._t0_wall) * self.speed
+        return (self._next[0] - log_now) / self.speed
+
+    def read_available_with_time(self) -> Tuple[bytes, Optional[float]]:
+        if self._next is None:
+            return b'', None
+        if not self.speed:
+            return self._pop(), self._last_t
+        chunks = []
+        while self._next is not None and self._due() <= 0.0:
+            chunks.append(self._pop())
+        # Bloques vencidos juntos: el instante del último, como en una lectura en vivo
+        return b''.join(chunks), self._last_t if chunks else None
+
+    def read_with_time(self, timeout: float) -> Tuple[bytes, Optional[float]]:
+        if self._next is None:
+            time.sleep(timeout)
+            return b'', None
+        if self.speed:
+            wait = self._due()
+            if wait > 0.0:
+                time.sleep(min(wait, timeout))
+        return self.read_available_with_time()
+
+    def read_available(self) -> bytes:
+        return self.read_available_with_time()[0]
+
+    def read(self, timeout: float) -> bytes:
+        return self.read_with_time(timeout)[0]
+
+    def now(self) -> float:
+        """Reloj del registro: instante grabado que corresponde a este momento"""
+        if not self.speed:
+            return self._t0_log + self._offset if self._last_t is None else self._last_t
+        return self._offset + self._t0_log + (time.monotonic() - self._t0_wall) * self.speed
+
+    def info(self) -> dict:
+        return {'transport': self.kind, 'open': self.is_open, 'path': self.path,
+                'speed': self.speed, 'finished': self.finished}
+
+
+class ReplayReader(TelemetryReceiver):
+    """
+    Reproduce un registro con la interfaz de SensorReader (ver ReplayTransport).
+    En modo lo más rápido posible cada lectura entrega la siguiente trama.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, loop: bool = False,
+                 history_size: int = 64, frame_format: str = FORMATO_ASCII):
+        super().__init__(
+            ReplayTransport(path, speed=speed, loop=loop),
+            history_size=history_size,
+            frame_format=frame_format
+        )
+        self.path = path
+        self.speed = speed
+
+    @property
+    def finished(self) -> bool:
+        # Terminado cuando no quedan bloques ni tramas sin entregar
+        return self.transport.finished and self._read_seq == self.frames_received
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Trama binaria de telemetría
+Formato compacto alternativo a la trama ASCII [D1,D2,D3,Vbat,Currmot1,Currmot2].
+
+Estructura (little-endian, 26 bytes):
+    sync      uint16   0x55AA (bytes AA 55)
+    seq       uint16   número de secuencia
+    dist      float32 x3  D1, D2, D3 (cm, igual que la trama ASCII)
+    vbat      float32  tensión de batería (V)
+    curr      int16 x2 corrientes de motor (mA)
+    crc       uint16   CRC16-CCITT (poly 0x1021, init 0xFFFF) de seq..curr
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import struct
+import binascii
+import numpy as np
+from typing import List, Optional, Tuple, Union
+
+SYNC_WORD = 0x55AA
+SYNC_BYTES = struct.pack('<H', SYNC_WORD)
+CRC_INIT = 0xFFFF
+CORRIENTE_ESCALA = 0.001  # mA -> A
+
+FRAME_DTYPE = np.dtype([
+    ('sync', '<u2'),
+    ('seq', '<u2'),
+    ('dist', '<f4', (3,)),
+    ('vbat', '<f4'),
+    ('curr', '<i2', (2,)),
+    ('crc', '<u2'),
+])
+FRAME_SIZE = FRAME_DTYPE.itemsize
+_PAYLOAD = struct.Struct('<H3ffhh')  # seq..curr (cubierto por el CRC)
+
+
+def _crc_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[i] = crc & 0xFFFF
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """CRC16-CCITT de un bloque (binascii.crc_hqx usa el mismo polinomio)"""
+    return binascii.crc_hqx(data, CRC_INIT)
+
+
+def crc16_rows(rows: np.ndarray) -> np.ndarray:
+    """CRC16-CCITT de cada fila de un array (N, L) uint8, vectorizado sobre N"""
+    crc = np.full(rows.shape[0], CRC_INIT, dtype=np.uint16)
+    for j in range(rows.shape[1]):
+        idx = ((crc >> 8) ^ rows[:, j]) & 0xFF
+        crc = (crc << 8) ^ _CRC_TABLE[idx]
+    return crc
+
+
+# #####################################################
+# CODIFICADOR DE REFERENCIA
+# #####################################################
+def encode_frame(seq: int, values) -> bytes:
+    """
+    Codificar una trama binaria
+
+    Args:
+        seq: Número de secuencia (se toma módulo 2^16)
+        values: [D1,D2,D3,Vbat,Currmot1,Currmot2] con corrientes en A
+
+    Returns:
+        bytes de la trama (FRAME_SIZE)
+    """
+    payload = _PAYLOAD.pack(
+        seq & 0xFFFF,
+        float(values[0]), float(values[1]), float(values[2]),
+        float(values[3]),
+        int(round(values[4] / CORRIENTE_ESCALA)),
+        int(round(values[5] / CORRIENTE_ESCALA))
+    )
+    return SYNC_BYTES + payload + struct.pack('<H', crc16(payload))
+
+
+def encode_frames(seqs, values: np.ndarray) -> bytes:
+    """
+    Codificar N tramas de una vez
+
+    Args:
+        seqs: Números de secuencia (N,)
+        values: Array (N, 6) con el mismo formato que encode_frame
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(-1, 6)
+    frames = np.zeros(len(values), dtype=FRAME_DTYPE)
+    frames['sync'] = SYNC_WORD
+    frames['seq'] = np.asarray(seqs, dtype=np.int64) & 0xFFFF
+    frames['dist'] = values[:, :3]
+    frames['vbat'] = values[:, 3]
+    frames['curr'] = np.round(values[:, 4:6] / CORRIENTE_ESCALA)
+    rows = frames.view(np.uint8).reshape(-1, FRAME_SIZE)
+    frames['crc'] = crc16_rows(rows[:, 2:-2])
+    return frames.tobytes()
+
+
+# #####################################################
+# DECODIFICADOR
+# #####################################################
+def decode_frames(data: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decodificar un bloque de tramas contiguas y alineadas
+
+    Args:
+        data: Bytes con un múltiplo de FRAME_SIZE
+
+    Returns:
+        (seq (N,), values (N, 6) float64, ok (N,) bool) donde ok indica
+        sync y CRC correctos
+    """
+    frames = np.frombuffer(data, dtype=FRAME_DTYPE, count=len(data) // FRAME_SIZE)
+    rows = np.frombuffer(data, dtype=np.uint8, count=len(frames) * FRAME_SIZE).reshape(-1, FRAME_SIZE)
+    ok = (frames['sync'] == SYNC_WORD) & (crc16_rows(rows[:, 2:-2]) == frames['crc'])
+
+    values = np.empty((len(frames), 6), dtype=np.float64)
+    values[:, :3] = frames['dist']
+    values[:, 3] = frames['vbat']
+    values[:, 4:6] = frames['curr'] * CORRIENTE_ESCALA
+    return frames['seq'].astype(np.int64), values, ok
+
+
+class BinaryFrameParser:
+    """
+    Parser incremental de tramas binarias con la misma interfaz que
+    AsciiFrameParser. Los bloques alineados se decodifican de una vez con
+    np.frombuffer; ante sync o CRC incorrectos se busca el siguiente sync.
+    """
+
+    def __init__(self, compact_threshold: int = 4096, verbose: bool = True):
+        self.n_fields = 6
+        self.compact_threshold = compact_threshold
+        self.verbose = verbose
+
+        self.buffer = bytearray()
+        self._offset = 0
+
+        self.last_seq: Optional[int] = None
+        self.last_seqs = np.zeros(0, dtype=np.int64)  # Secuencias de la última pasada
+
+        # Contadores
+        self.frames_ok = 0
+        self.malformed = 0    # Sync o CRC incorrectos
+        self.wrong_count = 0  # Se mantiene por compatibilidad con AsciiFrameParser
+        self.invalid = 0      # Tramas con algún valor -1.0 (mismo criterio que AsciiFrameParser)
+        self.seq_gaps = 0     # Tramas perdidas según el número de secuencia
+
+    @property
+    def dropped(self) -> int:
+        return self.malformed + self.wrong_count + self.invalid
+
+    @property
+    def pending(self) -> int:
+        return len(self.buffer) - self._offset
+
+    def feed(self, data: bytes):
+        self.buffer.extend(data)
+
+    def reset(self):
+        self.buffer.clear()
+        self._offset = 0
+        self.last_seq = None
+
+    def parse(self, all_frames: bool = False) -> Union[Optional[np.ndarray], List[np.ndarray]]:
+        buf = self.buffer
+        size = len(buf)
+        pos = self._offset
+        seqs, blocks = [], []
+
+        while True:
+            start = buf.find(SYNC_BYTES, pos)
+            if start == -1:
+                # Conservar un posible primer byte de sync al final
+                pos = size - 1 if size - 1 >= pos and buf[-1] == SYNC_BYTES[0] else size
+                break
+            count = (size - start) // FRAME_SIZE
+            if count == 0:
+                pos = start
+                break
+
+            # Copia del bloque alineado: el bytearray debe poder redimensionarse luego
+            seq, values, ok = decode_frames(bytes(buf[start:start + count * FRAME_SIZE]))
+            n_ok = count if ok.all() else int(np.argmin(ok))
+            if n_ok:
+                seqs.append(seq[:n_ok])
+                blocks.append(values[:n_ok])
+            pos = start + n_ok * FRAME_SIZE
+            if n_ok < count:
+                self._error('malformed', f" Trama binaria con sync/CRC inválido en offset {pos}")
+                pos += 1  # Re-sincronizar en el siguiente sync
+
+        if pos >= size:
+            buf.clear()
+            pos = 0
+        elif pos >= self.compact_threshold:
+            del buf[:pos]
+            pos = 0
+        self._offset = pos
+
+        if not blocks:
+            self.last_seqs = np.zeros(0, dtype=np.int64)
+            return [] if all_frames else None
+
+        seq = np.concatenate(seqs)
+        values = np.concatenate(blocks)
+        self._track_sequence(seq)
+
+        valid = ~np.any(values == -1.0, axis=1)
+        n_invalid = len(valid) - int(valid.sum())
+        if n_invalid:
+            self._error('invalid', "Valor inválido (-1.0) detectado en los datos del sensor", n_invalid)
+            seq, values = seq[valid], values[valid]
+
+        self.last_seqs = seq
+        self.frames_ok += len(values)
+        if all_frames:
+            return list(values)
+        return values[-1] if len(values) else None
+
+    def _track_sequence(self, seq: np.ndarray):
+        prev = np.empty(len(seq), dtype=np.int64)
+        prev[0] = seq[0] - 1 if self.last_seq is None else self.last_seq
+        prev[1:] = seq[:-1]
+        gaps = ((seq - prev - 1) & 0xFFFF)
+        self.seq_gaps += int(gaps.sum())
+        self.last_seq = int(seq[-1])
+
+    def _error(self, counter: str, message: str, n: int = 1):
+        setattr(self, counter, getattr(self, counter) + n)
+        if self.verbose:
+            print(message)
+
+    def get_stats(self) -> dict:
+        return {
+            'ok': self.frames_ok,
+            'malformed': self.malformed,
+            'wrong_count': self.wrong_count,
+            'invalid': self.invalid,
+            'seq_gaps': self.seq_gaps,
+            'pending_bytes': self.pending
+        }
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Telemetry Transports Module
+Fuentes de bytes intercambiables para TelemetryReceiver.
+
+Todas exponen la misma interfaz:
+    open() -> bool, close(), is_open
+    read(timeout) -> bytes        bloquea hasta timeout si no hay datos
+    read_available() -> bytes     no bloquea; b'' si no hay nada pendiente
+    read_with_time(timeout), read_available_with_time()
+                                  (bytes, instante de recepción o None = ahora)
+    now() -> float                reloj de esos instantes (time.monotonic())
+    fileno() -> int               descriptor para select/asyncio (si existe)
+
+Los transportes "push" (push = True) no se leen: entregan los bytes a la
+función registrada con set_callback() desde su propio hilo.
+
+La reproducción de registros (ReplayTransport) está en registro_telemetria.py.
+
+Author: Sistema UWB Carrito de Golf
+Date: July 2025
+"""
+
+import os
+import pty
+import tty
+import time
+import errno
+import select
+import socket
+import serial
+from typing import Callable, Optional, Tuple
+
+CHUNK_SIZE = 4096
+
+
+class Transport:
+    """Interfaz común de los transportes"""
+    kind = 'base'
+    push = False
+
+    def open(self) -> bool:
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    @property
+    def is_open(self) -> bool:
+        raise NotImplementedError
+
+    def read(self, timeout: float) -> bytes:
+        raise NotImplementedError
+
+    def read_available(self) -> bytes:
+        raise NotImplementedError
+
+    # Los transportes en vivo no conocen el instante de llegada mejor que el
+    # receptor: None = time.monotonic() al ingresar el bloque. La
+    # reproducción entrega el instante grabado (ver ReplayTransport)
+    def read_with_time(self, timeout: float) -> Tuple[bytes, Optional[float]]:
+        return self.read(timeout), None
+
+    def read_available_with_time(self) -> Tuple[bytes, Optional[float]]:
+        return self.read_available(), None
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def fileno(self) -> int:
+        raise OSError(f"El transporte {self.kind} no tiene descriptor")
+
+    def info(self) -> dict:
+        return {'transport': self.kind, 'open': self.is_open}
+
+
+# #####################################################
+# PYSERIAL
+# #####################################################
+class SerialTransport(Transport):
+    kind = 'serial'
+
+    def __init__(self, port: str = '/dev/ttyAMA0', baudrate: int = 2000000, timeout: float = 1.0):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.serial_conn: Optional[serial.Serial] = None
+
+    def open(self) -> bool:
+        try:
+            self.serial_conn = serial.Serial(
+                port=self.port,
+                baudrate=self.baudrate,
+                timeout=self.timeout,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                bytesize=serial.EIGHTBITS
+            )
+            print(f" UART conectado a {self.port} @ {self.baudrate} bps")
+            return self.serial_conn.is_open
+        except Exception as e:
+            print(f" Error al conectar UART: {e}")
+            self.serial_conn = None
+            return False
+
+    def close(self):
+        if self.serial_conn and self.serial_conn.is_open:
+            self.serial_conn.close()
+            print(" UART desconectado")
+        self.serial_conn = None
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.serial_conn and self.serial_conn.is_open)
+
+    def read(self, timeout: float) -> bytes:
+        # El timeout efectivo es el configurado en serial.Serial
+        conn = self.serial_conn
+        return conn.read(conn.in_waiting or 1)
+
+    def read_available(self) -> bytes:
+        conn = self.serial_conn
+        n = conn.in_waiting
+        return conn.read(n) if n > 0 else b''
+
+    def fileno(self) -> int:
+        return self.serial_conn.fileno()
+
+    def info(self) -> dict:
+        return {'transport': self.kind, 'open': self.is_open,
+                'port': self.port, 'baudrate': self.baudrate}
+
+
+# #####################################################
+# DESCRIPTOR NO BLOQUEANTE (BASE DE PTY Y SOCKET)
+# #####################################################
+class _FdTransport(Transport):
+    _eof_on_empty = False  # recv() == b'' significa que el otro extremo cerró
+
+    def __init__(self):
+        self._fd: Optional[int] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._fd is not None
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def _read_fd(self) -> bytes:
+        # Lectura no bloqueante; b'' si no hay datos. Cierra si el otro extremo se fue
+        try:
+            data = self._recv(CHUNK_SIZE)
+        except BlockingIOError:
+            return b''
+        except OSError as e:
+            if e.errno == errno.EIO:  # pty sin extremo esclavo abierto
+                return b''
+            raise
+        if data == b'' and self._eof_on_empty:
+            self.close()
+        return data
+
+    def _recv(self, n: int) -> bytes:
+        return os.read(self._fd, n)
+
+    def read(self, timeout: float) -> bytes:
+        fd = self._fd
+        if fd is None:
+            return b''
+        ready, _, _ = select.select([fd], [], [], timeout)
+        return self._read_fd() if ready else b''
+
+    def read_available(self) -> bytes:
+        chunks = []
+        while self._fd is not None:
+            data = self._read_fd()
+            if not data:
+                break
+            chunks.append(data)
+        return b''.join(chunks)
+
+
+# #####################################################
+# PTY
+# #####################################################
+class PtyTransport(_FdTransport):
+    """
+    Lee de un pseudo-terminal.
+    Sin path crea un par pty nuevo: el receptor lee del maestro y el
+    simulador (o un puente como socat) escribe en peer_name.
+    Con path abre un dispositivo tty existente en modo raw.
+    """
+    kind = 'pty'
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        self.path = path
+        self.peer_name: Optional[str] = None
+        self._peer_fd: Optional[int] = None
+
+    def open(self) -> bool:
+        try:
+            if self.path is None:
+                master, slave = pty.openpty()
+                tty.setraw(slave)
+                self._fd, self._peer_fd = master, slave
+                self.peer_name = os.ttyname(slave)
+            else:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_NOCTTY)
+                tty.setraw(self._fd)
+            os.set_blocking(self._fd, False)
+            return True
+        except OSError as e:
+            print(f" Error al abrir pty: {e}")
+            self._fd = None
+            return False
+
+    def close(self):
+        for fd in (self._fd, self._peer_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._peer_fd = None
+
+    def info(self) -> dict:
+        return {'transport': self.kind, 'open': self.is_open,
+                'path': self.path, 'peer': self.peer_name}
+
+
+# #####################################################
+# SOCKET UNIX
+# #####################################################
+class UnixSocketTransport(_FdTransport):
+    """Lee de un socket Unix de tipo stream (p. ej. un puente o simulador local)"""
+    kind = 'unix'
+    _eof_on_empty = True
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+
+    def open(self) -> bool:
+        try:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(self.path)
+            self._sock.setblocking(False)
+            self._fd = self._sock.fileno()
+            return True
+        except OSError as e:
+            print(f" Error al conectar socket {self.path}: {e}")
+            self._sock = None
+            self._fd = None
+            return False
+
+    def _recv(self, n: int) -> bytes:
+        return self._sock.recv(n)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._fd = None
+
+    def info(self) -> dict:
+        return {'transport': self.kind, 'open': self.is_open, 'path': self.path}
+
+
+# #####################################################
+# PUERTO COMPARTIDO (PUSH)
+# #####################################################
+class SharedPortTransport(Transport):
+    """Cliente de SharedSerialPort: los bytes llegan desde su hilo lector"""
+    kind = 'shared'
+    push = True
+
+    def __init__(self, shared_port):
+        self.shared_port = shared_port
+        self._callback: Optional[Callable[[bytes], None]] = None
+        self._opened = False
+
+    def open(self) -> bool:
+        self._opened = self.shared_port.open()
+        if self._opened:
+            print(f" UART (compartido) conectado a {self.shared_port.port}")
+        return self._opened
+
+    def set_callback(self, callback: Callable[[bytes], None]):
+        self._callback = callback
+        self.shared_port.subscribe(callback)
+
+    def close(self):
+        if self._callback is not None:
+            self.shared_port.unsubscribe(self._callback)
+            self._callback = None
+        if self._opened:
+            self.shared_port.close()
+            self._opened = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened and self.shared_port.is_open
+
+    def read(self, timeout: float) -> bytes:
+        return b''
+
+    def read_available(self) -> bytes:
+        return b''
+
+    def info(self) -> dict:
+        return {'transport': self.kind, 'open': self.is_open,
+                'port': self.shared_port.port, 'baudrate': self.shared_port.baudrate}
+
+
+def create_transport(kind: str, **kwargs) -> Transport:
+    """
+    Crear un transporte por nombre
+
+    Args:
+        kind: 'serial', 'pty', 'unix', 'shared' o 'replay'
+        kwargs: Argumentos del constructor correspondiente
+    """
+    if kind == 'serial':
+        return SerialTransport(**kwargs)
+    if kind == 'pty':
+        return PtyTransport(**kwargs)
+    if kind == 'unix':
+        return UnixSocketTransport(**kwargs)
+    if kind == 'shared':
+        return SharedPortTransport(**kwargs)
+    if kind == 'replay':
+        from src.utils.lectores.registro_telemetria import ReplayTransport
+        return ReplayTransport(**kwargs)
+    raise ValueError(f"Transporte desconocido: {kind}")
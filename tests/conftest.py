@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Los módulos se importan como src.* desde la raíz del repositorio
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import numpy as np
+
+# #####################################################
+# GEOMETRÍAS COMPARTIDAS (from conftest import ...)
+# #####################################################
+# Cuatro anchors no coplanares y tres coplanares. Ninguno en el origen:
+# scipy arranca en [0, 0, 0] y ahí no avanza si coincide con un anchor
+ANCHORS_4 = np.array([[280, 0, 0], [-280, 0, 0], [0, 200, 500], [0, -300, 900]], dtype=np.float64)
+ANCHORS_3 = np.array([[-2000, 0, 0], [2000, 0, 0], [0, 3000, 0]], dtype=np.float64)
+
+# Seis anchors repartidos en una sala y un tag dentro
+ANCHORS_6 = np.array([
+    [0, 0, 0], [6000, 0, 300], [0, 6000, 600],
+    [6000, 6000, 0], [3000, -1000, 2000], [-1000, 3000, 1500]
+], dtype=np.float64)
+PUNTO_6 = np.array([2500.0, 3200.0, 900.0])
+
+
+def distancias(punto, anchors, ruido=0.0, semilla=0):
+    """Distancias exactas del punto a cada anchor, más ruido gaussiano opcional"""
+    rng = np.random.default_rng(semilla)
+    return np.linalg.norm(anchors - punto, axis=1) + rng.normal(0.0, ruido, len(anchors))
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import numpy as np
+
+from src.utils.controladores.motor_async import AsyncMotorController
+from src.utils.lectores.receptor_async import AsyncTelemetryReceiver
+from src.utils.lectores.transportes import PtyTransport
+
+
+async def _leer_peer(transporte, n, timeout=2.0):
+    """Leer n bytes del extremo esclavo (lo que escribió el controlador)"""
+    loop = asyncio.get_running_loop()
+    datos = b''
+    limite = loop.time() + timeout
+    os.set_blocking(transporte._peer_fd, False)
+    while len(datos) < n and loop.time() < limite:
+        try:
+            datos += os.read(transporte._peer_fd, n - len(datos))
+        except BlockingIOError:
+            await asyncio.sleep(0.005)
+    return datos
+
+
+def test_next_frame_despierta_con_cada_trama():
+    async def escenario():
+        transporte = PtyTransport()
+        receptor = AsyncTelemetryReceiver(transporte)
+        assert await receptor.connect()
+        extremo = os.open(transporte.peer_name, os.O_WRONLY | os.O_NOCTTY)
+        try:
+            # Sin tramas vence el timeout
+            assert await receptor.next_frame(timeout=0.05) is None
+
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.02, os.write, extremo, b'[1,2,3,12.0,0.1,0.2]\n')
+            trama = await receptor.next_frame(timeout=1.0)
+            np.testing.assert_array_equal(trama, [1, 2, 3, 12.0, 0.1, 0.2])
+            assert trama.flags.writeable
+
+            # Varias tramas juntas: se entrega la más reciente
+            os.write(extremo, b'[4,5,6,12,0,0]\n[7,8,9,12,0,0]\n')
+            trama = await receptor.next_frame(timeout=1.0)
+            np.testing.assert_array_equal(trama[:3], [7, 8, 9])
+            assert receptor.frames_received == 3
+            np.testing.assert_array_equal(receptor.get_distances(), [70.0, 80.0, 90.0])
+        finally:
+            os.close(extremo)
+            await receptor.disconnect()
+        # Cerrado, la iteración termina
+        assert await receptor.next_frame(timeout=0.05) is None
+
+    asyncio.run(escenario())
+
+
+def test_iteracion_asincrona():
+    async def escenario():
+        transporte = PtyTransport()
+        receptor = AsyncTelemetryReceiver(transporte)
+        assert await receptor.connect()
+        extremo = os.open(transporte.peer_name, os.O_WRONLY | os.O_NOCTTY)
+
+        async def emisor():
+            for i in range(3):
+                os.write(extremo, f'[{i},{i},{i},12,0,0]\n'.encode())
+                await asyncio.sleep(0.02)
+            await asyncio.sleep(0.02)
+            await receptor.disconnect()
+
+        tarea = asyncio.create_task(emisor())
+        primeros = [int(trama[0]) async for trama in receptor]
+        await tarea
+        os.close(extremo)
+        return primeros
+
+    assert asyncio.run(escenario()) == [0, 1, 2]
+
+
+def test_motor_async_el_ultimo_comando_gana():
+    async def escenario():
+        transporte = PtyTransport()
+        controlador = AsyncMotorController(transport=transporte, protocol='ascii')
+        assert await controlador.connect()
+        assert await controlador.wait_sent(timeout=1.0)
+        assert await _leer_peer(transporte, 5) == b'M0,0\n'
+
+        # Sin ceder el control al loop, los comandos se reemplazan en el buzón
+        controlador.send_motor_command(10, 10, smooth=False)
+        controlador.send_motor_command(20, -20, smooth=False)
+        assert await controlador.send(30, -30, smooth=False)
+        assert await _leer_peer(transporte, 8) == b'M30,-30\n'
+        assert controlador.commands_coalesced == 2
+
+        controlador.send_motor_command(40, 40, smooth=False)
+        assert controlador.emergency_stop()
+        assert await controlador.wait_sent(timeout=1.0)
+        assert await _leer_peer(transporte, 2) == b'E\n'
+
+        await controlador.disconnect()
+        assert not transporte.is_open   # Lo abrió el controlador: lo cierra al desconectar
+
+    asyncio.run(escenario())
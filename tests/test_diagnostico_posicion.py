@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from src.utils.auxiliares.diagnostico_posicion import (
+    CALIDAD_BUENA, CALIDAD_DEGRADADA, CALIDAD_INVALIDA, diagnosticar
+)
+from src.utils.auxiliares.error_metricas import calcular_error_promedio
+from src.utils.auxiliares.geometria_anchors import calcular_gdop
+from src.utils.auxiliares.trilateracion import resolver_gauss_newton
+
+from conftest import ANCHORS_6 as ANCHORS, PUNTO_6 as PUNTO, distancias
+
+
+def test_coincide_con_el_calculo_directo():
+    d = distancias(PUNTO, ANCHORS, ruido=20.0)
+    posicion = PUNTO + [5.0, -3.0, 8.0]
+    diagnostico = diagnosticar(posicion, d, ANCHORS, sigma=20.0)
+
+    diff = posicion - ANCHORS
+    J = diff / np.linalg.norm(diff, axis=1)[:, None]
+    inversa = np.linalg.inv(J.T @ J)
+    residuos = np.linalg.norm(diff, axis=1) - d
+    sigma2 = max(400.0, residuos @ residuos / (len(d) - 3))
+
+    np.testing.assert_allclose(diagnostico.residuos, residuos)
+    np.testing.assert_allclose(diagnostico.covarianza, sigma2 * inversa, rtol=1e-9)
+    assert diagnostico.gdop == pytest.approx(calcular_gdop(posicion, ANCHORS))
+    assert diagnostico.incertidumbre == pytest.approx(np.sqrt(np.trace(diagnostico.covarianza)))
+    assert diagnostico.error_promedio == pytest.approx(calcular_error_promedio(posicion, d, ANCHORS))
+    assert diagnostico.calidad == CALIDAD_BUENA
+
+
+def test_usa_los_arrays_del_solver_sin_recalcular():
+    d = distancias(PUNTO, ANCHORS, ruido=20.0)
+    posicion = resolver_gauss_newton(d, ANCHORS)[0]
+    diff = posicion - ANCHORS
+    rangos = np.linalg.norm(diff, axis=1)
+    con_arrays = diagnosticar(posicion, d, ANCHORS, diff=diff, rangos=rangos, residuos=rangos - d)
+    sin_arrays = diagnosticar(posicion, d, ANCHORS)
+    np.testing.assert_allclose(con_arrays.covarianza, sin_arrays.covarianza)
+    assert con_arrays.calidad == sin_arrays.calidad
+
+
+def test_covarianza_predice_la_dispersion_del_solver():
+    rng = np.random.default_rng(3)
+    sigma = 20.0
+    soluciones = np.array([
+        resolver_gauss_newton(distancias(PUNTO, ANCHORS) + rng.normal(0.0, sigma, len(ANCHORS)),
+                              ANCHORS)[0]
+        for _ in range(400)
+    ])
+    empirica = np.cov(soluciones.T)
+    prevista = diagnosticar(PUNTO, distancias(PUNTO, ANCHORS), ANCHORS, sigma=sigma).covarianza
+    np.testing.assert_allclose(np.diag(empirica), np.diag(prevista), rtol=0.25)
+
+
+def test_calidad_degradada():
+    d = distancias(PUNTO, ANCHORS)
+    assert diagnosticar(PUNTO, d, ANCHORS, convergido=False).calidad == CALIDAD_DEGRADADA
+    assert diagnosticar(PUNTO, d, ANCHORS, gdop_maximo=0.1).calidad == CALIDAD_DEGRADADA
+    assert diagnosticar(PUNTO, d, ANCHORS, incertidumbre_maxima=1.0).calidad == CALIDAD_DEGRADADA
+    activos = np.ones(len(ANCHORS), dtype=bool)
+    activos[2] = False
+    diagnostico = diagnosticar(PUNTO, d, ANCHORS, activos=activos)
+    assert diagnostico.calidad == CALIDAD_DEGRADADA
+    assert len(diagnostico.residuos) == len(ANCHORS)
+
+
+def test_calidad_invalida():
+    colineales = np.array([[0, 0, 0], [1000, 0, 0], [2000, 0, 0]], dtype=np.float64)
+    punto = np.array([500.0, 0.0, 0.0])
+    diagnostico = diagnosticar(punto, np.linalg.norm(colineales - punto, axis=1), colineales)
+    assert diagnostico.calidad == CALIDAD_INVALIDA
+    assert diagnostico.gdop == np.inf
+
+    diagnostico = diagnosticar(np.full(3, np.nan), distancias(PUNTO, ANCHORS), ANCHORS)
+    assert diagnostico.calidad == CALIDAD_INVALIDA
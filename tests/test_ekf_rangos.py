@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.utils.auxiliares.ekf_rangos import RangeEKF
+
+from conftest import ANCHORS_3, ANCHORS_4, distancias
+
+# Coplanares en z = 500: el plano no pasa por el origen
+ANCHORS_ELEVADOS = ANCHORS_3 + [0.0, 0.0, 500.0]
+
+
+def test_sigue_un_tag_a_velocidad_constante():
+    rng = np.random.default_rng(0)
+    ekf = RangeEKF(ANCHORS_4, sigma_distancia=5.0)
+    inicio, velocidad, dt = np.array([1500.0, -800.0, 900.0]), np.array([400.0, 300.0, 0.0]), 0.05
+    for i in range(100):
+        punto = inicio + velocidad * dt * i
+        ekf.actualizar(distancias(punto, ANCHORS_4) + rng.normal(0.0, 5.0, 4), instante=dt * i)
+    assert np.linalg.norm(ekf.posicion - punto) < 50.0
+    np.testing.assert_allclose(ekf.velocidad, velocidad, atol=100.0)
+    adelantada = ekf.posicion_en(ekf.instante + 0.1)
+    np.testing.assert_allclose(adelantada, ekf.posicion + 0.1 * ekf.velocidad)
+
+
+def test_posicion_en_sin_instantes():
+    ekf = RangeEKF(ANCHORS_4)
+    np.testing.assert_array_equal(ekf.posicion_en(1.0), np.zeros(3))
+    ekf.actualizar(distancias(np.array([300.0, 200.0, 400.0]), ANCHORS_4), instante=5.0)
+    np.testing.assert_array_equal(ekf.posicion_en(None), ekf.posicion)
+    ekf.reiniciar()
+    np.testing.assert_array_equal(ekf.posicion_en(6.0), ekf.posicion)
+
+
+def _ekf_en(estado, P):
+    ekf = RangeEKF(ANCHORS_ELEVADOS)
+    ekf.inicializar(distancias(estado[:3], ANCHORS_ELEVADOS), instante=0.0)
+    ekf.x, ekf.P = estado.copy(), P.copy()
+    return ekf
+
+
+def test_refleja_respecto_del_plano_de_los_anchors():
+    punto = np.array([500.0, 1000.0, 1300.0])
+    d = distancias(punto, ANCHORS_ELEVADOS)
+    espejo = punto * [1.0, 1.0, -1.0] + [0.0, 0.0, 1000.0]   # z = 500 - 800
+    M = np.kron(np.eye(2), np.diag([1.0, 1.0, -1.0]))
+    rng = np.random.default_rng(1)
+    A = rng.normal(size=(6, 6))
+    P = A @ A.T + np.diag([400.0] * 3 + [100.0] * 3)
+
+    # Estado caído del otro lado del plano: las distancias no lo corrigen y se refleja
+    reflejado = _ekf_en(np.concatenate([espejo, [10.0, 20.0, -30.0]]), P)
+    posicion = reflejado.actualizar(d, instante=0.0)
+    np.testing.assert_allclose(posicion, punto, atol=1e-6)
+    np.testing.assert_allclose(reflejado.velocidad, [10.0, 20.0, 30.0], atol=1e-6)
+
+    # Igual a corregir desde el estado ya reflejado (la medida es simétrica respecto del plano)
+    directo = _ekf_en(np.concatenate([punto, [10.0, 20.0, 30.0]]), M @ P @ M)
+    directo.actualizar(d, instante=0.0)
+    np.testing.assert_allclose(reflejado.x, directo.x, atol=1e-6)
+    np.testing.assert_allclose(reflejado.P, directo.P, rtol=1e-9, atol=1e-9)
+
+
+def test_se_reinicia_tras_un_hueco_largo():
+    ekf = RangeEKF(ANCHORS_4, dt_maximo=0.5)
+    ekf.actualizar(distancias(np.array([300.0, 200.0, 400.0]), ANCHORS_4), instante=0.0)
+    nuevo = np.array([-2500.0, 3000.0, 1200.0])
+    posicion = ekf.actualizar(distancias(nuevo, ANCHORS_4), instante=2.0)
+    np.testing.assert_allclose(posicion, nuevo, atol=1e-6)
+    np.testing.assert_array_equal(ekf.velocidad, np.zeros(3))
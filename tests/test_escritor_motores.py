@@ -0,0 +1,111 @@
+import os
+import pty
+import select
+import time
+import tty
+import pytest
+
+from src.utils.controladores.uart_motor_controller import UARTMotorController
+
+
+def _leer_disponible(fd, espera=0.1):
+    """Leer todo lo que el controlador escribió hasta que el pty quede quieto"""
+    datos = b''
+    while True:
+        listos, _, _ = select.select([fd], [], [], espera)
+        if not listos:
+            return datos
+        datos += os.read(fd, 4096)
+
+
+@pytest.fixture
+def controlador():
+    maestro, esclavo = pty.openpty()
+    tty.setraw(esclavo)
+    tty.setraw(maestro)
+    controlador = UARTMotorController(port=os.ttyname(esclavo), baudrate=115200, timeout=0.1,
+                                      background=True, repeat_interval=0.5, protocol='ascii')
+    assert controlador.connect()
+    assert controlador.wait_sent(timeout=1.0)
+    assert _leer_disponible(maestro) == b'M0,0\n'   # Parada inicial
+    yield maestro, controlador
+    controlador.disconnect()
+    os.close(maestro)
+    os.close(esclavo)
+
+
+def test_el_ultimo_comando_gana(controlador):
+    maestro, controlador = controlador
+    # Retener el hilo escritor mientras se acumulan comandos en el buzón
+    with controlador._writer_cond:
+        for velocidad in (10, 20, 30):
+            assert controlador.send_motor_command(velocidad, -velocidad, smooth=False)
+    assert controlador.wait_sent(timeout=1.0)
+
+    assert _leer_disponible(maestro) == b'M30,-30\n'
+    info = controlador.get_connection_info()
+    assert info['background']
+    assert info['commands_coalesced'] == 2
+    assert list(controlador.get_current_speeds_array()) == [30, -30]
+
+
+def test_comando_identico_no_se_reenvia_antes_del_intervalo(controlador):
+    maestro, controlador = controlador
+    controlador.send_motor_command(50, 50, smooth=False)
+    assert controlador.wait_sent(timeout=1.0)
+    controlador.send_motor_command(50, 50, smooth=False)
+    assert controlador.wait_sent(timeout=1.0)
+
+    assert _leer_disponible(maestro) == b'M50,50\n'
+    assert controlador.commands_skipped == 1
+
+
+def test_emergencia_descarta_el_comando_pendiente(controlador):
+    maestro, controlador = controlador
+    with controlador._writer_cond:
+        controlador.send_motor_command(100, 100, smooth=False)
+        assert controlador.emergency_stop()
+    assert controlador.wait_sent(timeout=1.0)
+
+    assert _leer_disponible(maestro) == b'E\n'
+    assert controlador.get_current_command().left_speed == 0
+
+
+def test_emergencia_entre_buzon_y_estado(controlador, monkeypatch):
+    maestro, controlador = controlador
+    notificar = controlador._writer_cond.notify
+    interrumpido = []
+
+    def notificar_con_parada(*args):
+        # La parada llega justo cuando send_motor_command deja el comando en el buzón
+        if not interrumpido:
+            interrumpido.append(True)
+            controlador.emergency_stop()
+        notificar(*args)
+
+    monkeypatch.setattr(controlador._writer_cond, 'notify', notificar_con_parada)
+    with controlador._writer_cond:
+        assert controlador.send_motor_command(100, 100, smooth=False)
+    assert controlador.wait_sent(timeout=1.0)
+
+    assert _leer_disponible(maestro) == b'E\n'
+    assert controlador.get_current_command().left_speed == 0
+    assert list(controlador.get_current_speeds_array()) == [0, 0]
+
+
+def test_sin_hilo_envia_en_cada_llamada():
+    maestro, esclavo = pty.openpty()
+    tty.setraw(esclavo)
+    tty.setraw(maestro)
+    controlador = UARTMotorController(port=os.ttyname(esclavo), baudrate=115200, timeout=0.1,
+                                      background=False, protocol='ascii')
+    try:
+        assert controlador.connect()
+        controlador.send_motor_command(10, 10, smooth=False)
+        controlador.send_motor_command(10, 10, smooth=False)
+        assert not controlador.get_connection_info()['background']
+        assert _leer_disponible(maestro) == b'M0,0\nM10,10\nM10,10\n'
+    finally:
+        controlador.disconnect()
+        os.close(maestro)
+        os.close(esclavo)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.utils.auxiliares.filtro_media_movil import BancoMediaMovil, FiltroMediaMovil
+
+
+def _muestras(pasos, canales, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return rng.uniform(500, 5000, canales) + rng.normal(0.0, 30.0, (pasos, canales))
+
+
+def _medias_deque(filtro, valores, canales):
+    return np.array([filtro.filtrar(f"tag_{c}", v) for c, v in zip(canales, valores)])
+
+
+@pytest.mark.parametrize('ventana', [1, 3, 5, 8])
+def test_canales_sincronizados_igual_a_deque(ventana):
+    banco = BancoMediaMovil(4, tamaño_ventana=ventana)
+    filtro = FiltroMediaMovil(tamaño_ventana=ventana)
+    # Las primeras filas cubren el arranque con la ventana incompleta
+    for fila in _muestras(40, 4):
+        np.testing.assert_allclose(banco.filtrar(fila), _medias_deque(filtro, fila, range(4)), rtol=1e-12)
+
+
+def test_subconjuntos_de_canales_igual_a_deque():
+    rng = np.random.default_rng(1)
+    banco = BancoMediaMovil(6, tamaño_ventana=5)
+    filtro = FiltroMediaMovil(tamaño_ventana=5)
+    for fila in _muestras(60, 6, semilla=2):
+        canales = np.flatnonzero(rng.random(6) < 0.6)
+        medias = banco.filtrar(fila[canales], canales=canales)
+        np.testing.assert_allclose(medias, _medias_deque(filtro, fila[canales], canales), rtol=1e-12)
+    # Luego todos juntos otra vez (posiciones por canal)
+    fila = _muestras(1, 6, semilla=3)[0]
+    np.testing.assert_allclose(banco.filtrar(fila), _medias_deque(filtro, fila, range(6)), rtol=1e-12)
+
+
+def test_resuma_periodica_acota_la_deriva():
+    # Saltos grandes de magnitud: sin re-suma la suma acumulada arrastra redondeo
+    rng = np.random.default_rng(4)
+    muestras = rng.choice([1e-3, 1e12], size=(5000, 2)) * rng.random((5000, 2))
+    banco = BancoMediaMovil(2, tamaño_ventana=4, resumar_cada=64)
+    filtro = FiltroMediaMovil(tamaño_ventana=4)
+    for fila in muestras:
+        np.testing.assert_allclose(banco.filtrar(fila), _medias_deque(filtro, fila, range(2)),
+                                   rtol=1e-9, atol=1e-3)
+    # Tras la re-suma la suma acumulada es exactamente la del buffer
+    assert banco._actualizaciones == len(muestras) % 64
+    banco.resumar_cada = 1
+    banco.filtrar([1.0, 2.0])
+    np.testing.assert_array_equal(banco._suma, banco._buffer.sum(axis=0))
+
+
+def test_reiniciar_y_ampliar():
+    banco = BancoMediaMovil(2, tamaño_ventana=3)
+    for fila in _muestras(5, 2):
+        banco.filtrar(fila)
+    banco.reiniciar([0])
+    np.testing.assert_allclose(banco.filtrar([10.0, 20.0], canales=[0, 1])[0], 10.0)
+
+    banco.ampliar(3)
+    assert banco.canales == 3
+    np.testing.assert_allclose(banco.filtrar([7.0], canales=[2]), [7.0])
+    banco.reiniciar()
+    np.testing.assert_allclose(banco.filtrar([1.0, 2.0, 3.0]), [1.0, 2.0, 3.0])
+
+
+def test_ventana_de_tiempo_acotada():
+    filtro = FiltroMediaMovil(tamaño_ventana=5, dt_nominal=0.1)
+    # Instantes repetidos (p. ej. reproducción): nunca salen por tiempo
+    for i in range(1000):
+        media = filtro.filtrar('tag', float(i), instante=0.0)
+    ventana = filtro.ventanas_tiempo['tag']
+    assert len(ventana) == ventana.maxlen == 20
+    assert media == pytest.approx(sum(range(980, 1000)) / 20)
+
+
+def test_ventana_de_tiempo_al_periodo_nominal_igual_a_muestras():
+    por_tiempo = FiltroMediaMovil(tamaño_ventana=5, dt_nominal=0.1)
+    por_muestras = FiltroMediaMovil(tamaño_ventana=5)
+    for i, valor in enumerate(_muestras(30, 1)[:, 0]):
+        assert por_tiempo.filtrar('a', valor, instante=0.1 * i) == pytest.approx(por_muestras.filtrar('a', valor))
@@ -0,0 +1,73 @@
+import os
+import time
+import numpy as np
+import pytest
+
+from src.utils.lectores.receptor_telemetria import TelemetryReceiver
+from src.utils.lectores.transportes import PtyTransport
+
+
+def _esperar(condicion, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        valor = condicion()
+        if valor is not None:
+            return valor
+        time.sleep(0.005)
+    return condicion()
+
+
+@pytest.fixture
+def receptor():
+    transporte = PtyTransport()
+    receptor = TelemetryReceiver(transporte, background=False, history_size=4)
+    assert receptor.connect()
+    extremo = os.open(transporte.peer_name, os.O_WRONLY | os.O_NOCTTY)
+    yield extremo, receptor
+    os.close(extremo)
+    receptor.disconnect()
+
+
+def test_sin_tramas(receptor):
+    _, receptor = receptor
+    assert receptor.read_if_new() is None
+    assert receptor.frame_age() is None
+    assert receptor.last_frame_info() == (0, None)
+
+
+def test_read_if_new_entrega_cada_trama_una_sola_vez(receptor):
+    extremo, receptor = receptor
+    antes = time.monotonic()
+    os.write(extremo, b'[1,2,3,12.0,0.1,0.2]\n')
+    trama = _esperar(receptor.read_if_new)
+    np.testing.assert_array_equal(trama, [1, 2, 3, 12.0, 0.1, 0.2])
+    assert receptor.read_if_new() is None
+    # read_data sigue entregando la última aunque ya se haya leído
+    np.testing.assert_array_equal(receptor.read_data(), trama)
+
+    seq, instante = receptor.last_frame_info()
+    assert seq == 1
+    assert antes <= instante <= time.monotonic()
+    edad = receptor.frame_age()
+    time.sleep(0.02)
+    assert receptor.frame_age() >= edad + 0.02
+
+    os.write(extremo, b'[4,5,6,12.0,0.1,0.2]\n')
+    trama = _esperar(receptor.read_if_new)
+    np.testing.assert_array_equal(trama, [4, 5, 6, 12.0, 0.1, 0.2])
+    assert receptor.last_frame_info()[0] == 2
+
+
+def test_tramas_no_leidas_cuentan_como_sobrescritas(receptor):
+    extremo, receptor = receptor
+    os.write(extremo, b'[1,1,1,12,0,0]\n[2,2,2,12,0,0]\n[3,3,3,12,0,0]\n')
+    # Las tres llegan en un solo bloque y se publican antes de leer
+    assert _esperar(lambda: True if receptor._poll() and receptor.frames_received == 3 else None)
+    np.testing.assert_array_equal(receptor.read_if_new()[:3], [3, 3, 3])
+    assert receptor.get_frame_stats()['overwritten'] == 2
+    np.testing.assert_array_equal(receptor.get_distances(), [30.0, 30.0, 30.0])
+
+    seqs, instantes, tramas = receptor.get_history()
+    np.testing.assert_array_equal(seqs, [1, 2, 3])
+    assert np.all(np.diff(instantes) >= 0)
+    np.testing.assert_array_equal(tramas[:, 0], [1, 2, 3])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.config.variables import GDOP_ALTURA, N_SENSORES, posiciones_anchors
+from src.utils.auxiliares.angulo_direccion import calcular_angulo_entre_tag_y_robot
+from src.utils.auxiliares.geometria_anchors import (
+    GeometriaAnchors, calcular_gdop, clave_anchors, invalidar_geometria, obtener_geometria
+)
+
+from conftest import ANCHORS_3, ANCHORS_4
+
+
+def test_registro_reutiliza_la_geometria():
+    invalidar_geometria()
+    geometria = obtener_geometria(ANCHORS_4)
+    assert obtener_geometria(ANCHORS_4.tolist()) is geometria
+    assert obtener_geometria(geometria) is geometria
+    # Subconjunto de anchors: otra entrada del registro
+    assert obtener_geometria(geometria, n=3) is obtener_geometria(ANCHORS_4[:3])
+    assert obtener_geometria(geometria, n=3) is not geometria
+
+
+def test_invalidar_descarta_la_entrada():
+    geometria = obtener_geometria(ANCHORS_4)
+    invalidar_geometria(ANCHORS_4)
+    assert obtener_geometria(ANCHORS_4) is not geometria
+
+
+def test_geometria_por_defecto_usa_config():
+    geometria = obtener_geometria()
+    assert geometria.n == N_SENSORES
+    np.testing.assert_array_equal(geometria.anchors, np.asarray(posiciones_anchors[:N_SENSORES], dtype=float))
+
+
+def test_clave_depende_de_valores_y_forma():
+    assert clave_anchors(ANCHORS_4) == clave_anchors(ANCHORS_4.astype(np.int64))
+    assert clave_anchors(ANCHORS_4) != clave_anchors(ANCHORS_4 + 1e-9 * ANCHORS_4.max())
+    assert clave_anchors(ANCHORS_4.ravel()) != clave_anchors(ANCHORS_4)
+
+
+def test_matrices_de_solo_lectura():
+    geometria = GeometriaAnchors(ANCHORS_4)
+    for array in (geometria.anchors, geometria.pinv, geometria.normas2, geometria.AtA):
+        with pytest.raises(ValueError):
+            array[0] = 0.0
+    np.testing.assert_allclose(geometria.pinv @ geometria.A, np.eye(3), atol=1e-12)
+
+
+def test_normal_y_marco_con_anchors_coplanares():
+    geometria = GeometriaAnchors(ANCHORS_3)
+    assert geometria.rango == 2
+    np.testing.assert_allclose(geometria.normal, [0.0, 0.0, 1.0])
+    assert geometria.marco_esferas is not None
+    assert GeometriaAnchors(ANCHORS_4).normal is None
+
+
+def test_angulo_igual_al_calculo_original():
+    geometria = GeometriaAnchors(ANCHORS_4)
+    for tag in ([1000.0, 2000.0, 0.0], [-1500.0, 300.0, 800.0], [0.0, -2500.0, 100.0]):
+        esperado = calcular_angulo_entre_tag_y_robot(np.array(tag), ANCHORS_4[0], ANCHORS_4[1])
+        assert geometria.angulo_tag(tag) == pytest.approx(esperado)
+
+
+def test_tabla_gdop_coincide_con_el_calculo_directo():
+    geometria = GeometriaAnchors(ANCHORS_4)
+    ejes_x, ejes_y, tabla = geometria.tabla_gdop
+    assert geometria.tabla_gdop[2] is tabla   # Se calcula una sola vez
+    punto = np.array([ejes_x[10], ejes_y[20], GDOP_ALTURA])
+    assert geometria.gdop(punto) == pytest.approx(calcular_gdop(punto, geometria.anchors))
+    assert geometria.gdop([1e9, 0.0, 0.0]) == np.inf
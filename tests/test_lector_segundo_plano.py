@@ -0,0 +1,57 @@
+import os
+import pty
+import time
+import tty
+import numpy as np
+import pytest
+
+from src.utils.lectores.sensor_reader import SensorReader
+
+
+def _esperar(condicion, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicion():
+            return True
+        time.sleep(0.005)
+    return condicion()
+
+
+@pytest.fixture
+def par_pty():
+    maestro, esclavo = pty.openpty()
+    tty.setraw(esclavo)
+    yield maestro, os.ttyname(esclavo)
+    os.close(maestro)
+    os.close(esclavo)
+
+
+def test_hilo_publica_la_ultima_trama(par_pty):
+    maestro, ruta = par_pty
+    lector = SensorReader(port=ruta, baudrate=115200, timeout=0.05, background=True)
+    assert lector.connect()
+    try:
+        assert lector.is_running()
+        os.write(maestro, b'[100,200,300,12.5,0.1,0.2]\n[110,210,310,12.4,0.1,0.2]\n')
+        assert _esperar(lambda: lector.frames_received == 2)
+
+        # El buzón entrega la más reciente sin bloquear
+        np.testing.assert_array_equal(lector.read_data(), [110, 210, 310, 12.4, 0.1, 0.2])
+        np.testing.assert_array_equal(lector.get_distances(), [1100.0, 2100.0, 3100.0])
+    finally:
+        lector.disconnect()
+    assert not lector.is_running()
+
+
+def test_sin_hilo_lee_en_cada_llamada(par_pty):
+    maestro, ruta = par_pty
+    lector = SensorReader(port=ruta, baudrate=115200, timeout=0.05, background=False)
+    assert lector.connect()
+    try:
+        assert not lector.is_running()
+        assert lector.read_data() is None
+        os.write(maestro, b'[1,2,3,4,5,6]\n')
+        assert _esperar(lambda: lector.read_data() is not None)
+        np.testing.assert_array_equal(lector.get_full_data(), [1, 2, 3, 4, 5, 6])
+    finally:
+        lector.disconnect()
@@ -0,0 +1,201 @@
+import numpy as np
+import pytest
+
+from src.utils.auxiliares.mi_kalman import CANALES_BATCH_ESCALAR, KalmanBank, KalmanFilter
+
+Q, R = 0.02, 0.2
+
+
+def _medidas(pasos, canales, semilla=0, huecos=0.0):
+    rng = np.random.default_rng(semilla)
+    z = rng.uniform(500, 5000, canales) + rng.normal(0.0, 30.0, (pasos, canales))
+    if huecos:
+        z[rng.random(z.shape) < huecos] = np.nan
+    return z
+
+
+def _escalares(canales, q=Q, r=R, **kwargs):
+    return [KalmanFilter(q, r, **kwargs) for _ in range(canales)]
+
+
+def _paso_escalar(filtros, fila, instante=None):
+    # NaN = sin medida: el filtro escalar no se llama
+    for kf, medida in zip(filtros, fila):
+        if np.isfinite(medida):
+            kf.update(medida, instante)
+    return np.array([kf.x_hat for kf in filtros])
+
+
+@pytest.mark.parametrize('steady_state', [False, True])
+def test_update_igual_a_los_filtros_escalares(steady_state):
+    z = _medidas(200, 6, huecos=0.1)
+    banco = KalmanBank(6, Q, R, steady_state=steady_state)
+    filtros = _escalares(6, steady_state=steady_state)
+    # Con ganancia fija cada canal cambia de modo en su propio paso (k a TOLERANCIA_GANANCIA)
+    rtol = 1e-9 if steady_state else 1e-12
+    for fila in z:
+        np.testing.assert_allclose(banco.update(fila), _paso_escalar(filtros, fila), rtol=rtol)
+    if not steady_state:
+        np.testing.assert_allclose(banco.p, [kf.p for kf in filtros], rtol=1e-12)
+
+
+def test_mascara_conserva_el_estado():
+    z = _medidas(50, 4)
+    banco = KalmanBank(4, Q, R)
+    filtros = _escalares(4)
+    mascara = np.array([True, False, True, False])
+    for fila in z:
+        banco.update(fila, mask=mascara)
+        _paso_escalar(filtros, np.where(mascara, fila, np.nan))
+    np.testing.assert_allclose(banco.x_hat, [kf.x_hat for kf in filtros], rtol=1e-12)
+    assert banco.x_hat[1] == 0.0 and banco.p[1] == 1.0
+
+
+def test_q_y_r_por_canal():
+    q, r = np.array([0.01, 0.02, 0.5]), np.array([0.1, 0.2, 0.3])
+    banco = KalmanBank(3, q, r)
+    filtros = [KalmanFilter(qi, ri) for qi, ri in zip(q, r)]
+    for fila in _medidas(30, 3):
+        np.testing.assert_allclose(banco.update(fila), _paso_escalar(filtros, fila), rtol=1e-12)
+
+
+def test_update_con_instantes_igual_a_los_filtros_escalares():
+    dt = 0.05
+    rng = np.random.default_rng(1)
+    # Sin jitter: el banco acumula q paso a paso en los huecos y el filtro
+    # escalar lo hace de una vez, igual salvo por el redondeo a TOLERANCIA_PERIODO
+    instantes = np.cumsum(dt * rng.choice([1.0, 2.0, 3.5], size=100))
+    z = _medidas(100, 5, huecos=0.15)
+    banco = KalmanBank(5, Q, R, dt_nominal=dt)
+    filtros = _escalares(5, dt_nominal=dt)
+    for instante, fila in zip(instantes, z):
+        banco.update(fila, instante=instante)
+        _paso_escalar(filtros, fila, instante)
+    np.testing.assert_allclose(banco.x_hat, [kf.x_hat for kf in filtros], rtol=1e-9)
+
+
+@pytest.mark.parametrize('canales', [4, CANALES_BATCH_ESCALAR + 4])
+@pytest.mark.parametrize('steady_state', [False, True])
+def test_update_batch_igual_a_update_fila_por_fila(canales, steady_state):
+    z = _medidas(120, canales, semilla=2, huecos=0.05)
+    lote = KalmanBank(canales, Q, R, steady_state=steady_state)
+    fila_a_fila = KalmanBank(canales, Q, R, steady_state=steady_state)
+
+    estimaciones = lote.update_batch(z)
+    esperadas = np.array([fila_a_fila.update(fila) for fila in z])
+    np.testing.assert_allclose(estimaciones, esperadas, rtol=1e-9)
+    if not steady_state:
+        # Con ganancia fija p deja de actualizarse en distintos pasos
+        np.testing.assert_allclose(lote.p, fila_a_fila.p, rtol=1e-9)
+    # El estado sigue desde el último instante del lote
+    siguiente = _medidas(1, canales, semilla=3)[0]
+    np.testing.assert_allclose(lote.update(siguiente), fila_a_fila.update(siguiente), rtol=1e-9)
+
+
+@pytest.mark.parametrize('steady_state', [False, True])
+def test_update_por_canales_igual_a_los_filtros_escalares(steady_state):
+    rng = np.random.default_rng(6)
+    z = _medidas(300, 8, semilla=6, huecos=0.05)
+    banco = KalmanBank(8, Q, R, steady_state=steady_state)
+    filtros = _escalares(8, steady_state=steady_state)
+    for fila in z:
+        canales = np.flatnonzero(rng.random(8) < 0.5)
+        estimaciones = banco.update(fila[canales], canales=canales)
+        esperadas = _paso_escalar(filtros, np.where(np.isin(np.arange(8), canales), fila, np.nan))
+        np.testing.assert_allclose(estimaciones, esperadas[canales], rtol=1e-9)
+        np.testing.assert_allclose(banco.x_hat, esperadas, rtol=1e-9)
+    if steady_state:
+        assert banco.convergido.any()
+    with pytest.raises(ValueError):
+        banco.update([1.0], canales=[0], instante=1.0)
+
+
+def test_ampliar_conserva_el_estado():
+    banco = KalmanBank(2, Q, R, initial_estimate=5.0, steady_state=True)
+    banco.update_batch(_medidas(200, 2))
+    x_hat, p = banco.x_hat.copy(), banco.p.copy()
+    banco.ampliar(5)
+    assert banco.n == 5
+    np.testing.assert_array_equal(banco.x_hat[:2], x_hat)
+    np.testing.assert_array_equal(banco.p[:2], p)
+    np.testing.assert_array_equal(banco.x_hat[2:], 5.0)
+    assert banco.convergido[:2].all() and not banco.convergido[2:].any()
+
+    # Los canales nuevos se comportan como filtros recién creados
+    filtros = _escalares(3, initial_estimate=5.0, steady_state=True)
+    for fila in _medidas(50, 3, semilla=7):
+        np.testing.assert_allclose(banco.update(fila, canales=[2, 3, 4]), _paso_escalar(filtros, fila), rtol=1e-9)
+
+
+def test_reiniciar_canales():
+    banco = KalmanBank(3, Q, R, initial_estimate=[1.0, 2.0, 3.0])
+    banco.update([100.0, 200.0, 300.0])
+    banco.reiniciar([1])
+    assert banco.x_hat[1] == 2.0 and banco.p[1] == 1.0
+    assert banco.x_hat[0] != 1.0
+    banco.reiniciar()
+    np.testing.assert_array_equal(banco.x_hat, [1.0, 2.0, 3.0])
+
+
+# #####################################################
+# GANANCIA ESTACIONARIA
+# #####################################################
+def test_q_y_r_de_solo_lectura():
+    banco = KalmanBank(3, Q, R, steady_state=True)
+    for array in (banco.q, banco.r):
+        with pytest.raises(ValueError):
+            array[0] = 1.0
+    np.testing.assert_array_equal(banco.q, Q)
+    # Asignar sí vuelve a la recursión completa
+    banco.update_batch(_medidas(200, 3))
+    assert banco.convergido.all()
+    banco.q = 0.5
+    assert not banco.convergido.any()
+    np.testing.assert_array_equal(banco.q, 0.5)
+
+
+def test_estacionario_desactivado_por_defecto():
+    from src.config.variables import KALMAN_ESTACIONARIO, kalman_sensores
+    assert KALMAN_ESTACIONARIO is False
+    assert kalman_sensores.steady_state is False
+
+
+@pytest.mark.parametrize('clase', ['escalar', 'banco'])
+def test_ganancia_estacionaria_converge_y_vuelve_al_cambiar_r(clase):
+    z = _medidas(300, 1, semilla=5)[:, 0]
+    if clase == 'escalar':
+        rapido, completo = KalmanFilter(Q, R, steady_state=True), KalmanFilter(Q, R)
+    else:
+        rapido, completo = KalmanBank(1, Q, R, steady_state=True), KalmanBank(1, Q, R)
+    for medida in z[:150]:
+        assert np.allclose(rapido.update(medida), completo.update(medida), rtol=1e-9)
+    assert np.all(rapido.convergido)
+
+    rapido.r = completo.r = 2.0
+    assert not np.any(rapido.convergido)
+    for medida in z[150:]:
+        assert np.allclose(rapido.update(medida), completo.update(medida), rtol=1e-9)
+    assert np.all(rapido.convergido)
+
+
+# #####################################################
+# ADAPTADOR DE LOS SENSORES
+# #####################################################
+def test_adaptador_con_menos_distancias_que_sensores(monkeypatch):
+    from src.utils.auxiliares import kalman_adapter
+    banco = KalmanBank(4, Q, R)
+    monkeypatch.setattr(kalman_adapter, 'kalman_sensores', banco)
+    filtros = _escalares(4)
+
+    filtradas = kalman_adapter.filtrar_mediciones_kalman([100.0, 200.0, 300.0, 400.0])
+    np.testing.assert_allclose(filtradas, _paso_escalar(filtros, [100.0, 200.0, 300.0, 400.0]))
+    # Faltan sensores: se filtran los recibidos y los demás conservan su estado
+    filtradas = kalman_adapter.filtrar_mediciones_kalman([110.0, 210.0])
+    esperadas = _paso_escalar(filtros, [110.0, 210.0, np.nan, np.nan])
+    assert isinstance(filtradas, np.ndarray) and filtradas.shape == (2,)
+    np.testing.assert_allclose(filtradas, esperadas[:2])
+    np.testing.assert_allclose(banco.x_hat, esperadas)
+    # La máscara corta se completa igual; las distancias de más se ignoran
+    filtradas = kalman_adapter.filtrar_mediciones_kalman([120.0, 220.0, 320.0], mascara=[True, False, True])
+    np.testing.assert_allclose(filtradas, _paso_escalar(filtros, [120.0, np.nan, 320.0, np.nan])[:3])
+    assert kalman_adapter.filtrar_mediciones_kalman(np.ones(6)).shape == (4,)
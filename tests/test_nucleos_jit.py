@@ -0,0 +1,144 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.auxiliares import angulo_direccion, nucleos_jit
+from src.utils.auxiliares.angulo_direccion import calcular_angulo_entre_tag_y_robot
+
+SENSOR_1 = np.array([-280.0, 0.0, 0.0])
+SENSOR_2 = np.array([280.0, 0.0, 0.0])
+
+
+def _angulo_numpy(monkeypatch, tag, sensor_1=SENSOR_1, sensor_2=SENSOR_2):
+    monkeypatch.setattr(angulo_direccion, 'ACELERADO', False)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return calcular_angulo_entre_tag_y_robot(np.asarray(tag, dtype=float), sensor_1, sensor_2)
+
+
+def _angulo_nucleo(funcion, tag, sensor_1=SENSOR_1, sensor_2=SENSOR_2):
+    with np.errstate(invalid='ignore'):
+        return funcion(float(tag[0]), float(tag[1]),
+                       (sensor_1[0] + sensor_2[0]) / 2, (sensor_1[1] + sensor_2[1]) / 2,
+                       float(sensor_2[0] - sensor_1[0]), float(sensor_2[1] - sensor_1[1]))
+
+
+def _casos_angulo():
+    rng = np.random.default_rng(0)
+    aleatorios = [list(t) for t in rng.uniform(-5000, 5000, size=(50, 3))]
+    bordes = [
+        [0.0, 0.0, 700.0],              # Tag sobre el centro: vector nulo
+        [np.nan, 1000.0, 0.0],
+        [1000.0, np.inf, 0.0],
+    ]
+    return aleatorios + bordes
+
+
+@pytest.mark.parametrize('tag', _casos_angulo())
+def test_angulo_python_igual_al_camino_numpy(monkeypatch, tag):
+    esperado = _angulo_numpy(monkeypatch, tag)
+    obtenido = _angulo_nucleo(nucleos_jit.angulo_plano.py_func, tag)
+    if np.isnan(esperado):
+        assert math.isnan(obtenido)
+    else:
+        assert obtenido == pytest.approx(esperado, abs=1e-9)
+
+
+def test_angulo_con_frente_nulo_es_nan(monkeypatch):
+    tag = [1000.0, 2000.0, 0.0]
+    assert np.isnan(_angulo_numpy(monkeypatch, tag, SENSOR_1, SENSOR_1))
+    assert math.isnan(_angulo_nucleo(nucleos_jit.angulo_plano.py_func, tag, SENSOR_1, SENSOR_1))
+
+
+def test_precalentar_sin_numba_no_hace_nada(monkeypatch):
+    monkeypatch.setattr(nucleos_jit, 'ACELERADO', False)
+    monkeypatch.setattr(nucleos_jit, 'kalman_paso', None)   # Fallaría si se llamara
+    nucleos_jit.precalentar()
+
+
+# #####################################################
+# NÚCLEOS COMPILADOS CONTRA SU VERSIÓN PYTHON
+# #####################################################
+@pytest.fixture
+def numba():
+    numba = pytest.importorskip('numba')
+    if not nucleos_jit.ACELERADO:
+        pytest.skip('núcleos sin compilar')
+    return numba
+
+
+def test_precalentar_compila_todos_los_nucleos(numba):
+    nucleos_jit.precalentar()
+    for nombre in ('kalman_paso', 'objetivo_trilateracion', 'angulo_plano',
+                   'pid_paso', 'velocidades_diferenciales'):
+        assert getattr(nucleos_jit, nombre).signatures, nombre
+    # Anchors de GeometriaAnchors (sólo lectura): también compilado de antemano
+    assert len(nucleos_jit.objetivo_trilateracion.signatures) == 2
+
+
+@pytest.mark.parametrize('tag', _casos_angulo())
+def test_angulo_compilado_igual_a_python(numba, tag):
+    esperado = _angulo_nucleo(nucleos_jit.angulo_plano.py_func, tag)
+    obtenido = _angulo_nucleo(nucleos_jit.angulo_plano, tag)
+    if math.isnan(esperado):
+        assert math.isnan(obtenido)
+    else:
+        assert obtenido == pytest.approx(esperado, abs=1e-9)
+
+
+def test_angulo_compilado_con_frente_nulo(numba):
+    tag = [1000.0, 2000.0, 0.0]
+    assert math.isnan(_angulo_nucleo(nucleos_jit.angulo_plano, tag, SENSOR_1, SENSOR_1))
+
+
+def test_kalman_compilado_igual_a_python(numba):
+    rng = np.random.default_rng(1)
+    x_c = x_p = 0.0
+    p_c = p_p = 1.0
+    for medida in rng.normal(1500.0, 30.0, 200):
+        x_c, p_c = nucleos_jit.kalman_paso(x_c, p_c, 0.02, 0.2, medida)
+        x_p, p_p = nucleos_jit.kalman_paso.py_func(x_p, p_p, 0.02, 0.2, medida)
+    assert x_c == pytest.approx(x_p, rel=1e-12)
+    assert p_c == pytest.approx(p_p, rel=1e-12)
+
+
+def test_objetivo_compilado_igual_a_python(numba):
+    rng = np.random.default_rng(2)
+    anchors = rng.uniform(-3000, 3000, size=(6, 3))
+    distancias = rng.uniform(500, 5000, size=6)
+    solo_lectura = anchors.copy()
+    solo_lectura.flags.writeable = False
+    for pos in rng.uniform(-3000, 3000, size=(20, 3)):
+        esperado = nucleos_jit.objetivo_trilateracion.py_func(pos, anchors, distancias)
+        assert nucleos_jit.objetivo_trilateracion(pos, anchors, distancias) == pytest.approx(esperado, rel=1e-12)
+        assert nucleos_jit.objetivo_trilateracion(pos, solo_lectura, distancias) == pytest.approx(esperado, rel=1e-12)
+
+
+@pytest.mark.parametrize('salida_maxima', [math.inf, 50.0])
+@pytest.mark.parametrize('factor', [1.0, 0.5, 3.0])
+def test_pid_compilado_igual_a_python(numba, salida_maxima, factor):
+    rng = np.random.default_rng(3)
+    estado_c = estado_p = (0.0, 0.0)
+    for medida in rng.normal(0.0, 40.0, 100):
+        args = (float(medida), 0.0, 0.3, 1.2, 0.05, 0.4)
+        salida_c, *estado_c = nucleos_jit.pid_paso(*args, *estado_c, salida_maxima, factor)
+        salida_p, *estado_p = nucleos_jit.pid_paso.py_func(*args, *estado_p, salida_maxima, factor)
+        assert salida_c == pytest.approx(salida_p, rel=1e-12, abs=1e-12)
+        np.testing.assert_allclose(estado_c, estado_p, rtol=1e-12, atol=1e-12)
+
+
+def test_velocidades_compiladas_iguales_a_python(numba):
+    rng = np.random.default_rng(4)
+    for v_lineal, angulo in zip(rng.uniform(-255, 255, 50), rng.uniform(-180, 180, 50)):
+        esperado = nucleos_jit.velocidades_diferenciales.py_func(float(v_lineal), float(angulo), 255.0)
+        obtenido = nucleos_jit.velocidades_diferenciales(float(v_lineal), float(angulo), 255.0)
+        np.testing.assert_allclose(obtenido, esperado, rtol=1e-12)
+
+
+def test_geometria_tag_sobre_el_centro_es_nan(monkeypatch):
+    from src.utils.auxiliares import geometria_anchors
+    geometria = geometria_anchors.GeometriaAnchors(np.array([SENSOR_1, SENSOR_2, [0.0, 2000.0, 500.0]]),
+                                                   indices_angulo=(0, 1))
+    assert math.isnan(geometria.angulo_tag([0.0, 0.0, 800.0]))
+    monkeypatch.setattr(geometria_anchors, 'ACELERADO', not geometria_anchors.ACELERADO)
+    assert math.isnan(geometria.angulo_tag([0.0, 0.0, 800.0]))
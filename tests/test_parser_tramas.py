@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.utils.lectores.parser_tramas import AsciiFrameParser, create_frame_parser
+from src.utils.lectores.trama_binaria import BinaryFrameParser
+
+
+def _parser():
+    return AsciiFrameParser(n_fields=6, verbose=False)
+
+
+def test_decodifica_todas_las_tramas_de_una_pasada():
+    parser = _parser()
+    parser.feed(b'[1,2,3,4,5,6]\n[7,8,9,10,11,12]\n')
+    tramas = parser.parse(all_frames=True)
+    assert [t.tolist() for t in tramas] == [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]]
+    assert parser.frames_ok == 2
+    assert parser.pending == 0
+
+
+def test_parse_retorna_la_mas_reciente():
+    parser = _parser()
+    parser.feed(b'[1,2,3,4,5,6][7,8,9,10,11,12]')
+    np.testing.assert_array_equal(parser.parse(), [7, 8, 9, 10, 11, 12])
+
+
+def test_trama_incompleta_espera_mas_bytes():
+    parser = _parser()
+    parser.feed(b'basura[1,2,3,')
+    assert parser.parse() is None
+    assert parser.dropped == 0
+    parser.feed(b'4,5,6]')
+    np.testing.assert_array_equal(parser.parse(), [1, 2, 3, 4, 5, 6])
+
+
+def test_resincroniza_tras_trama_cortada_sin_perder_la_siguiente():
+    parser = _parser()
+    parser.feed(b'[1,2,3[7,8,9,10,11,12]\n')
+    tramas = parser.parse(all_frames=True)
+    assert [t.tolist() for t in tramas] == [[7, 8, 9, 10, 11, 12]]
+    assert parser.malformed == 1
+
+
+def test_descarta_tramas_invalidas_y_conserva_las_validas():
+    parser = _parser()
+    parser.feed(b'[1,2,3]'              # Cantidad incorrecta
+                b'[1,x,3,4,5,6]'        # No numérica
+                b'[1,2,3,4,-1.0,6]'     # Valor inválido
+                b'[1,2,3,4,5,6]')
+    tramas = parser.parse(all_frames=True)
+    assert len(tramas) == 1
+    assert parser.get_stats()['wrong_count'] == 1
+    assert parser.malformed == 1
+    assert parser.invalid == 1
+    assert parser.dropped == 3
+
+
+def test_compacta_el_buffer_sin_perder_la_trama_pendiente():
+    parser = AsciiFrameParser(n_fields=6, compact_threshold=32, verbose=False)
+    parser.feed(b'[1,2,3,4,5,6]' * 5 + b'[9,9,')
+    assert len(parser.parse(all_frames=True)) == 5
+    assert parser.pending == len(b'[9,9,')
+    parser.feed(b'9,9,9,9]')
+    np.testing.assert_array_equal(parser.parse(), [9] * 6)
+
+
+def test_create_frame_parser():
+    assert isinstance(create_frame_parser('ascii', verbose=False), AsciiFrameParser)
+    assert isinstance(create_frame_parser('binario', verbose=False), BinaryFrameParser)
+    with pytest.raises(ValueError):
+        create_frame_parser('xml')
@@ -0,0 +1,57 @@
+import pytest
+
+from src.utils.controladores import pid_controller
+from src.utils.controladores.pid_controller import PIDController
+
+DT = 0.1
+
+
+@pytest.fixture(params=[False, True], ids=['numpy', 'nucleo'])
+def acelerado(request, monkeypatch):
+    # El núcleo sin numba es la misma función en Python: ambos caminos corren siempre
+    monkeypatch.setattr(pid_controller, 'ACELERADO', request.param)
+
+
+def _pid():
+    return PIDController(kp=1.0, ki=0.5, kd=0.2, alpha=0.3, dt_nominal=DT, dt_maximo=1.0)
+
+
+def test_paso_nominal_igual_sin_instantes(acelerado):
+    con_instantes, sin_instantes = _pid(), _pid()
+    for i, angulo in enumerate([10.0, 8.0, 5.0, -2.0, 4.0]):
+        assert con_instantes.update(angulo, i * DT) == pytest.approx(sin_instantes.update(angulo))
+
+
+def test_zona_muerta_no_carga_la_integral(acelerado):
+    omitido, continuo = _pid(), _pid()
+    omitido.update(10.0, 0.0)
+    continuo.update(10.0, 0.0)
+    # Ocho tramas dentro del umbral: sin corrección pero el tiempo avanza
+    for i in range(1, 9):
+        omitido.omitir(i * DT)
+    salida = omitido.update(10.0, 9 * DT)
+    # Un solo paso nominal desde la última trama, como si fuera la siguiente
+    assert salida == pytest.approx(continuo.update(10.0, DT))
+    assert omitido.integral == pytest.approx(continuo.integral)
+
+
+def test_sin_omitir_integra_todo_el_hueco(acelerado):
+    hueco, siguiente = _pid(), _pid()
+    hueco.update(10.0, 0.0)
+    siguiente.update(10.0, 0.0)
+    hueco.update(10.0, 9 * DT)
+    siguiente.update(10.0, DT)
+    # Sin omitir las tramas intermedias, el paso cuenta como nueve
+    assert abs(hueco.integral) > 5.0 * abs(siguiente.integral)
+
+
+def test_omitir_sin_instante_no_cambia_nada():
+    pid = _pid()
+    pid.update(10.0, 0.0)
+    pid.omitir(None)
+    assert pid.instante == 0.0
+
+
+def test_instante_trama_desactivado_por_defecto():
+    from src.config.variables import USAR_INSTANTE_TRAMA
+    assert USAR_INSTANTE_TRAMA is False
@@ -0,0 +1,56 @@
+import json
+import pytest
+
+from src.utils.controladores.protocolo_motor import (
+    MotorCommandEncoder, decode_command, TAMANO_BINARIO, BINARIO_STOP
+)
+
+
+@pytest.mark.parametrize('protocolo', ['json', 'ascii', 'binario'])
+@pytest.mark.parametrize('izquierda,derecha', [(0, 0), (1, -1), (-255, 255), (255, -255), (-40, 128), (-1, -255)])
+def test_ida_y_vuelta(protocolo, izquierda, derecha):
+    encoder = MotorCommandEncoder(protocolo)
+    datos = encoder.encode(izquierda, derecha, timestamp=1.5, command_id=7)
+    assert decode_command(datos, protocolo) == ('motor_command', izquierda, derecha)
+
+
+@pytest.mark.parametrize('protocolo', ['json', 'ascii', 'binario'])
+def test_emergencia(protocolo):
+    encoder = MotorCommandEncoder(protocolo)
+    assert decode_command(encoder.encode_emergency(3), protocolo) == ('emergency_stop', 0, 0)
+
+
+def test_formatos_compactos():
+    assert MotorCommandEncoder('ascii').encode(-40, 40) == b'M-40,40\n'
+    binario = MotorCommandEncoder('binario').encode(-40, 40)
+    assert len(binario) == TAMANO_BINARIO
+    assert binario[:2] == b'\xa5\x01'
+    assert binario[-1] == sum(binario[:-1]) & 0xFF
+    assert MotorCommandEncoder('binario').encode(0, 0) == BINARIO_STOP
+
+
+def test_binario_encolado_no_cambia_con_el_siguiente_comando():
+    # El mensaje puede esperar en la cola del puerto compartido
+    encoder = MotorCommandEncoder('binario')
+    primero = encoder.encode(10, 20)
+    copia = bytes(primero)
+    encoder.encode(-30, 40)
+    assert isinstance(primero, bytes) and primero == copia
+
+
+def test_json_compatible_con_el_legado():
+    mensaje = json.loads(MotorCommandEncoder('json').encode(10, -10, timestamp=2.0, command_id=5))
+    assert mensaje == {"type": "motor_command", "left_speed": 10, "right_speed": -10,
+                       "timestamp": 2.0, "command_id": 5}
+
+
+def test_binario_con_checksum_erroneo_se_rechaza():
+    datos = bytearray(MotorCommandEncoder('binario').encode(12, 34))
+    datos[-1] ^= 0xFF
+    assert decode_command(bytes(datos), 'binario') is None
+    assert decode_command(bytes(datos[:-1]), 'binario') is None
+
+
+def test_protocolo_desconocido():
+    with pytest.raises(ValueError):
+        MotorCommandEncoder('protobuf')
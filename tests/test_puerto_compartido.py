@@ -0,0 +1,104 @@
+import os
+import pty
+import select
+import threading
+import time
+import tty
+import pytest
+
+from src.utils.lectores.puerto_compartido import SharedSerialPort
+
+
+def _esperar(condicion, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicion():
+            return True
+        time.sleep(0.005)
+    return condicion()
+
+
+def _leer(fd, n, timeout=2.0):
+    """Leer n bytes del maestro del pty (lo que el puerto escribió)"""
+    datos = b''
+    limite = time.monotonic() + timeout
+    while len(datos) < n and time.monotonic() < limite:
+        listos, _, _ = select.select([fd], [], [], 0.05)
+        if listos:
+            datos += os.read(fd, n - len(datos))
+    return datos
+
+
+@pytest.fixture
+def par_pty():
+    maestro, esclavo = pty.openpty()
+    tty.setraw(esclavo)
+    tty.setraw(maestro)
+    yield maestro, os.ttyname(esclavo)
+    os.close(maestro)
+    os.close(esclavo)
+
+
+@pytest.fixture
+def puerto(par_pty):
+    maestro, ruta = par_pty
+    puerto = SharedSerialPort(port=ruta, baudrate=115200, timeout=0.05, max_queue=3)
+    assert puerto.open()
+    yield maestro, puerto
+    puerto.close()
+
+
+def test_lecturas_y_escrituras_intercaladas(puerto):
+    maestro, puerto = puerto
+    recibido = bytearray()
+    puerto.subscribe(recibido.extend)
+
+    tramas = [f'[{i},{i},{i},12.0,0.1,0.2]\n'.encode() for i in range(50)]
+    comandos = [f'M{i},{-i}\n'.encode() for i in range(50)]
+    esperado_rx = b''.join(tramas)
+    esperado_tx = b''.join(comandos)
+
+    def emisor():
+        for trama in tramas:
+            os.write(maestro, trama)
+            time.sleep(0.001)
+
+    hilo = threading.Thread(target=emisor)
+    hilo.start()
+    for comando in comandos:
+        assert puerto.write(comando)
+        puerto.flush(timeout=1.0)   # Sin desbordar la cola de 3
+    enviado = _leer(maestro, len(esperado_tx))
+    hilo.join()
+
+    assert enviado == esperado_tx
+    assert _esperar(lambda: len(recibido) == len(esperado_rx))
+    assert bytes(recibido) == esperado_rx
+    assert puerto.get_connection_info()['bytes_read'] == len(esperado_rx)
+
+
+def test_prioritario_sale_antes_que_los_pendientes(puerto):
+    maestro, puerto = puerto
+    # Retener el hilo escritor mientras se encola
+    with puerto._write_cond:
+        puerto.write(b'A\n')
+        puerto.write(b'B\n')
+        puerto.write(b'E1\n', priority=True)
+        puerto.write(b'E2\n', priority=True)
+    assert puerto.flush(timeout=1.0)
+    # Los prioritarios salen primero y entre ellos en orden de llegada
+    assert _leer(maestro, 10) == b'E1\nE2\nA\nB\n'
+
+
+def test_cola_llena_no_descarta_la_parada_de_emergencia(puerto):
+    maestro, puerto = puerto
+    with puerto._write_cond:
+        puerto.write(b'E\n', priority=True)
+        for i in range(6):
+            puerto.write(f'M{i}\n'.encode())
+        info = puerto.get_connection_info()
+    assert info['pending_writes'] == 4
+    assert info['writes_dropped'] == 3
+    assert puerto.flush(timeout=1.0)
+    # Se descartan los normales más antiguos; la emergencia se conserva
+    assert _leer(maestro, 11) == b'E\nM3\nM4\nM5\n'
@@ -0,0 +1,85 @@
+import os
+import time
+import numpy as np
+import pytest
+
+from src.utils.lectores.receptor_telemetria import TelemetryReceiver
+from src.utils.lectores.transportes import PtyTransport, create_transport
+
+
+@pytest.fixture
+def receptor():
+    transporte = PtyTransport()
+    receptor = TelemetryReceiver(transporte, background=False, history_size=2)
+    assert receptor.connect()
+    extremo = os.open(transporte.peer_name, os.O_WRONLY | os.O_NOCTTY)
+    yield extremo, receptor
+    os.close(extremo)
+    receptor.disconnect()
+
+
+def _recibir(extremo, receptor, trama):
+    recibidas = receptor.frames_received
+    os.write(extremo, trama)
+    limite = time.monotonic() + 2.0
+    while receptor.frames_received == recibidas and time.monotonic() < limite:
+        receptor._poll()
+        time.sleep(0.002)
+    assert receptor.frames_received == recibidas + 1
+
+
+def test_sin_datos_retorna_ceros(receptor):
+    _, receptor = receptor
+    assert receptor.read_data() is None
+    np.testing.assert_array_equal(receptor.get_distances(), np.zeros(3))
+    np.testing.assert_array_equal(receptor.get_full_data(), np.zeros(6))
+    np.testing.assert_array_equal(receptor.get_motor_currents(), np.zeros(2))
+    # Las copias vacías también se pueden modificar sin afectar al receptor
+    receptor.get_distances()[0] = 1.0
+    np.testing.assert_array_equal(receptor.get_distances_view(), np.zeros(3))
+
+
+def test_accesores_retornan_copias(receptor):
+    extremo, receptor = receptor
+    _recibir(extremo, receptor, b'[10,20,30,12.5,0.1,0.2]\n')
+    trama = receptor.read_data()
+    distancias = receptor.get_distances()
+    completa = receptor.get_full_data()
+    potencia = receptor.get_power_info()
+    corrientes = receptor.get_motor_currents()
+    for array in (trama, distancias, completa, potencia, corrientes):
+        assert array.flags.writeable
+        assert not np.shares_memory(array, receptor._frames)
+        assert not np.shares_memory(array, receptor._dist_mm)
+
+    # Llegan más tramas de las que guarda el buffer: las copias no cambian
+    _recibir(extremo, receptor, b'[40,50,60,11.0,0.3,0.4]\n')
+    _recibir(extremo, receptor, b'[70,80,90,10.0,0.5,0.6]\n')
+    np.testing.assert_array_equal(trama, [10, 20, 30, 12.5, 0.1, 0.2])
+    np.testing.assert_array_equal(distancias, [100.0, 200.0, 300.0])
+    np.testing.assert_array_equal(potencia, [12.5, 0.1, 0.2])
+    np.testing.assert_array_equal(corrientes, [0.1, 0.2])
+
+
+def test_vistas_de_solo_lectura(receptor):
+    extremo, receptor = receptor
+    _recibir(extremo, receptor, b'[10,20,30,12.5,0.1,0.2]\n')
+    vista = receptor.read_data_view()
+    distancias = receptor.get_distances_view()
+    for array in (vista, distancias, receptor.get_full_data_view(),
+                  receptor.get_power_info_view(), receptor.get_motor_currents_view()):
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0] = 0.0
+    assert np.shares_memory(vista, receptor._frames)
+    np.testing.assert_array_equal(distancias, [100.0, 200.0, 300.0])
+    assert receptor.read_if_new_view() is None
+
+    _recibir(extremo, receptor, b'[40,50,60,11.0,0.3,0.4]\n')
+    np.testing.assert_array_equal(receptor.read_if_new_view(), [40, 50, 60, 11.0, 0.3, 0.4])
+    assert receptor.read_if_new() is None
+
+
+def test_create_transport_desconocido():
+    with pytest.raises(ValueError):
+        create_transport('paloma')
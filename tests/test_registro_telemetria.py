@@ -0,0 +1,126 @@
+import os
+import time
+import numpy as np
+import pytest
+
+from src.utils.lectores.registro_telemetria import (
+    MAGIC, ReplayReader, ReplayTransport, TelemetryRecorder, iterate_records
+)
+
+BLOQUES = [
+    (10.00, b'[100,200,300,12.5,0.1,0.2]\n'),
+    (10.05, b'[110,210,31'),                      # Trama partida entre bloques
+    (10.10, b'0,12.4,0.1,0.2]\n[120,220,320,12.3,0.1,0.2]\n'),
+]
+
+
+@pytest.fixture
+def registro(tmp_path):
+    ruta = str(tmp_path / 'telemetria.gctl')
+    with TelemetryRecorder(ruta) as grabador:
+        for t, bloque in BLOQUES:
+            grabador.record(bloque, t)
+    return ruta
+
+
+def test_ida_y_vuelta_de_bloques(registro):
+    assert [(t, bytes(b)) for t, b in iterate_records(registro)] == BLOQUES
+
+
+def test_registro_truncado_entrega_los_bloques_completos(registro):
+    with open(registro, 'rb+') as f:
+        f.truncate(os.path.getsize(registro) - 5)
+    assert [bytes(b) for _, b in iterate_records(registro)] == [b for _, b in BLOQUES[:2]]
+
+
+def test_archivo_ajeno_se_rechaza(tmp_path):
+    ruta = tmp_path / 'otro.bin'
+    ruta.write_bytes(b'no es un registro')
+    with pytest.raises(ValueError):
+        list(iterate_records(str(ruta)))
+    assert not ReplayTransport(str(ruta)).open()
+
+
+def test_grabar_de_nuevo_agrega_sin_repetir_cabecera(registro):
+    with TelemetryRecorder(registro) as grabador:
+        grabador.record(b'[1,2,3,4,5,6]\n', 11.0)
+    with open(registro, 'rb') as f:
+        assert f.read().count(MAGIC) == 1
+    assert len(list(iterate_records(registro))) == len(BLOQUES) + 1
+
+
+def test_reproduccion_lo_mas_rapido_posible(registro):
+    lector = ReplayReader(registro, speed=None)
+    assert lector.connect()
+    tramas = []
+    while not lector.finished:
+        trama = lector.read_if_new()
+        if trama is not None:
+            tramas.append(trama.copy())
+    lector.disconnect()
+
+    # El último bloque trae dos tramas: se publican ambas, se entrega la más reciente
+    np.testing.assert_array_equal(np.array(tramas)[:, 0], [100, 120])
+    assert lector.frames_received == 3
+    assert lector.frames_dropped == 0
+    _, _, historial = lector.get_history()
+    np.testing.assert_array_equal(historial[:, 0], [100, 110, 120])
+
+
+def test_reproduccion_en_tiempo_real_respeta_intervalos(registro):
+    transporte = ReplayTransport(registro, speed=1.0)
+    assert transporte.open()
+    inicio = time.monotonic()
+    recibido = b''
+    while not transporte.finished:
+        recibido += transporte.read(0.05)
+    transcurrido = time.monotonic() - inicio
+    transporte.close()
+
+    assert recibido == b''.join(b for _, b in BLOQUES)
+    assert transcurrido >= 0.09
+
+
+def test_reproduccion_en_bucle(registro):
+    transporte = ReplayTransport(registro, speed=None, loop=True)
+    assert transporte.open()
+    bloques = [transporte.read_available() for _ in range(2 * len(BLOQUES))]
+    transporte.close()
+    assert bloques == [b for _, b in BLOQUES] * 2
+    assert not transporte.finished
+
+
+@pytest.mark.parametrize('velocidad', [None, 20.0])
+def test_reproduccion_con_los_instantes_grabados(registro, velocidad):
+    lector = ReplayReader(registro, speed=velocidad)
+    assert lector.connect()
+    instantes = []
+    while not lector.finished:
+        if lector.read_if_new() is not None:
+            instantes.append(lector.last_frame_info()[1])
+        assert lector.frame_age() is not None and lector.frame_age() >= 0.0
+    _, historial, _ = lector.get_history()
+    lector.disconnect()
+
+    # Mismos instantes en cualquier modo: los de recepción al grabar
+    assert instantes[0] == 10.00 and instantes[-1] == 10.10
+    np.testing.assert_array_equal(historial, [10.00, 10.10, 10.10])
+
+
+def test_reproduccion_rapida_edad_de_trama_en_el_reloj_del_registro(registro):
+    lector = ReplayReader(registro, speed=None)
+    assert lector.connect()
+    lector.read_if_new()
+    assert lector.frame_age() == 0.0
+    assert lector.transport.now() == 10.00
+    lector.disconnect()
+
+
+def test_bucle_continua_el_reloj(registro):
+    transporte = ReplayTransport(registro, speed=None, loop=True)
+    assert transporte.open()
+    instantes = [transporte.read_available_with_time()[1] for _ in range(2 * len(BLOQUES))]
+    transporte.close()
+    assert instantes[:3] == [t for t, _ in BLOQUES]
+    assert all(b >= a for a, b in zip(instantes, instantes[1:]))
+    assert instantes[3:] == pytest.approx([10.10, 10.15, 10.20])
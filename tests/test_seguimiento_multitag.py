@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from src.utils.auxiliares.filtro_media_movil import FiltroMediaMovil
+from src.utils.auxiliares.mi_kalman import KalmanFilter
+from src.utils.auxiliares.seguimiento_multitag import MultiTagTracker
+from src.utils.auxiliares.trilateracion import resolver_lineal
+
+from conftest import ANCHORS_4 as ANCHORS
+
+Q, R, VENTANA = 0.02, 0.2, 5
+
+
+class _TagEscalar:
+    """Camino de un solo tag: KalmanFilter por anchor, FiltroMediaMovil y solver lineal"""
+
+    def __init__(self, id_tag):
+        self.id_tag = id_tag
+        self.kalman = [KalmanFilter(Q, R) for _ in range(len(ANCHORS))]
+        self.media = FiltroMediaMovil(VENTANA)
+
+    def actualizar(self, distancias):
+        filtradas = [self.media.filtrar(f"{self.id_tag}_{i}", kf.update(d))
+                     for i, (kf, d) in enumerate(zip(self.kalman, distancias))]
+        return resolver_lineal(filtradas, ANCHORS)
+
+
+def _trayectorias(n_tags, pasos, semilla=0):
+    rng = np.random.default_rng(semilla)
+    inicio = rng.uniform([-3000, -3000, 200], [3000, 3000, 1500], size=(n_tags, 3))
+    velocidad = rng.normal(0.0, 50.0, size=(n_tags, 3))
+    puntos = inicio[None] + np.arange(pasos)[:, None, None] * velocidad[None]
+    d = np.linalg.norm(puntos[:, :, None, :] - ANCHORS[None, None], axis=3)
+    return d + rng.normal(0.0, 10.0, d.shape)
+
+
+def _tracker(capacidad=8):
+    return MultiTagTracker(ANCHORS, n_anchors=len(ANCHORS), capacidad=capacidad,
+                           ventana=VENTANA, q=Q, r=R, estimado_inicial=0.0)
+
+
+def test_coincide_con_el_camino_de_un_tag():
+    # Capacidad chica: el tracker crece a mitad de camino sin perder estado
+    tracker = _tracker(capacidad=2)
+    ids = ['a', 'b', 'c', 'd', 'e']
+    escalares = {id_tag: _TagEscalar(id_tag) for id_tag in ids}
+    distancias = _trayectorias(len(ids), 30)
+
+    for t, fila in enumerate(distancias):
+        # Cada ciclo llega un subconjunto distinto de tags
+        activos = [i for i in range(len(ids)) if (t + i) % 3 != 0]
+        posiciones, errores = tracker.actualizar([ids[i] for i in activos], fila[activos])
+        for posicion, i in zip(posiciones, activos):
+            np.testing.assert_allclose(posicion, escalares[ids[i]].actualizar(fila[i]), atol=1e-6)
+        assert np.all(np.isfinite(errores))
+    assert sorted(tracker.tags) == ids
+
+
+def test_tag_eliminado_vuelve_a_empezar():
+    tracker = _tracker()
+    distancias = _trayectorias(2, 10)
+    for fila in distancias:
+        tracker.actualizar(['a', 'b'], fila)
+    tracker.eliminar_tag('a')
+    assert 'a' not in tracker and len(tracker) == 1
+
+    nuevo = _TagEscalar('a')
+    posiciones, _ = tracker.actualizar(['a'], distancias[0, :1])
+    np.testing.assert_allclose(posiciones[0], nuevo.actualizar(distancias[0, 0]), atol=1e-6)
+
+
+def test_eliminar_inactivos_y_consultas():
+    tracker = _tracker()
+    tracker.agregar_tag('sin_datos')
+    tracker.actualizar(['a'], _trayectorias(1, 1)[0])
+    assert tracker.posicion('sin_datos') is None
+    posicion, error = tracker.posicion('a')
+    assert posicion.shape == (3,) and error >= 0.0
+
+    ids, posiciones, errores, instantes = tracker.posiciones()
+    assert ids == ['sin_datos', 'a']
+    assert np.isnan(instantes[0]) and np.isfinite(instantes[1])
+    assert tracker.eliminar_inactivos(60.0) == ['sin_datos']
+    assert tracker.tags == ['a']
+
+
+def test_tag_repetido_en_una_actualizacion():
+    tracker = _tracker()
+    with pytest.raises(ValueError):
+        tracker.actualizar(['a', 'a'], np.ones((2, len(ANCHORS))))
+
+
+def test_crece_sin_recrear_el_banco():
+    tracker = _tracker(capacidad=1)
+    kalman = tracker._kalman
+    capacidades = set()
+    for i in range(20):
+        tracker.agregar_tag(i)
+        capacidades.add(len(tracker._ids))
+    assert tracker._kalman is kalman
+    assert sorted(capacidades) == [1, 2, 4, 8, 16, 32]
+    assert kalman.n == 32 * len(ANCHORS)
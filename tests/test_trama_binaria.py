@@ -0,0 +1,80 @@
+import numpy as np
+
+from src.utils.lectores.parser_tramas import AsciiFrameParser
+from src.utils.lectores.trama_binaria import (
+    FRAME_SIZE,
+    BinaryFrameParser,
+    crc16,
+    crc16_rows,
+    decode_frames,
+    encode_frame,
+    encode_frames
+)
+
+VALORES = [[150.0, 250.5, 350.25, 12.5, 0.125, -0.5],
+           [151.0, 251.5, 351.25, 12.4, 0.25, 0.75],
+           [152.0, 252.5, 352.25, 12.3, 1.5, -1.25]]
+
+
+def _parser():
+    return BinaryFrameParser(verbose=False)
+
+
+def test_crc16_ccitt():
+    assert crc16(b'123456789') == 0x29B1
+    filas = np.frombuffer(b'123456789' * 2, dtype=np.uint8).reshape(2, 9)
+    assert crc16_rows(filas).tolist() == [0x29B1, 0x29B1]
+
+
+def test_codificacion_por_lote_igual_a_la_individual():
+    lote = encode_frames([1, 2, 3], VALORES)
+    assert lote == b''.join(encode_frame(i + 1, v) for i, v in enumerate(VALORES))
+    seq, valores, ok = decode_frames(lote)
+    assert seq.tolist() == [1, 2, 3]
+    assert ok.all()
+    np.testing.assert_allclose(valores, VALORES, rtol=1e-6)
+
+
+def test_rechaza_crc_incorrecto_y_resincroniza():
+    tramas = bytearray(encode_frames([1, 2, 3], VALORES))
+    tramas[FRAME_SIZE + 6] ^= 0xFF   # Corromper una distancia de la segunda
+    parser = _parser()
+    parser.feed(b'\x00\x13' + bytes(tramas))
+    decodificadas = parser.parse(all_frames=True)
+    assert len(decodificadas) == 2
+    np.testing.assert_allclose(decodificadas[1], VALORES[2], rtol=1e-6)
+    assert parser.malformed >= 1
+    assert parser.last_seq == 3
+
+
+def test_trama_partida_entre_lecturas():
+    trama = encode_frame(7, VALORES[0])
+    parser = _parser()
+    parser.feed(trama[:10])
+    assert parser.parse() is None
+    parser.feed(trama[10:])
+    np.testing.assert_allclose(parser.parse(), VALORES[0], rtol=1e-6)
+
+
+def test_cuenta_tramas_perdidas_por_secuencia():
+    parser = _parser()
+    parser.feed(encode_frames([10, 11, 14], VALORES))
+    parser.parse()
+    assert parser.seq_gaps == 2
+    # El contador de 16 bits da la vuelta sin contar huecos
+    parser.feed(encode_frames([0xFFFF], VALORES[:1]) + encode_frames([0], VALORES[:1]))
+    parser.parse()
+    assert parser.seq_gaps == 2 + (0xFFFF - 14 - 1)
+
+
+def test_mismo_criterio_de_valor_invalido_que_ascii():
+    # -1.0 en cualquiera de los seis campos descarta la trama en ambos formatos
+    for campo in range(6):
+        valores = list(VALORES[0])
+        valores[campo] = -1.0
+        binario = _parser()
+        binario.feed(encode_frame(1, valores))
+        ascii_ = AsciiFrameParser(verbose=False)
+        ascii_.feed(('[' + ','.join(str(v) for v in valores) + ']').encode())
+        assert binario.parse() is None and ascii_.parse() is None, campo
+        assert binario.invalid == ascii_.invalid == 1
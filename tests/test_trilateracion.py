@@ -0,0 +1,250 @@
+import numpy as np
+import pytest
+
+from src.config.variables import METODO_TRILATERACION
+from src.utils.auxiliares import trilateracion
+from src.utils.auxiliares.trilateracion import resolver_lineal, resolver_scipy
+
+from conftest import ANCHORS_3, ANCHORS_4, distancias
+
+PUNTOS = np.array([
+    [300.0, 200.0, 400.0],
+    [1500.0, -800.0, 900.0],
+    [-2500.0, 3000.0, 1200.0],
+    [4000.0, 4000.0, 100.0],
+])
+
+
+@pytest.fixture(autouse=True)
+def tags_limpios():
+    trilateracion.filtro_medidas.clear()
+    trilateracion._cache_soluciones.clear()
+    trilateracion._posiciones_previas.clear()
+    yield
+
+
+def test_scipy_es_el_metodo_por_defecto():
+    assert METODO_TRILATERACION == 'scipy'
+
+
+@pytest.mark.parametrize('punto', PUNTOS)
+def test_lineal_exacto_sin_ruido(punto):
+    np.testing.assert_allclose(resolver_lineal(distancias(punto, ANCHORS_4), ANCHORS_4), punto, atol=1e-6)
+
+
+@pytest.mark.parametrize('punto', PUNTOS)
+def test_lineal_coincide_con_scipy(punto):
+    d = distancias(punto, ANCHORS_4)
+    lineal = resolver_lineal(d, ANCHORS_4)
+    scipy = resolver_scipy(d, ANCHORS_4)
+    np.testing.assert_allclose(scipy, punto, atol=1.0)
+    np.testing.assert_allclose(lineal, scipy, atol=1.0)
+
+
+def test_lineal_con_ruido_comparable_a_scipy():
+    rng = np.random.default_rng(0)
+    punto = PUNTOS[1]
+    errores_lineal, errores_scipy = [], []
+    for _ in range(20):
+        d = distancias(punto, ANCHORS_4) + rng.normal(0.0, 20.0, 4)
+        errores_lineal.append(np.linalg.norm(resolver_lineal(d, ANCHORS_4) - punto))
+        errores_scipy.append(np.linalg.norm(resolver_scipy(d, ANCHORS_4) - punto))
+    assert np.median(errores_lineal) < 2.0 * np.median(errores_scipy) + 10.0
+
+
+def test_lineal_coplanares_elige_el_semiespacio():
+    punto = np.array([500.0, 1000.0, 800.0])
+    d = distancias(punto, ANCHORS_3)
+    np.testing.assert_allclose(resolver_lineal(d, ANCHORS_3), punto, atol=1e-6)
+
+
+def test_obtener_posicion_por_metodo():
+    punto = PUNTOS[0]
+    d = distancias(punto, ANCHORS_4)
+    for metodo in ('scipy', 'lineal'):
+        trilateracion.filtro_medidas.clear()
+        posicion, error = trilateracion.obtener_posicion_tag_3d(d, ANCHORS_4, id_tag=metodo, metodo=metodo)
+        np.testing.assert_allclose(posicion, punto, atol=5.0)
+        assert error < 5.0
+    with pytest.raises(ValueError):
+        trilateracion.obtener_posicion_tag_3d(d, ANCHORS_4, id_tag='x', metodo='magia')
+
+
+# #################################################################
+# GAUSS-NEWTON / LEVENBERG-MARQUARDT
+# #################################################################
+@pytest.mark.parametrize('punto', PUNTOS)
+def test_gauss_newton_converge_desde_lejos(punto):
+    d = distancias(punto, ANCHORS_4)
+    posicion, iteraciones, convergido = trilateracion.resolver_gauss_newton(
+        d, ANCHORS_4, x0=punto + [800.0, -600.0, 500.0], max_iteraciones=50
+    )
+    assert convergido
+    np.testing.assert_allclose(posicion, punto, atol=1.0)
+
+
+def test_gauss_newton_reduce_el_residuo_de_la_lineal_con_ruido():
+    rng = np.random.default_rng(1)
+    punto = PUNTOS[1]
+    d = distancias(punto, ANCHORS_4) + rng.normal(0.0, 20.0, 4)
+    lineal = resolver_lineal(d, ANCHORS_4)
+    posicion, _, convergido = trilateracion.resolver_gauss_newton(d, ANCHORS_4)
+    assert convergido
+
+    def costo(x):
+        r = np.linalg.norm(ANCHORS_4 - x, axis=1) - d
+        return r @ r
+    assert costo(posicion) <= costo(lineal) + 1e-9
+    assert costo(posicion) <= costo(resolver_scipy(d, ANCHORS_4)) + 1e-3
+
+
+def test_gauss_newton_arranque_en_caliente_por_tag():
+    punto = PUNTOS[2]
+    d = distancias(punto, ANCHORS_4)
+    trilateracion.obtener_posicion_tag_3d(d, ANCHORS_4, id_tag='gn', metodo='gauss_newton')
+    estado_frio = dict(trilateracion.obtener_estado_solver('gn'))
+    # Las distancias se mueven lo suficiente para no reutilizar la solución en caché
+    posicion, _ = trilateracion.obtener_posicion_tag_3d(d + 2.0, ANCHORS_4, id_tag='gn', metodo='gauss_newton')
+
+    estado = trilateracion.obtener_estado_solver('gn')
+    assert estado_frio['convergido'] and estado['convergido']
+    assert estado['metodo'] == 'gauss_newton'
+    assert estado['iteraciones'] <= 3
+    np.testing.assert_allclose(posicion, punto, atol=5.0)
+
+    trilateracion.reiniciar_tag('gn')
+    assert trilateracion.obtener_estado_solver('gn') is None
+
+
+def _espiar_arranques(monkeypatch):
+    arranques = []
+    gauss_newton = trilateracion._gauss_newton
+
+    def espia(distancias, posiciones_anchors, x0=None, **kwargs):
+        arranques.append(None if x0 is None else np.array(x0))
+        return gauss_newton(distancias, posiciones_anchors, x0=x0, **kwargs)
+
+    monkeypatch.setattr(trilateracion, '_gauss_newton', espia)
+    return arranques
+
+
+def test_gauss_newton_arranque_en_caliente_con_tres_anchors(monkeypatch):
+    arranques = _espiar_arranques(monkeypatch)
+    punto = np.array([500.0, 1000.0, 800.0])
+    d = distancias(punto, ANCHORS_3)
+    primera, _ = trilateracion.obtener_posicion_tag_3d(d, ANCHORS_3, id_tag='gn3', metodo='gauss_newton')
+    posicion, _ = trilateracion.obtener_posicion_tag_3d(d + 2.0, ANCHORS_3, id_tag='gn3', metodo='gauss_newton')
+
+    # Anchors coplanares: el segundo ciclo arranca desde la solución anterior (z > 0)
+    assert arranques[0] is None
+    np.testing.assert_array_equal(arranques[1], primera)
+    estado = trilateracion.obtener_estado_solver('gn3')
+    assert estado['convergido'] and estado['iteraciones'] <= 3
+    np.testing.assert_allclose(posicion, punto, atol=5.0)
+
+
+def test_gauss_newton_previa_sobre_el_plano_arranca_de_la_lineal(monkeypatch):
+    arranques = _espiar_arranques(monkeypatch)
+    punto = np.array([500.0, 1000.0, 800.0])
+    trilateracion._posiciones_previas['gn3'] = np.array([500.0, 1000.0, 0.5])
+    posicion, _ = trilateracion.obtener_posicion_tag_3d(distancias(punto, ANCHORS_3), ANCHORS_3,
+                                                        id_tag='gn3', metodo='gauss_newton')
+    assert arranques == [None]
+    np.testing.assert_allclose(posicion, punto, atol=1e-3)
+
+
+def test_gauss_newton_previa_del_otro_lado_se_refleja():
+    # Plano de los anchors fuera del origen (z = 500)
+    anchors = ANCHORS_3 + [0.0, 0.0, 500.0]
+    punto = np.array([500.0, 1000.0, 1300.0])
+    espejo = punto * [1.0, 1.0, -1.0] + [0.0, 0.0, 1000.0]
+    trilateracion._posiciones_previas['gn3'] = espejo + 10.0
+    posicion, error = trilateracion.obtener_posicion_tag_3d(distancias(punto, anchors), anchors,
+                                                            id_tag='gn3', metodo='gauss_newton')
+    np.testing.assert_allclose(posicion, punto, atol=1e-3)
+    assert error < 1e-3
+    np.testing.assert_allclose(trilateracion.reflejar_al_semiespacio(espejo, anchors), punto)
+    assert trilateracion.reflejar_al_semiespacio(punto, anchors) is punto
+
+
+# #################################################################
+# INTERSECCIÓN CERRADA DE TRES ESFERAS
+# #################################################################
+@pytest.mark.parametrize('punto', [[500.0, 1000.0, 800.0], [-3000.0, 4000.0, 50.0], [0.0, -1000.0, 2500.0]])
+def test_esferas_exacto_sin_ruido(punto):
+    punto = np.array(punto)
+    posicion, intersecta = trilateracion.resolver_esferas(distancias(punto, ANCHORS_3), ANCHORS_3)
+    assert intersecta
+    np.testing.assert_allclose(posicion, punto, atol=1e-6)
+
+
+def test_esferas_elige_el_lado_de_la_posicion_previa():
+    punto = np.array([500.0, 1000.0, 800.0])
+    espejo = punto * [1.0, 1.0, -1.0]
+    d = distancias(punto, ANCHORS_3)
+    posicion, _ = trilateracion.resolver_esferas(d, ANCHORS_3, previa=espejo + 100.0)
+    np.testing.assert_allclose(posicion, espejo, atol=1e-6)
+    posicion, _ = trilateracion.resolver_esferas(d, ANCHORS_3, semiespacio=-1)
+    np.testing.assert_allclose(posicion, espejo, atol=1e-6)
+
+
+def test_esferas_sin_interseccion_cae_en_el_plano():
+    d = distancias(np.array([0.0, 1000.0, 0.0]), ANCHORS_3) - 50.0
+    posicion, intersecta = trilateracion.resolver_esferas(d, ANCHORS_3)
+    assert not intersecta
+    assert posicion[2] == 0.0
+
+
+def test_esferas_coincide_con_lineal_en_tres_anchors():
+    rng = np.random.default_rng(2)
+    punto = np.array([1200.0, 2500.0, 900.0])
+    for _ in range(10):
+        d = distancias(punto, ANCHORS_3) + rng.normal(0.0, 5.0, 3)
+        posicion, intersecta = trilateracion.resolver_esferas(d, ANCHORS_3)
+        if intersecta:
+            np.testing.assert_allclose(posicion, resolver_lineal(d, ANCHORS_3), atol=1e-6)
+
+
+def test_esferas_con_mas_anchors_usa_lineal():
+    d = distancias(PUNTOS[0], ANCHORS_4)
+    posicion, intersecta = trilateracion.resolver_esferas(d, ANCHORS_4)
+    assert intersecta
+    np.testing.assert_allclose(posicion, resolver_lineal(d, ANCHORS_4))
+
+
+# #################################################################
+# CACHÉ DE SOLUCIONES
+# #################################################################
+def test_cache_desactivada_por_defecto():
+    trilateracion.obtener_estadisticas_cache(reiniciar=True)
+    d = distancias(PUNTOS[0], ANCHORS_4)
+    trilateracion.obtener_posicion_tag_3d(d, ANCHORS_4, id_tag='c', metodo='lineal')
+    trilateracion.obtener_posicion_tag_3d(d, ANCHORS_4, id_tag='c', metodo='lineal')
+    assert trilateracion.TRILATERACION_CACHE_EPSILON is None
+    assert trilateracion.obtener_estadisticas_cache()['aciertos'] == 0
+    assert 'c' not in trilateracion._cache_soluciones
+
+
+def test_acierto_de_cache_mantiene_el_arranque_en_caliente(monkeypatch):
+    monkeypatch.setattr(trilateracion, 'TRILATERACION_CACHE_EPSILON', 0.5)
+    trilateracion.obtener_estadisticas_cache(reiniciar=True)
+    punto = PUNTOS[2]
+    d = distancias(punto, ANCHORS_4)
+    primera, _ = trilateracion.obtener_posicion_tag_3d(d, ANCHORS_4, id_tag='c', metodo='gauss_newton')
+
+    # Estado perdido entre ciclos: el acierto lo repone desde la entrada
+    trilateracion._posiciones_previas.pop('c')
+    trilateracion.estado_solver.pop('c')
+    posicion, _ = trilateracion.obtener_posicion_tag_3d(d + 0.1, ANCHORS_4, id_tag='c', metodo='gauss_newton')
+    assert trilateracion.obtener_estadisticas_cache()['aciertos'] == 1
+    np.testing.assert_array_equal(posicion, primera)
+    np.testing.assert_array_equal(trilateracion._posiciones_previas['c'], primera)
+    estado = trilateracion.obtener_estado_solver('c')
+    assert estado['en_cache'] and estado['convergido'] and estado['iteraciones'] == 0
+
+    # El siguiente fallo arranca desde la solución reutilizada
+    posicion, _ = trilateracion.obtener_posicion_tag_3d(d + 2.0, ANCHORS_4, id_tag='c', metodo='gauss_newton')
+    estado = trilateracion.obtener_estado_solver('c')
+    assert not estado.get('en_cache', False)
+    assert estado['iteraciones'] <= 3
+    np.testing.assert_allclose(posicion, punto, atol=5.0)
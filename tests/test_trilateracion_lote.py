@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.utils.auxiliares.trilateracion import resolver_gauss_newton, resolver_lineal
+from src.utils.auxiliares.trilateracion_lote import obtener_posiciones_lote
+
+from conftest import ANCHORS_3, ANCHORS_4
+
+
+def _lote(anchors, n=50, ruido=0.0, semilla=0):
+    rng = np.random.default_rng(semilla)
+    puntos = rng.uniform([-3000, -3000, 100], [3000, 3000, 1500], size=(n, 3))
+    d = np.linalg.norm(puntos[:, None, :] - anchors[None], axis=2)
+    return puntos, d + rng.normal(0.0, ruido, d.shape)
+
+
+@pytest.mark.parametrize('anchors', [ANCHORS_4, ANCHORS_3])
+def test_lineal_coincide_con_la_version_escalar(anchors):
+    _, d = _lote(anchors, ruido=10.0)
+    posiciones, errores = obtener_posiciones_lote(d, anchors)
+    for fila, posicion in zip(d, posiciones):
+        np.testing.assert_allclose(posicion, resolver_lineal(fila, anchors), atol=1e-6)
+    assert np.all(np.isfinite(errores))
+
+
+def test_gauss_newton_coincide_con_la_version_escalar():
+    puntos, d = _lote(ANCHORS_4, ruido=10.0)
+    posiciones, _ = obtener_posiciones_lote(d, ANCHORS_4, metodo='gauss_newton')
+    for fila, posicion in zip(d, posiciones):
+        np.testing.assert_allclose(posicion, resolver_gauss_newton(fila, ANCHORS_4)[0], atol=1.0)
+    assert np.median(np.linalg.norm(posiciones - puntos, axis=1)) < 100.0
+
+
+@pytest.mark.parametrize('metodo', ['lineal', 'gauss_newton'])
+def test_filas_degeneradas_resultan_en_nan(metodo):
+    _, d = _lote(ANCHORS_4, n=6)
+    referencia, errores_ref = obtener_posiciones_lote(d, ANCHORS_4, metodo=metodo)
+    d[1, 2] = np.nan
+    d[3, 0] = np.inf
+    d[4, 1] = -1.0     # Medición inválida del ESP32
+
+    posiciones, errores = obtener_posiciones_lote(d, ANCHORS_4, metodo=metodo)
+    degeneradas = np.array([False, True, False, True, True, False])
+    assert np.all(np.isnan(posiciones[degeneradas]))
+    assert np.all(np.isnan(errores[degeneradas]))
+    np.testing.assert_allclose(posiciones[~degeneradas], referencia[~degeneradas])
+    np.testing.assert_allclose(errores[~degeneradas], errores_ref[~degeneradas])
+
+
+def test_lote_sin_filas_validas():
+    posiciones, errores = obtener_posiciones_lote(np.full((3, 4), np.nan), ANCHORS_4)
+    assert posiciones.shape == (3, 3)
+    assert np.all(np.isnan(posiciones)) and np.all(np.isnan(errores))
+
+
+def test_repartido_entre_procesos_es_igual():
+    _, d = _lote(ANCHORS_4, n=40, ruido=10.0)
+    d[7, 0] = np.nan
+    una, errores_una = obtener_posiciones_lote(d, ANCHORS_4, metodo='gauss_newton')
+    varias, errores_varias = obtener_posiciones_lote(d, ANCHORS_4, metodo='gauss_newton',
+                                                     procesos=2, tamano_bloque=16)
+    np.testing.assert_allclose(varias, una)
+    np.testing.assert_allclose(errores_varias, errores_una)
+
+
+def test_metodo_desconocido():
+    with pytest.raises(ValueError):
+        obtener_posiciones_lote(np.ones((1, 4)), ANCHORS_4, metodo='scipy')
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.utils.auxiliares.trilateracion import resolver_lineal
+from src.utils.auxiliares.trilateracion_robusta import pesos_robustos, resolver_robusto
+
+from conftest import ANCHORS_6 as ANCHORS, PUNTO_6 as PUNTO, distancias
+
+
+@pytest.mark.parametrize('ponderacion', ['huber', 'tukey'])
+def test_sin_valores_atipicos_no_rechaza(ponderacion):
+    d = distancias(PUNTO, ANCHORS, ruido=10.0)
+    posicion, rechazados, _ = resolver_robusto(d, ANCHORS, ponderacion=ponderacion)
+    assert len(rechazados) == 0
+    assert np.linalg.norm(posicion - PUNTO) < 50.0
+
+
+@pytest.mark.parametrize('ponderacion', ['huber', 'tukey'])
+@pytest.mark.parametrize('anchor', [0, 3, 5])
+def test_rechaza_el_anchor_con_multitrayecto(ponderacion, anchor):
+    d = distancias(PUNTO, ANCHORS, ruido=10.0)
+    d[anchor] += 900.0   # Camino reflejado: siempre más largo
+    posicion, rechazados, _ = resolver_robusto(d, ANCHORS, ponderacion=ponderacion)
+
+    assert rechazados.tolist() == [anchor]
+    error = np.linalg.norm(posicion - PUNTO)
+    # Mínimos cuadrados sin ponderar queda arrastrado por el valor atípico
+    error_lineal = np.linalg.norm(resolver_lineal(d, ANCHORS) - PUNTO)
+    if ponderacion == 'tukey':
+        assert error < 50.0
+    else:
+        # Huber acota la influencia del atípico pero no la anula
+        assert error < error_lineal / 2.0
+
+
+def test_sin_ransac_parte_de_la_lineal():
+    d = distancias(PUNTO, ANCHORS, ruido=10.0)
+    d[3] += 300.0
+    posicion, rechazados, iteraciones = resolver_robusto(d, ANCHORS, ransac=False, ponderacion='tukey')
+    assert iteraciones >= 1
+    assert rechazados.tolist() == [3]
+    assert np.linalg.norm(posicion - PUNTO) < 50.0
+
+
+def test_la_previa_desempata_las_soluciones_espejo():
+    coplanares = ANCHORS.copy()
+    coplanares[:, 2] = 0.0
+    d = np.linalg.norm(coplanares - PUNTO, axis=1)
+    espejo = PUNTO * [1.0, 1.0, -1.0]
+    posicion, _, _ = resolver_robusto(d, coplanares, previa=espejo)
+    np.testing.assert_allclose(posicion, espejo, atol=1.0)
+    posicion, _, _ = resolver_robusto(d, coplanares, previa=PUNTO)
+    np.testing.assert_allclose(posicion, PUNTO, atol=1.0)
+
+
+def test_pesos_robustos():
+    residuos = np.array([0.0, 10.0, 100.0, 1000.0])
+    huber = pesos_robustos(residuos, 'huber', sigma=20.0)
+    tukey = pesos_robustos(residuos, 'tukey', sigma=20.0)
+    assert huber[0] == 1.0 and np.all(np.diff(huber) <= 0) and huber[-1] > 0.0
+    assert tukey[0] == 1.0 and np.all(np.diff(tukey) <= 0) and tukey[-1] == 0.0
+    with pytest.raises(ValueError):
+        pesos_robustos(residuos, 'cauchy')